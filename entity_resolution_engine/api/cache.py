@@ -0,0 +1,142 @@
+"""Bounded LRU cache for encoded API responses.
+
+Entity responses are keyed by the latest completed run id (the cache
+"version"), so a new run makes old entries unreachable. Monitoring
+responses for completed runs live under ``run_key`` and are dropped when
+that run's reviews/anomalies change or a mapping run finishes. Those
+invalidations only reach the worker that handled them, so run entries also
+expire after ``run_ttl_s`` and other workers re-read them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+CacheKey = Tuple[Hashable, ...]
+RUN_NAMESPACE = "run"
+
+
+def run_key(run_id: str, kind: str) -> CacheKey:
+    """Key of a run-scoped response (summary, report, gates)."""
+    return (RUN_NAMESPACE, run_id, kind)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+
+
+def encode_response(payload: Any) -> CachedResponse:
+    # Same encoding as FastAPI's JSONResponse so cached and uncached bodies match.
+    body = json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return CachedResponse(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or any(
+        value.removeprefix("W/") == etag for value in candidates
+    )
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        version_ttl_s: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+        run_ttl_s: Optional[float] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.version_ttl_s = version_ttl_s
+        self.run_ttl_s = version_ttl_s if run_ttl_s is None else run_ttl_s
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._expires: Dict[CacheKey, float] = {}
+        self._lock = threading.Lock()
+        self.version: Optional[str] = None
+        self._version_loaded_at: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() >= self._expires.get(
+                key, float("inf")
+            ):
+                del self._entries[key]
+                del self._expires[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: CacheKey, entry: CachedResponse) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if key[0] == RUN_NAMESPACE:
+                self._expires[key] = self._clock() + self.run_ttl_s
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._expires.pop(evicted, None)
+                self.evictions += 1
+
+    def invalidate(self, run_id: Optional[str] = None) -> None:
+        """Drop ``run_id``'s run entries, or everything (and the version) if None."""
+        with self._lock:
+            if run_id is None:
+                self._entries.clear()
+                self._expires.clear()
+                self.version = None
+                self._version_loaded_at = None
+                return
+            prefix = (RUN_NAMESPACE, run_id)
+            for key in [key for key in self._entries if key[:2] == prefix]:
+                del self._entries[key]
+                self._expires.pop(key, None)
+
+    def version_is_stale(self) -> bool:
+        if self._version_loaded_at is None:
+            return True
+        return self._clock() - self._version_loaded_at >= self.version_ttl_s
+
+    def set_version(self, version: Optional[str]) -> None:
+        with self._lock:
+            if version != self.version:
+                # A run finished outside this process (e.g. the CLI).
+                self._entries.clear()
+                self._expires.clear()
+            self.version = version
+            self._version_loaded_at = self._clock()
@@ -0,0 +1,162 @@
+"""Single-query UES entity reads with optional expansion of related rows.
+
+``build_entity_query("match", ["home_team", "season"])`` selects the match
+plus the requested related rows via LEFT JOINs; ``split_entity_row`` turns
+the flat result back into ``{..., "home_team": {...}, "season": {...}}``.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from sqlalchemy import text
+
+EXPAND_SEPARATOR = "__"
+JSON_FIELDS = ("lineage",)
+
+
+@dataclass(frozen=True)
+class Relation:
+    foreign_key: str
+    entity_type: str
+
+
+@dataclass(frozen=True)
+class EntityView:
+    table: str
+    id_column: str
+    columns: Tuple[str, ...]
+    relations: Dict[str, Relation] = field(default_factory=dict)
+
+
+_COMMON = ("merge_confidence", "lineage", "run_id", "updated_at")
+
+ENTITY_VIEWS: Dict[str, EntityView] = {
+    "team": EntityView(
+        "ues_teams", "ues_team_id", ("ues_team_id", "name", "country") + _COMMON
+    ),
+    "competition": EntityView(
+        "ues_competitions",
+        "ues_competition_id",
+        ("ues_competition_id", "name", "country") + _COMMON,
+    ),
+    "season": EntityView(
+        "ues_seasons",
+        "ues_season_id",
+        ("ues_season_id", "start_year", "end_year", "competition_ues_id") + _COMMON,
+        {"competition": Relation("competition_ues_id", "competition")},
+    ),
+    "player": EntityView(
+        "ues_players",
+        "ues_player_id",
+        (
+            "ues_player_id",
+            "canonical_name",
+            "dob",
+            "birth_year",
+            "nationality",
+            "height_cm",
+            "foot",
+            "team_ues_id",
+        )
+        + _COMMON,
+        {"team": Relation("team_ues_id", "team")},
+    ),
+    "match": EntityView(
+        "ues_matches",
+        "ues_match_id",
+        (
+            "ues_match_id",
+            "home_team_ues_id",
+            "away_team_ues_id",
+            "season_ues_id",
+            "competition_ues_id",
+            "match_date",
+        )
+        + _COMMON,
+        {
+            "home_team": Relation("home_team_ues_id", "team"),
+            "away_team": Relation("away_team_ues_id", "team"),
+            "season": Relation("season_ues_id", "season"),
+            "competition": Relation("competition_ues_id", "competition"),
+        },
+    ),
+}
+
+
+def parse_expand(entity_type: str, expand: str | None) -> Tuple[str, ...]:
+    """Validate a comma-separated ``expand`` value; raises ``ValueError``."""
+    if not expand:
+        return ()
+    relations = ENTITY_VIEWS[entity_type].relations
+    names = [name.strip() for name in expand.split(",") if name.strip()]
+    if names == ["all"]:
+        return tuple(relations)
+    unknown = [name for name in names if name not in relations]
+    if unknown:
+        raise ValueError(
+            f"Cannot expand {', '.join(unknown)} on {entity_type}; "
+            f"choose from {', '.join(relations) or 'nothing'}"
+        )
+    return tuple(dict.fromkeys(names))
+
+
+def build_entity_query(entity_type: str, expand: Sequence[str] = ()) -> Any:
+    view = ENTITY_VIEWS[entity_type]
+    select = ["base.*"]
+    joins = []
+    for name in expand:
+        relation = view.relations[name]
+        related = ENTITY_VIEWS[relation.entity_type]
+        select.extend(
+            f"{name}.{column} AS {name}{EXPAND_SEPARATOR}{column}"
+            for column in related.columns
+        )
+        joins.append(
+            f"LEFT JOIN {related.table} AS {name} "
+            f"ON {name}.{related.id_column} = base.{relation.foreign_key}"
+        )
+    return text(
+        f"SELECT {', '.join(select)} FROM {view.table} AS base "
+        f"{' '.join(joins)} WHERE base.{view.id_column} = :ues_id"
+    )
+
+
+def _decode_json(record: Dict[str, Any]) -> Dict[str, Any]:
+    for name in JSON_FIELDS:
+        if isinstance(record.get(name), str):
+            try:
+                record[name] = json.loads(record[name])
+            except json.JSONDecodeError:
+                pass
+    return record
+
+
+def split_entity_row(
+    entity_type: str,
+    row: Mapping[Any, Any],
+    expand: Sequence[str] = (),
+    include_lineage: bool = True,
+) -> Dict[str, Any]:
+    view = ENTITY_VIEWS[entity_type]
+    entity: Dict[str, Any] = {}
+    nested: Dict[str, Dict[str, Any]] = {name: {} for name in expand}
+    for key, value in row.items():
+        prefix, separator, column = key.partition(EXPAND_SEPARATOR)
+        if separator and prefix in nested:
+            nested[prefix][column] = value
+        else:
+            entity[key] = value
+    for name, related in nested.items():
+        related_view = ENTITY_VIEWS[view.relations[name].entity_type]
+        entity[name] = None if related.get(related_view.id_column) is None else related
+    records: List[Dict[str, Any]] = [entity] + [
+        entity[name] for name in expand if entity[name] is not None
+    ]
+    for record in records:
+        _decode_json(record)
+        if not include_lineage:
+            record.pop("lineage", None)
+    return entity
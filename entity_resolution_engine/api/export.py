@@ -0,0 +1,220 @@
+"""Streaming bulk export of UES entity tables.
+
+NDJSON and CSV are streamed straight from a server-side cursor in
+``chunk_size`` row batches (optionally gzip-compressed). Parquet is written
+once per run to ``EXPORT_DIR`` and then served as a file.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+EXPORT_TABLES = {
+    "team": ("ues_teams", "ues_team_id"),
+    "competition": ("ues_competitions", "ues_competition_id"),
+    "season": ("ues_seasons", "ues_season_id"),
+    "player": ("ues_players", "ues_player_id"),
+    "match": ("ues_matches", "ues_match_id"),
+}
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+JSON_FIELDS = ("lineage",)
+
+
+def build_export_query(
+    entity_type: str,
+    run_id: Optional[str] = None,
+    changed_since: Optional[datetime] = None,
+) -> Tuple[Any, Dict[str, Any]]:
+    table, id_column = EXPORT_TABLES[entity_type]
+    clauses: List[str] = []
+    params: Dict[str, Any] = {}
+    if run_id:
+        clauses.append("run_id = :run_id")
+        params["run_id"] = run_id
+    if changed_since is not None:
+        clauses.append("updated_at > :changed_since")
+        params["changed_since"] = changed_since
+    where_clause = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return text(f"SELECT * FROM {table} {where_clause} ORDER BY {id_column}"), params
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _export_row(row: Any) -> Dict[str, Any]:
+    record = {key: _export_value(value) for key, value in dict(row).items()}
+    for field in JSON_FIELDS:
+        if isinstance(record.get(field), str):
+            try:
+                record[field] = json.loads(record[field])
+            except json.JSONDecodeError:
+                pass
+    return record
+
+
+async def _row_batches(
+    engine: AsyncEngine, query: Any, params: Dict[str, Any], chunk_size: int
+) -> AsyncIterator[Tuple[List[str], Sequence[Any]]]:
+    async with engine.connect() as conn:
+        result = await conn.stream(
+            query.execution_options(yield_per=chunk_size), params
+        )
+        keys = list(result.keys())
+        async for batch in result.mappings().partitions(chunk_size):
+            yield keys, batch
+
+
+async def stream_ndjson(
+    engine: AsyncEngine, query: Any, params: Dict[str, Any], chunk_size: int
+) -> AsyncIterator[bytes]:
+    async for _, batch in _row_batches(engine, query, params, chunk_size):
+        lines = (json.dumps(_export_row(row), default=str) for row in batch)
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def stream_csv(
+    engine: AsyncEngine, query: Any, params: Dict[str, Any], chunk_size: int
+) -> AsyncIterator[bytes]:
+    header_sent = False
+    async for keys, batch in _row_batches(engine, query, params, chunk_size):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not header_sent:
+            writer.writerow(keys)
+            header_sent = True
+        for row in batch:
+            record = _export_row(row)
+            writer.writerow(
+                json.dumps(value) if isinstance(value, (dict, list)) else value
+                for value in (record[key] for key in keys)
+            )
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _parquet_records(rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    records = []
+    for row in rows:
+        record = _export_row(row)
+        for field in JSON_FIELDS:
+            if field in record and not isinstance(record[field], (str, type(None))):
+                record[field] = json.dumps(record[field])
+        records.append(record)
+    return records
+
+
+def write_parquet_export(
+    engine: Engine,
+    entity_type: str,
+    path: Path,
+    run_id: Optional[str] = None,
+    chunk_size: int = 5000,
+) -> Path:
+    """Write ``entity_type`` to ``path`` in row groups of ``chunk_size``.
+
+    The file is built under a unique temporary name and only then linked
+    into place, so concurrent requests never serve a half-written export.
+    A file already published at ``path`` by a concurrent request is kept:
+    a response streaming it is never switched to a different file.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    query, params = build_export_query(entity_type, run_id=run_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    writer = None
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=chunk_size
+            ).execute(query, params)
+            for batch in result.mappings().partitions(chunk_size):
+                table = pa.Table.from_pylist(_parquet_records(batch))
+                if writer is None:
+                    # All-null columns in the first batch would otherwise be
+                    # typed null and reject values in later batches.
+                    schema = pa.schema(
+                        pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f
+                        for f in table.schema
+                    )
+                    writer = pq.ParquetWriter(tmp_path, schema)
+                writer.write_table(table.cast(writer.schema))
+            if writer is None:
+                columns = list(result.keys())
+                schema = pa.schema(pa.field(name, pa.string()) for name in columns)
+                writer = pq.ParquetWriter(tmp_path, schema)
+        writer.close()
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+    finally:
+        if writer is not None and writer.is_open:
+            writer.close()
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return path
+
+
+def parquet_export_path(export_dir: Path, run_key: str, entity_type: str) -> Path:
+    """``export_dir/<run_key>/<entity_type>.parquet``; rejects escaping run keys."""
+    root = export_dir.resolve()
+    path = (root / run_key / f"{entity_type}.parquet").resolve()
+    if path.parent.parent != root:
+        raise ValueError(f"invalid run key {run_key!r}")
+    return path
+
+
+def prune_parquet_exports(export_dir: Path, keep: Collection[str]) -> None:
+    """Remove Parquet exports generated for runs not in ``keep``."""
+    if not export_dir.exists():
+        return
+    for run_dir in export_dir.iterdir():
+        if run_dir.is_dir() and run_dir.name not in keep:
+            for file in run_dir.glob("*.parquet"):
+                file.unlink()
+            try:
+                run_dir.rmdir()
+            except OSError:
+                pass
@@ -0,0 +1,256 @@
+"""Background mapping jobs for the API.
+
+Each job runs ``run_mapping`` in its own worker process so HTTP workers stay
+free while the pipeline runs. Jobs execute one at a time because a mapping
+run starts with ``UESWriter.reset()``; a trigger whose options match a job
+that is already queued or running is collapsed onto that job.
+
+The queue and deduplication are per API process. Across uvicorn workers (and
+CLI runs) runs are serialized by ``UESWriter.run_lock()``, a Postgres
+advisory lock, so a job started by another worker waits for the running one.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import queue as queue_module
+import threading
+import traceback
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from entity_resolution_engine.cli.run_mapping import MAPPING_STAGES
+from entity_resolution_engine.cli.run_mapping import main as run_mapping
+
+ACTIVE_STATUSES = ("queued", "running")
+FINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+Runner = Callable[..., str]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _worker(runner: Runner, run_id: str, options: Dict[str, Any], events) -> None:
+    def progress(stage: str, status: str) -> None:
+        events.put(("stage", stage, status, _now()))
+
+    try:
+        runner(run_id=run_id, progress=progress, **options)
+    except BaseException as exc:  # report every failure back to the API process
+        events.put(("failed", f"{type(exc).__name__}: {exc}", traceback.format_exc()))
+        raise
+    events.put(("succeeded", run_id, None))
+
+
+class MappingJob:
+    def __init__(self, options: Dict[str, Any], stages: List[str]) -> None:
+        self.job_id = str(uuid4())
+        self.run_id = str(uuid4())
+        self.options = options
+        self.key = json.dumps(options, sort_keys=True, default=str)
+        self.status = "queued"
+        self.created_at = _now()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.error: Optional[str] = None
+        self.stages: Dict[str, Dict[str, Any]] = {
+            stage: {"status": "pending", "started_at": None, "finished_at": None}
+            for stage in stages
+        }
+        self.process: Optional[Any] = None
+        self.cancel_requested = False
+        self.done = threading.Event()
+
+    def finish(self, status: str, notify: bool = True) -> None:
+        self.status = status
+        self.finished_at = _now()
+        if notify:
+            self.done.set()
+
+    def record_stage(self, stage: str, status: str, at: str) -> None:
+        entry = self.stages.setdefault(
+            stage, {"status": "pending", "started_at": None, "finished_at": None}
+        )
+        entry["status"] = status
+        if status == "running":
+            entry["started_at"] = at
+        else:
+            entry["finished_at"] = at
+
+    def to_dict(self) -> Dict[str, Any]:
+        completed = sum(1 for s in self.stages.values() if s["status"] == "completed")
+        current = next(
+            (name for name, s in self.stages.items() if s["status"] == "running"),
+            None,
+        )
+        return {
+            "job_id": self.job_id,
+            "run_id": self.run_id,
+            "status": self.status,
+            "options": self.options,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "current_stage": current,
+            "progress": {
+                "completed_stages": completed,
+                "total_stages": len(self.stages),
+            },
+            "stages": self.stages,
+        }
+
+
+class MappingJobManager:
+    """In-process registry and FIFO dispatcher for mapping worker processes."""
+
+    def __init__(
+        self,
+        runner: Optional[Runner] = None,
+        start_method: str = "spawn",
+        max_history: int = 100,
+        stages: Optional[List[str]] = None,
+        on_finish: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        self.runner = runner or run_mapping
+        self.on_finish = on_finish
+        self.context: Any = multiprocessing.get_context(start_method)
+        self.max_history = max_history
+        self.stages = list(stages or MAPPING_STAGES)
+        self._jobs: "OrderedDict[str, MappingJob]" = OrderedDict()
+        self._pending: List[MappingJob] = []
+        self._running: Optional[MappingJob] = None
+        self._lock = threading.Lock()
+
+    def submit(self, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        options = dict(options or {})
+        with self._lock:
+            candidate = MappingJob(options, self.stages)
+            for job in self._jobs.values():
+                if job.status in ACTIVE_STATUSES and job.key == candidate.key:
+                    return {**job.to_dict(), "deduplicated": True}
+            self._jobs[candidate.job_id] = candidate
+            self._pending.append(candidate)
+            self._prune_history()
+            self._dispatch()
+            return {**candidate.to_dict(), "deduplicated": False}
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [job.to_dict() for job in reversed(self._jobs.values())]
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status == "queued":
+                self._pending.remove(job)
+                job.finish("cancelled")
+            elif job.status == "running" and job.process is not None:
+                job.cancel_requested = True
+                job.process.terminate()
+            return job.to_dict()
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Block until ``job_id`` reaches a final status."""
+        with self._lock:
+            job = self._jobs[job_id]
+        if not job.done.wait(timeout):
+            raise TimeoutError(f"Mapping job {job_id} is still {job.status}")
+        with self._lock:
+            return job.to_dict()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for job in self._pending:
+                job.finish("cancelled")
+            self._pending.clear()
+            running = self._running
+        if running is not None:
+            self.cancel(running.job_id)
+            running.done.wait(5)
+
+    def _prune_history(self) -> None:
+        finished = [j for j in self._jobs.values() if j.status in FINAL_STATUSES]
+        for job in finished[: max(len(self._jobs) - self.max_history, 0)]:
+            del self._jobs[job.job_id]
+
+    def _dispatch(self) -> None:
+        # Caller holds the lock.
+        if self._running is not None or not self._pending:
+            return
+        job = self._pending.pop(0)
+        events = self.context.Queue()
+        process = self.context.Process(
+            target=_worker,
+            args=(self.runner, job.run_id, job.options, events),
+            name=f"mapping-job-{job.job_id}",
+            daemon=True,
+        )
+        job.process = process
+        job.status = "running"
+        job.started_at = _now()
+        self._running = job
+        process.start()
+        threading.Thread(target=self._monitor, args=(job, events), daemon=True).start()
+
+    def _apply_event(self, job: MappingJob, event: tuple) -> None:
+        kind = event[0]
+        if kind == "stage":
+            _, stage, status, at = event
+            job.record_stage(stage, status, at)
+        elif kind == "failed":
+            job.error = event[1]
+
+    def _monitor(self, job: MappingJob, events) -> None:
+        process = job.process
+        assert process is not None
+        outcome: Optional[str] = None
+        exited = False
+        while True:
+            try:
+                # Once the worker has exited only drain what it already sent.
+                event = events.get(timeout=0.1) if not exited else events.get_nowait()
+            except queue_module.Empty:
+                if exited:
+                    break
+                exited = not process.is_alive()
+                continue
+            with self._lock:
+                self._apply_event(job, event)
+            if event[0] in ("succeeded", "failed"):
+                outcome = event[0]
+        process.join()
+        with self._lock:
+            if job.cancel_requested:
+                status = "cancelled"
+            elif outcome == "succeeded" and process.exitcode == 0:
+                status = "succeeded"
+            else:
+                status = "failed"
+                if job.error is None:
+                    job.error = f"worker exited with code {process.exitcode}"
+            if status != "succeeded":
+                for entry in job.stages.values():
+                    if entry["status"] == "running":
+                        entry["status"] = status
+            job.process = None
+            job.finish(status, notify=False)
+            events.close()
+            self._running = None
+            self._dispatch()
+            finished = job.to_dict()
+        if self.on_finish is not None:
+            self.on_finish(finished)
+        job.done.set()
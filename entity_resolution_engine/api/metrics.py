@@ -0,0 +1,345 @@
+"""Prometheus text-format metrics for the API.
+
+A small in-process registry (histograms, gauges and scrape-time callbacks)
+rendered in the Prometheus exposition format by ``GET /metrics``. Request
+metrics come from ``MetricsMiddleware``, a plain ASGI middleware that only
+reads a clock and bumps counters per request.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_LAST_RUN_STAGES_SQL = """
+    SELECT entity_type, stage_wall_seconds FROM pipeline_run_metrics
+    WHERE run_id = (
+        SELECT run_id FROM pipeline_run_metrics
+        ORDER BY finished_at DESC LIMIT 1
+    )
+"""
+
+Labels = Tuple[str, ...]
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = (f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Labels, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            base = dict(zip(self.label_names, labels))
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                bucket_labels = _format_labels({**base, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative:g}")
+            lines.append(f"{self.name}_sum{_format_labels(base)} {series[-1]!r}")
+            lines.append(f"{self.name}_count{_format_labels(base)} {cumulative:g}")
+        return lines
+
+
+class Gauge:
+    def __init__(
+        self, name: str, documentation: str, label_names: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+        ] + [
+            f"{self.name}{_format_labels(dict(zip(self.label_names, labels)))} "
+            f"{_format_value(value)}"
+            for labels, value in values
+        ]
+
+
+class CallbackMetric:
+    """Metric whose samples are computed when the endpoint is scraped."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        collect: Callable[[], Iterable[Sample]],
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ] + [
+            f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+            for labels, value in self.collect()
+        ]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: List[Any] = []
+
+    def histogram(self, *args: Any, **kwargs: Any) -> Histogram:
+        metric = Histogram(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, *args: Any, **kwargs: Any) -> Gauge:
+        metric = Gauge(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Iterable[Sample]],
+        kind: str = "gauge",
+    ) -> CallbackMetric:
+        metric = CallbackMetric(name, documentation, kind, collect)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class ApiMetrics:
+    """The metric families exported by the API process."""
+
+    def __init__(self) -> None:
+        self.registry = MetricsRegistry()
+        self.request_latency = self.registry.histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by route template.",
+            ("method", "route", "status"),
+        )
+        self.in_flight = self.registry.gauge(
+            "http_requests_in_flight", "HTTP requests currently being served."
+        )
+        self.pool_acquire = self.registry.histogram(
+            "db_pool_acquire_seconds",
+            "Time for pool.connect(): waiting for a free connection, opening a "
+            "new one when the pool grows, and checkout pings.",
+            ("engine",),
+            buckets=POOL_WAIT_BUCKETS,
+        )
+        self.last_run = self.registry.gauge(
+            "mapping_last_run_info",
+            "Status of the last finished mapping job (value is always 1).",
+            ("run_id", "status"),
+        )
+        self._engines: Dict[str, Callable[[], Any]] = {}
+        self._runs_engine: Callable[[], Any] = lambda: None
+        self.registry.callback(
+            "mapping_last_run_stage_duration_seconds",
+            "Per-stage wall time of the latest run in pipeline_run_metrics "
+            "(API jobs and CLI runs alike).",
+            self._stage_duration_samples,
+        )
+        self.registry.callback(
+            "db_pool_checked_out",
+            "Connections currently checked out of the pool.",
+            lambda: self._pool_samples("checkedout"),
+        )
+        self.registry.callback(
+            "db_pool_size",
+            "Configured pool size.",
+            lambda: self._pool_samples("size"),
+        )
+        self.registry.callback(
+            "db_pool_overflow",
+            "Connections opened beyond the pool size.",
+            lambda: self._pool_samples("overflow"),
+        )
+
+    def track_engine(self, name: str, get_engine: Callable[[], Any]) -> None:
+        """Report pool usage for the engine returned by ``get_engine``.
+
+        The getter is re-evaluated on every scrape so a swapped engine is
+        picked up (and instrumented) without re-registering.
+        """
+        self._engines[name] = get_engine
+        self._pool_samples("checkedout")
+
+    def track_runs(self, get_engine: Callable[[], Any]) -> None:
+        """Read run telemetry from the UES engine returned by ``get_engine``."""
+        self._runs_engine = get_engine
+
+    def _stage_duration_samples(self) -> List[Sample]:
+        engine = self._runs_engine()
+        if engine is None:
+            return []
+        try:
+            with engine.connect() as conn:
+                rows = conn.execute(text(_LAST_RUN_STAGES_SQL)).all()
+        except SQLAlchemyError:
+            # A scrape must not fail because the UES schema is missing.
+            return []
+        return [
+            ({"stage": str(stage)}, float(seconds))
+            for stage, seconds in rows
+            if seconds is not None
+        ]
+
+    def _pool_samples(self, method: str) -> List[Sample]:
+        samples: List[Sample] = []
+        for name, get_engine in self._engines.items():
+            engine = get_engine()
+            if engine is None:
+                continue
+            pool = getattr(engine, "sync_engine", engine).pool
+            instrument_pool(pool, self.pool_acquire, name)
+            read = getattr(pool, method, None)
+            if callable(read):
+                samples.append(({"engine": name}, float(read())))
+        return samples
+
+    def record_mapping_job(self, job: Dict[str, Any]) -> None:
+        self.last_run.clear()
+        self.last_run.set(1, str(job.get("run_id")), str(job.get("status")))
+
+
+def instrument_pool(pool: Any, histogram: Histogram, engine_name: str) -> None:
+    """Time ``pool.connect()``; idempotent per pool instance.
+
+    This is the whole acquisition, not only the queue wait: it also covers
+    opening a connection when the pool grows and any pre-ping.
+    """
+    if getattr(pool, "_metrics_instrumented", False):
+        return
+    connect = pool.connect
+
+    def timed_connect() -> Any:
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            histogram.observe(time.perf_counter() - start, engine_name)
+
+    pool.connect = timed_connect
+    pool._metrics_instrumented = True
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency per route template and in-flight count."""
+
+    def __init__(self, app: ASGIApp, metrics: ApiMetrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        in_flight = self.metrics.in_flight
+        in_flight.inc(1)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.inc(-1)
+            route = scope.get("route")
+            self.metrics.request_latency.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+            )
@@ -0,0 +1,48 @@
+"""Opaque (created_at, id) cursors for keyset pagination.
+
+Listings are ordered ``created_at DESC, id DESC``; a cursor encodes the last
+row of a page and the next page starts strictly after it.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+KEYSET_ORDER_BY = "ORDER BY created_at DESC, id DESC"
+KEYSET_CLAUSE = "(created_at, id) < (:cursor_created_at, :cursor_id)"
+
+
+def encode_cursor(created_at: Any, row_id: int) -> str:
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = json.dumps([str(created_at), int(row_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Return ``(created_at, id)``; raises ``ValueError`` for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def keyset_params(cursor: str) -> Dict[str, Any]:
+    created_at, row_id = decode_cursor(cursor)
+    return {"cursor_created_at": created_at, "cursor_id": row_id}
+
+
+def next_cursor(
+    rows: Sequence[Mapping[Any, Any]], limit: Optional[int]
+) -> Optional[str]:
+    # A short page means there is nothing after it.
+    if not limit or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last["created_at"], last["id"])
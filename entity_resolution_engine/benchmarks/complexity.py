@@ -0,0 +1,299 @@
+"""Empirical growth exponents of the matchers, routers and mergers.
+
+Each case runs one pipeline function on ``generate_scaled_data`` sources at a
+few increasing scales and fits ``seconds ~ scale ** k`` by least squares on
+the log-log timings. A case fails when ``k`` exceeds its budget. Matchers
+still compare every alpha/beta pair, so their budget is quadratic; move a
+matcher to ``LINEAR`` once it gains blocking so it cannot silently regress.
+Routing (which adapts every match via ``validation/adapters.py``) and
+merging must stay linear.
+
+Example:
+    python -m entity_resolution_engine.benchmarks.complexity --case match_players
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import math
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from entity_resolution_engine.loaders.beta_loader import resolve_team_ids
+from entity_resolution_engine.matchers.competitions_matcher import (
+    match_competitions,
+)
+from entity_resolution_engine.matchers.matches_matcher import match_matches
+from entity_resolution_engine.matchers.players_matcher import match_players
+from entity_resolution_engine.matchers.seasons_matcher import match_seasons
+from entity_resolution_engine.matchers.teams_matcher import match_teams
+from entity_resolution_engine.merger.matches_merge import merge_matches
+from entity_resolution_engine.merger.players_merge import merge_players
+from entity_resolution_engine.merger.teams_merge import merge_teams
+from entity_resolution_engine.synthetic.generate_scaled_data import (
+    SEASONS_PER_COMP,
+    ScaleProfile,
+    build_tables,
+)
+from entity_resolution_engine.validation.config import get_llm_validation_config
+from entity_resolution_engine.validation.router import (
+    route_competition_matches,
+    route_match_matches,
+    route_player_matches,
+    route_season_matches,
+    route_team_matches,
+)
+
+# Budgets sit halfway between growth classes so timing noise does not flip them.
+LINEAR = 1.5
+QUADRATIC = 2.5
+REPEATS = 3
+
+Frames = Dict[str, pd.DataFrame]
+
+
+@dataclass
+class Sources:
+    """Loader-shaped frames plus the id maps and matches the stages pass on."""
+
+    profile: ScaleProfile
+    alpha: Frames
+    beta: Frames
+
+    @property
+    def team_map(self) -> Dict[int, int]:
+        return {idx: idx for idx in range(1, self.profile.shared_teams + 1)}
+
+    @property
+    def competition_map(self) -> Dict[int, int]:
+        return {idx: idx for idx in range(1, self.profile.shared_competitions + 1)}
+
+    @property
+    def season_map(self) -> Dict[int, int]:
+        return {idx: idx for idx in range(1, self.shared("seasons") + 1)}
+
+    def shared(self, table: str) -> int:
+        if table == "seasons":
+            return self.profile.shared_competitions * SEASONS_PER_COMP
+        return getattr(self.profile, f"shared_{table}")
+
+    def matches(self, entity: str, table: str) -> List[Dict[str, Any]]:
+        """Identity matches of the shared rows, shaped like matcher output."""
+        return [
+            {
+                f"alpha_{entity}_id": idx,
+                f"beta_{entity}_id": idx,
+                "confidence": 0.9,
+                "runner_up_confidence": 0.5,
+                "breakdown": {"name_similarity": 0.9},
+            }
+            for idx in range(1, self.shared(table) + 1)
+        ]
+
+
+def build_sources(scale: float) -> Sources:
+    profile = ScaleProfile.from_scale(scale)
+    alpha = build_tables("alpha", profile)
+    beta = build_tables("beta", profile)
+    beta["matches"] = resolve_team_ids(beta["matches"], beta["teams"])
+    return Sources(profile, alpha, beta)
+
+
+def _route(
+    router: Callable[..., Any], entity: str, table: str
+) -> Callable[[Sources], Any]:
+    def run(sources: Sources) -> Any:
+        return router(
+            sources.matches(entity, table),
+            sources.alpha[table],
+            sources.beta[table],
+            "growth",
+            get_llm_validation_config(),
+        )
+
+    return run
+
+
+@dataclass(frozen=True)
+class GrowthCase:
+    name: str
+    run: Callable[[Sources], Any]
+    scales: Tuple[float, ...]
+    max_exponent: float
+
+
+GROWTH_CASES = [
+    GrowthCase(
+        "match_teams",
+        lambda s: match_teams(s.alpha["teams"], s.beta["teams"]),
+        (0.5, 1, 2),
+        QUADRATIC,
+    ),
+    GrowthCase(
+        "match_competitions",
+        lambda s: match_competitions(s.alpha["competitions"], s.beta["competitions"]),
+        (1, 2, 4),
+        QUADRATIC,
+    ),
+    GrowthCase(
+        "match_seasons",
+        lambda s: match_seasons(
+            s.alpha["seasons"], s.beta["seasons"], s.competition_map
+        ),
+        (1, 2, 4),
+        QUADRATIC,
+    ),
+    GrowthCase(
+        "match_players",
+        lambda s: match_players(
+            s.alpha["players"], s.beta["players"], s.team_map, s.beta["teams"]
+        ),
+        (0.0125, 0.025, 0.05),
+        QUADRATIC,
+    ),
+    GrowthCase(
+        "match_matches",
+        lambda s: match_matches(
+            s.alpha["matches"],
+            s.beta["matches"],
+            s.team_map,
+            s.competition_map,
+            s.season_map,
+        ),
+        (0.05, 0.1, 0.2),
+        QUADRATIC,
+    ),
+    GrowthCase(
+        "route_team_matches",
+        _route(route_team_matches, "team", "teams"),
+        (2, 4, 8),
+        LINEAR,
+    ),
+    GrowthCase(
+        "route_competition_matches",
+        _route(route_competition_matches, "competition", "competitions"),
+        (4, 8, 16),
+        LINEAR,
+    ),
+    GrowthCase(
+        "route_season_matches",
+        _route(route_season_matches, "season", "seasons"),
+        (4, 8, 16),
+        LINEAR,
+    ),
+    GrowthCase(
+        "route_player_matches",
+        _route(route_player_matches, "player", "players"),
+        (0.25, 0.5, 1),
+        LINEAR,
+    ),
+    GrowthCase(
+        "route_match_matches",
+        _route(route_match_matches, "match", "matches"),
+        (0.5, 1, 2),
+        LINEAR,
+    ),
+    GrowthCase(
+        "merge_teams",
+        lambda s: merge_teams(
+            s.matches("team", "teams"), s.alpha["teams"], s.beta["teams"]
+        ),
+        (2, 4, 8),
+        LINEAR,
+    ),
+    GrowthCase(
+        "merge_players",
+        lambda s: merge_players(
+            s.matches("player", "players"),
+            s.alpha["players"],
+            s.beta["players"],
+            {},
+        ),
+        (0.25, 0.5, 1),
+        LINEAR,
+    ),
+    GrowthCase(
+        "merge_matches",
+        lambda s: merge_matches(
+            s.matches("match", "matches"),
+            s.alpha["matches"],
+            s.beta["matches"],
+            {},
+            {},
+            {},
+        ),
+        (0.5, 1, 2),
+        LINEAR,
+    ),
+]
+
+
+def fit_exponent(sizes: Sequence[float], seconds: Sequence[float]) -> float:
+    """Slope of ``log(seconds)`` against ``log(sizes)``."""
+    slope, _ = np.polyfit(
+        [math.log(size) for size in sizes],
+        [math.log(max(value, 1e-9)) for value in seconds],
+        1,
+    )
+    return float(slope)
+
+
+def measure_growth(case: GrowthCase, repeats: int = REPEATS) -> Dict[str, Any]:
+    seconds = []
+    for scale in case.scales:
+        sources = build_sources(scale)
+        timings = []
+        # Like timeit, keep collector pauses out of the measurement.
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(repeats):
+                start = time.perf_counter()
+                case.run(sources)
+                timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+        seconds.append(min(timings))
+    exponent = fit_exponent(case.scales, seconds)
+    return {
+        "case": case.name,
+        "scales": list(case.scales),
+        "seconds": seconds,
+        "exponent": exponent,
+        "max_exponent": case.max_exponent,
+        "passed": exponent <= case.max_exponent,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--case", nargs="+", choices=[case.name for case in GROWTH_CASES]
+    )
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    args = parser.parse_args()
+
+    failed = False
+    for case in GROWTH_CASES:
+        if args.case and case.name not in args.case:
+            continue
+        result = measure_growth(case, args.repeats)
+        timings = "  ".join(f"{value:.4f}s" for value in result["seconds"])
+        status = "ok" if result["passed"] else "FAIL"
+        print(
+            f"{case.name:<28} k={result['exponent']:.2f} "
+            f"(max {case.max_exponent})  {timings}  {status}"
+        )
+        failed = failed or not result["passed"]
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""End-to-end pipeline benchmark at synthetic scale factors.
+
+Each scale factor is a multiple of ``BASE_SCALE``. The alpha/beta source
+databases are seeded with ``generate_scaled_data``, then ``run_mapping`` runs
+and the benchmark records per-stage wall time, the stage telemetry phases
+(match, normalize, route, merge, write) and peak RSS. Every scale runs in a
+fresh process so its peak RSS is its own. Results can be
+stored as a baseline and later runs fail when a stage regresses beyond the
+tolerance.
+
+By default the databases are SQLite files under ``--workdir``. With
+``--backend postgres`` the ``SOURCE_ALPHA_DB_URL``, ``SOURCE_BETA_DB_URL`` and
+``UES_DB_URL`` databases (e.g. ``make up``) are used instead; they are reset.
+
+Example:
+    python -m entity_resolution_engine.benchmarks.pipeline_scale \
+        --scales 1 10 100 --baseline reports/pipeline_scale_baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import create_engine, text
+
+from entity_resolution_engine.monitoring.stage_telemetry import PHASES
+from entity_resolution_engine.synthetic.generate_scaled_data import (
+    RANDOM_SEED,
+    ScaleProfile,
+    generate,
+)
+
+# Scale 1 is 1/50 of the ``make seed`` dataset: the matchers compare every
+# alpha/beta pair, so 100x of the full seed is out of reach.
+BASE_SCALE = 0.02
+DEFAULT_SCALES = (1, 10, 100)
+STAGE_METRICS = ["stage_wall_seconds", "stage_cpu_seconds", "peak_rss_mb"]
+
+
+def scale_profile(scale: int) -> ScaleProfile:
+    return ScaleProfile.from_scale(scale * BASE_SCALE)
+
+
+def _database_urls(backend: str, directory: Path) -> Dict[str, str]:
+    if backend == "postgres":
+        urls = {
+            env: os.environ[env]
+            for env in ("SOURCE_ALPHA_DB_URL", "SOURCE_BETA_DB_URL", "UES_DB_URL")
+            if env in os.environ
+        }
+        if len(urls) != 3:
+            raise RuntimeError(
+                "postgres backend needs SOURCE_ALPHA_DB_URL, SOURCE_BETA_DB_URL "
+                "and UES_DB_URL"
+            )
+        return urls
+    directory.mkdir(parents=True, exist_ok=True)
+    # detect_types makes SQLite return DATE columns as dates, like Postgres.
+    return {
+        "SOURCE_ALPHA_DB_URL": f"sqlite:///{directory / 'alpha.db'}?detect_types=1",
+        "SOURCE_BETA_DB_URL": f"sqlite:///{directory / 'beta.db'}?detect_types=1",
+        "UES_DB_URL": f"sqlite:///{directory / 'ues.db'}",
+    }
+
+
+def run_scale(
+    scale: int,
+    workdir: str,
+    backend: str = "sqlite",
+    seed: int = RANDOM_SEED,
+    profile: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Seed and map one scale factor; meant to run in a fresh process."""
+    from entity_resolution_engine.cli import run_mapping
+
+    directory = Path(workdir) / f"scale-{scale}"
+    urls = _database_urls(backend, directory)
+    os.environ.update(urls)
+    # Keep the benchmark from replacing the API's published lineage snapshot.
+    os.environ["LINEAGE_SNAPSHOT_PATH"] = str(directory / "lineage.snap")
+    sizes = scale_profile(scale)
+    generate("alpha", sizes, url=urls["SOURCE_ALPHA_DB_URL"], seed=seed)
+    generate("beta", sizes, url=urls["SOURCE_BETA_DB_URL"], seed=seed)
+
+    started: Dict[str, float] = {}
+    stages: Dict[str, Dict[str, float]] = {}
+
+    def progress(stage: str, status: str) -> None:
+        if status == "running":
+            started[stage] = time.perf_counter()
+        else:
+            stages[stage] = {"wall_seconds": time.perf_counter() - started[stage]}
+
+    run_id = run_mapping.main(
+        progress=progress,
+        profile=profile,
+        profile_dir=str(directory / "profiles") if profile else None,
+    )
+    columns = [*STAGE_METRICS, *(f"{phase}_seconds" for phase in PHASES)]
+    engine = create_engine(urls["UES_DB_URL"])
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                f"SELECT entity_type, {', '.join(columns)} FROM pipeline_run_metrics "
+                "WHERE run_id = :run_id"
+            ),
+            {"run_id": run_id},
+        ).mappings()
+        telemetry = {
+            row["entity_type"]: {
+                column: float(row[column])
+                for column in columns
+                if row[column] is not None
+            }
+            for row in rows
+        }
+    engine.dispose()
+    for entity_type, values in telemetry.items():
+        stages[entity_type]["cpu_seconds"] = values.get("stage_cpu_seconds", 0.0)
+    peak_rss = [values.get("peak_rss_mb", 0.0) for values in telemetry.values()]
+    return {
+        "scale": scale,
+        "run_id": run_id,
+        "sizes": asdict(sizes),
+        "stages": stages,
+        "phases": {
+            entity_type: {
+                phase: values[f"{phase}_seconds"]
+                for phase in PHASES
+                if f"{phase}_seconds" in values
+            }
+            for entity_type, values in telemetry.items()
+        },
+        "peak_rss_mb": max(peak_rss, default=0.0),
+    }
+
+
+def run_benchmark(
+    scales: Sequence[int] = DEFAULT_SCALES,
+    workdir: str = "reports/pipeline_scale",
+    backend: str = "sqlite",
+    seed: int = RANDOM_SEED,
+    profile: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for scale in scales:
+        with context.Pool(1) as pool:
+            results.append(
+                pool.apply(run_scale, (scale, workdir, backend, seed, profile))
+            )
+    return results
+
+
+def compare_to_baseline(
+    results: Sequence[Dict[str, Any]],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.25,
+    min_seconds: float = 0.05,
+    min_rss_mb: float = 16.0,
+) -> List[str]:
+    """Describe every stage time or peak RSS that regressed past the baseline.
+
+    A value regresses when it exceeds ``baseline * (1 + tolerance)`` plus a
+    small absolute slack, so sub-second stages do not fail on timer noise.
+    """
+    regressions = []
+    for result in results:
+        before = baseline.get("scales", {}).get(str(result["scale"]))
+        if before is None:
+            continue
+        label = f"{result['scale']}x"
+        for stage, timing in result["stages"].items():
+            previous = before["stages"].get(stage, {}).get("wall_seconds")
+            if previous is None:
+                continue
+            limit = previous * (1 + tolerance) + min_seconds
+            if timing["wall_seconds"] > limit:
+                regressions.append(
+                    f"{label} {stage}: {timing['wall_seconds']:.3f}s > {limit:.3f}s "
+                    f"(baseline {previous:.3f}s)"
+                )
+        previous_rss = before.get("peak_rss_mb")
+        if previous_rss:
+            limit = previous_rss * (1 + tolerance) + min_rss_mb
+            if result["peak_rss_mb"] > limit:
+                regressions.append(
+                    f"{label} peak RSS: {result['peak_rss_mb']:.1f} MiB > "
+                    f"{limit:.1f} MiB (baseline {previous_rss:.1f} MiB)"
+                )
+    return regressions
+
+
+def baseline_from_results(results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "python": sys.version.split()[0],
+        "scales": {str(result["scale"]): result for result in results},
+    }
+
+
+def _format_result(result: Dict[str, Any]) -> List[str]:
+    lines = [f"scale {result['scale']}x  peak RSS {result['peak_rss_mb']:.1f} MiB"]
+    for stage, timing in result["stages"].items():
+        phases = result["phases"].get(stage, {})
+        detail = "  ".join(
+            f"{phase}={seconds:.3f}" for phase, seconds in phases.items() if seconds
+        )
+        lines.append(f"  {stage:<14}{timing['wall_seconds']:>9.3f}s  {detail}")
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", nargs="+", type=int, default=list(DEFAULT_SCALES))
+    parser.add_argument("--backend", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--workdir", default="reports/pipeline_scale")
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED)
+    parser.add_argument("--profile", nargs="?", const="cprofile")
+    parser.add_argument("--baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        scales=args.scales,
+        workdir=args.workdir,
+        backend=args.backend,
+        seed=args.seed,
+        profile=args.profile,
+    )
+    for result in results:
+        print("\n".join(_format_result(result)))
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(results, indent=2, sort_keys=True))
+    if not args.baseline:
+        return
+    baseline_path = Path(args.baseline)
+    if args.update_baseline or not baseline_path.exists():
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(
+            json.dumps(baseline_from_results(results), indent=2, sort_keys=True)
+        )
+        print(f"Baseline written to {baseline_path}")
+        return
+    regressions = compare_to_baseline(
+        results, json.loads(baseline_path.read_text()), tolerance=args.tolerance
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""Routing throughput benchmark against the in-process fake LLM provider.
+
+Example:
+    python -m entity_resolution_engine.benchmarks.routing_throughput \
+        --sizes 20 100 --concurrency 1 4 --latency-ms 20 --error-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from entity_resolution_engine.monitoring.stats import percentile
+from entity_resolution_engine.validation.config import (
+    LLMValidationConfig,
+    RateLimitConfig,
+    get_llm_validation_config,
+)
+from entity_resolution_engine.validation.fake_provider import (
+    FakeLLMTransport,
+    FakeProviderConfig,
+)
+from entity_resolution_engine.validation.llm_client import LLMClient
+from entity_resolution_engine.validation.router import (
+    RoutingOutcome,
+    route_competition_matches,
+    route_match_matches,
+    route_player_matches,
+    route_season_matches,
+    route_team_matches,
+)
+
+ENTITY_TYPES = ["team", "competition", "season", "player", "match"]
+BENCH_ENV = {
+    "ERE_BENCH_LLM_PROVIDER": "fake",
+    "ERE_BENCH_LLM_MODEL": "fake-model",
+    "ERE_BENCH_LLM_API_KEY": "fake-key",
+}
+
+Router = Callable[..., RoutingOutcome]
+
+
+def _gray_scores(size: int, low: float, high: float) -> List[float]:
+    return [low + (high - low) * (idx + 0.5) / size for idx in range(size)]
+
+
+def build_gray_zone(
+    entity_type: str, size: int, low: float, high: float
+) -> Tuple[List[Dict[str, Any]], pd.DataFrame, pd.DataFrame, Router]:
+    """Synthetic matches whose scores all fall inside the gray zone."""
+    ids = list(range(1, size + 1))
+    scores = _gray_scores(size, low, high)
+    matches: List[Dict[str, Any]]
+    if entity_type == "team":
+        alpha = pd.DataFrame(
+            [{"team_id": i, "name": f"Team {i}", "country": "US"} for i in ids]
+        )
+        beta = pd.DataFrame(
+            [{"id": i, "display_name": f"Team {i} FC", "region": "US"} for i in ids]
+        )
+        matches = [
+            {"alpha_team_id": i, "beta_team_id": i, "confidence": s}
+            for i, s in zip(ids, scores)
+        ]
+        return matches, alpha, beta, route_team_matches
+    if entity_type == "competition":
+        alpha = pd.DataFrame(
+            [{"competition_id": i, "name": f"Cup {i}", "country": "US"} for i in ids]
+        )
+        beta = pd.DataFrame(
+            [{"id": i, "title": f"Cup {i} Showcase", "locale": "US"} for i in ids]
+        )
+        matches = [
+            {"alpha_competition_id": i, "beta_competition_id": i, "confidence": s}
+            for i, s in zip(ids, scores)
+        ]
+        return matches, alpha, beta, route_competition_matches
+    if entity_type == "season":
+        alpha = pd.DataFrame([{"season_id": i, "name": "2020/21"} for i in ids])
+        beta = pd.DataFrame([{"id": i, "label": "2020-2021"} for i in ids])
+        matches = [
+            {"alpha_season_id": i, "beta_season_id": i, "confidence": s}
+            for i, s in zip(ids, scores)
+        ]
+        return matches, alpha, beta, route_season_matches
+    if entity_type == "player":
+        alpha = pd.DataFrame(
+            [
+                {"player_id": i, "name": f"Player {i}", "dob": dt.date(1995, 1, 1)}
+                for i in ids
+            ]
+        )
+        beta = pd.DataFrame(
+            [{"id": i, "full_name": f"P. {i}", "birth_year": 1995} for i in ids]
+        )
+        matches = [
+            {
+                "alpha_player_id": i,
+                "beta_player_id": i,
+                "confidence": s,
+                "breakdown": {"name_similarity": s},
+            }
+            for i, s in zip(ids, scores)
+        ]
+        return matches, alpha, beta, route_player_matches
+    if entity_type == "match":
+        alpha = pd.DataFrame(
+            [{"match_id": i, "match_date": dt.date(2024, 5, 1)} for i in ids]
+        )
+        beta = pd.DataFrame([{"id": i, "match_date": dt.date(2024, 5, 1)} for i in ids])
+        matches = [
+            {"alpha_match_id": i, "beta_match_id": i, "confidence": s}
+            for i, s in zip(ids, scores)
+        ]
+        return matches, alpha, beta, route_match_matches
+    raise ValueError(f"Unknown entity type: {entity_type}")
+
+
+def run_routing_benchmark(
+    entity_types: Sequence[str] = ENTITY_TYPES,
+    sizes: Sequence[int] = (20, 100),
+    concurrency_levels: Sequence[int] = (1, 4),
+    provider_config: Optional[FakeProviderConfig] = None,
+    max_retries: int = 0,
+    base_config: Optional[LLMValidationConfig] = None,
+) -> List[Dict[str, Any]]:
+    for key, value in BENCH_ENV.items():
+        os.environ.setdefault(key, value)
+    base_config = base_config or get_llm_validation_config()
+    provider_config = provider_config or FakeProviderConfig()
+    results: List[Dict[str, Any]] = []
+    for entity_type in entity_types:
+        threshold = base_config.threshold_for(entity_type)
+        for size in sizes:
+            matches, alpha, beta, router = build_gray_zone(
+                entity_type, size, threshold.low, threshold.high
+            )
+            for concurrency in concurrency_levels:
+                rate_limit = RateLimitConfig(
+                    max_concurrency=concurrency,
+                    min_concurrency=concurrency,
+                    max_retries=max_retries,
+                )
+                config = replace(
+                    base_config,
+                    enabled=True,
+                    provider_env="ERE_BENCH_LLM_PROVIDER",
+                    model_env="ERE_BENCH_LLM_MODEL",
+                    api_key_env="ERE_BENCH_LLM_API_KEY",
+                    max_calls_per_entity_type_per_run=size,
+                    rate_limit=rate_limit,
+                )
+                transport = FakeLLMTransport(provider_config)
+                client = LLMClient(
+                    provider="fake",
+                    model="fake-model",
+                    api_key="fake-key",
+                    api_url="http://fake-llm.local/v1/chat/completions",
+                    rate_limit=rate_limit,
+                    transport=transport,
+                )
+                start = time.perf_counter()
+                outcome = router(
+                    matches,
+                    alpha,
+                    beta,
+                    run_id="bench",
+                    config=config,
+                    llm_client=client,
+                )
+                elapsed_s = time.perf_counter() - start
+                metrics = outcome.metrics
+                latencies = transport.latencies_ms
+                results.append(
+                    {
+                        "entity_type": entity_type,
+                        "gray_zone_size": size,
+                        "concurrency": concurrency,
+                        "elapsed_s": elapsed_s,
+                        "llm_call_count": metrics["llm_call_count"],
+                        "provider_request_count": transport.call_count,
+                        "calls_per_s": (
+                            metrics["llm_call_count"] / elapsed_s if elapsed_s else 0.0
+                        ),
+                        "latency_p50_ms": percentile(latencies, 50),
+                        "latency_p95_ms": percentile(latencies, 95),
+                        "latency_p99_ms": percentile(latencies, 99),
+                        "llm_error_count": metrics["llm_error_count"],
+                        "circuit_breaker_trips": int(
+                            metrics["llm_disabled_reason"] == "circuit_breaker_open"
+                        ),
+                    }
+                )
+    return results
+
+
+def _format_row(row: Dict[str, Any]) -> str:
+    def _ms(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.1f}"
+
+    return (
+        f"{row['entity_type']:<12}{row['gray_zone_size']:>6}{row['concurrency']:>5}"
+        f"{row['calls_per_s']:>10.1f}{_ms(row['latency_p50_ms']):>9}"
+        f"{_ms(row['latency_p95_ms']):>9}{_ms(row['latency_p99_ms']):>9}"
+        f"{row['llm_error_count']:>8}{row['circuit_breaker_trips']:>6}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entity-types", nargs="+", default=ENTITY_TYPES)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[20, 100])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4])
+    parser.add_argument(
+        "--latency-distribution",
+        choices=["fixed", "uniform", "lognormal"],
+        default="lognormal",
+    )
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--invalid-json-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limited-rate", type=float, default=0.0)
+    parser.add_argument("--max-retries", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    provider_config = FakeProviderConfig(
+        latency_distribution=args.latency_distribution,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        invalid_json_rate=args.invalid_json_rate,
+        rate_limited_rate=args.rate_limited_rate,
+        seed=args.seed,
+    )
+    results = run_routing_benchmark(
+        entity_types=args.entity_types,
+        sizes=args.sizes,
+        concurrency_levels=args.concurrency,
+        provider_config=provider_config,
+        max_retries=args.max_retries,
+    )
+    print(
+        f"{'entity':<12}{'size':>6}{'conc':>5}{'calls/s':>10}{'p50':>9}"
+        f"{'p95':>9}{'p99':>9}{'errors':>8}{'trips':>6}"
+    )
+    for row in results:
+        print(_format_row(row))
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,134 +14,291 @@ from entity_resolution_engine.matchers.matches_matcher import match_matches
 from entity_resolution_engine.merger.teams_merge import merge_teams
 from entity_resolution_engine.merger.players_merge import merge_players
 from entity_resolution_engine.merger.matches_merge import merge_matches
+import argparse
+import logging
+import os
+from contextlib import nullcontext
+from dataclasses import replace
 from datetime import datetime, timezone
+from typing import Callable, ContextManager, List, Optional
 from uuid import uuid4
 
-from entity_resolution_engine.monitoring.anomaly_detector import detect_anomalies
-from entity_resolution_engine.monitoring.llm_triage import generate_triage_report
+from entity_resolution_engine.lineage.snapshot import publish_lineage_snapshot
+from entity_resolution_engine.monitoring.anomaly_detector import detect_all_anomalies
+from entity_resolution_engine.monitoring.profiler import (
+    DEFAULT_PROFILE_DIR,
+    PROFILE_MODES,
+    StageProfiler,
+)
+from entity_resolution_engine.monitoring.run_summary import materialize_run_summary
+from entity_resolution_engine.monitoring.stage_telemetry import RunTelemetry, phase
+from entity_resolution_engine.monitoring.triage_worker import TriageWorker
 from entity_resolution_engine.qa.quality_gates import (
+    QualityGateAbort,
+    StageQualityGates,
     evaluate_quality_gates,
     get_quality_gate_config,
 )
 from entity_resolution_engine.ues_writer.writer import UESWriter
-from entity_resolution_engine.validation.config import get_llm_validation_config
+from entity_resolution_engine.validation.config import (
+    LLMValidationConfig,
+    get_llm_validation_config,
+)
 from entity_resolution_engine.validation.router import (
+    RoutingOutcome,
     route_competition_matches,
     route_match_matches,
     route_player_matches,
     route_season_matches,
     route_team_matches,
 )
+from entity_resolution_engine.validation.review_cache import ReviewDecisionCache
+from entity_resolution_engine.validation.scheduler import RunCallBudget
 
 
-def main() -> str:
-    run_id = str(uuid4())
-    validation_config = get_llm_validation_config()
-    quality_gate_config = get_quality_gate_config()
-    alpha_data = load_alpha_data()
-    beta_data = load_beta_data()
-    writer = UESWriter()
-    writer.reset()
-
-    team_matches = match_teams(alpha_data["teams"], beta_data["teams"])
-    team_start = datetime.now(timezone.utc)
-    team_outcome = route_team_matches(
-        team_matches,
-        alpha_data["teams"],
-        beta_data["teams"],
-        run_id,
-        config=validation_config,
-    )
-    team_outcome.metrics["started_at"] = team_start
-    team_outcome.metrics["finished_at"] = datetime.now(timezone.utc)
-    writer.write_llm_reviews(team_outcome.review_items)
-    writer.write_run_metrics(team_outcome.metrics)
-    detect_anomalies(writer.engine, run_id, "team")
-    generate_triage_report(writer.engine, run_id, "team")
-    team_entities, alpha_team_to_ues, _ = merge_teams(
-        team_outcome.approved_matches, alpha_data["teams"], beta_data["teams"]
-    )
-    writer.write_teams(team_entities)
+ENTITY_STAGES = ["team", "competition", "season", "player", "match"]
+MAPPING_STAGES = ["load", *ENTITY_STAGES, "quality_gates", "publish"]
+
+ProgressCallback = Callable[[str, str], None]
+
+
+def _report(progress: Optional[ProgressCallback], stage: str, status: str) -> None:
+    if progress is not None:
+        progress(stage, status)
+
+
+def _routing_config(
+    config: LLMValidationConfig, stage_gates: StageQualityGates
+) -> LLMValidationConfig:
+    # After a hard gate failure in skip_llm mode later stages route without
+    # the LLM, using the configured fallback decision.
+    return replace(config, enabled=False) if stage_gates.skip_llm else config
+
+
+def _finish_routing(
+    writer: UESWriter,
+    stage_gates: StageQualityGates,
+    stage: str,
+    outcome: RoutingOutcome,
+    progress: Optional[ProgressCallback],
+    telemetry: Optional[RunTelemetry] = None,
+) -> None:
+    if stage_gates.skip_llm:
+        outcome.metrics["llm_disabled_reason"] = "quality_gate_failed"
+    with phase("write"):
+        writer.write_llm_reviews(outcome.review_items)
+    stage_gates.record(stage, outcome.metrics)
+    if not stage_gates.should_abort:
+        return
+    _write_stage_metrics(writer, outcome, stage, telemetry)
+    materialize_run_summary(writer.engine, writer.run_id)
+    writer.write_quality_gate_result(stage_gates.partial_result())
+    _report(progress, stage, "aborted")
+    raise QualityGateAbort(writer.run_id, stage, stage_gates.failed_gates)
+
+
+def _write_stage_metrics(
+    writer: UESWriter,
+    outcome: RoutingOutcome,
+    stage: str,
+    telemetry: Optional[RunTelemetry],
+) -> None:
+    # Written once the stage is done so the row carries its telemetry.
+    metrics = dict(outcome.metrics)
+    if telemetry is not None:
+        metrics.update(telemetry.metrics(stage))
+    writer.write_run_metrics(metrics)
+
+
+def _profiled(profiler: Optional[StageProfiler], stage: str) -> ContextManager[None]:
+    return profiler.stage(stage) if profiler is not None else nullcontext()
+
+
+def main(
+    run_id: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None,
+    triage_worker: Optional[TriageWorker] = None,
+    profile: Optional[str] = None,
+    profile_dir: Optional[str] = None,
+) -> str:
+    """Run the mapping pipeline and return its run id.
+
+    ``profile`` ("cprofile" or "sampling") profiles every stage into
+    ``<profile_dir>/<run_id>/`` (default ``$MAPPING_PROFILE_DIR`` or
+    ``profiles``).
+    """
+    run_id = run_id or str(uuid4())
+    profiler = None
+    if profile:
+        profiler = StageProfiler(
+            run_id,
+            profile_dir or os.getenv("MAPPING_PROFILE_DIR") or DEFAULT_PROFILE_DIR,
+            mode=profile,
+        )
+    telemetry = RunTelemetry()
+    writer = UESWriter(run_id=run_id)
+    with writer.run_lock(), telemetry.activate():
+        _run(run_id, writer, progress, triage_worker, telemetry, profiler)
+    print("Mapping pipeline completed")
+    return run_id
+
+
+def _run(
+    run_id: str,
+    writer: UESWriter,
+    progress: Optional[ProgressCallback],
+    triage_worker: Optional[TriageWorker],
+    telemetry: RunTelemetry,
+    profiler: Optional[StageProfiler],
+) -> None:
+    _report(progress, "load", "running")
+    with _profiled(profiler, "load"):
+        validation_config = get_llm_validation_config()
+        quality_gate_config = get_quality_gate_config()
+        llm_budget = RunCallBudget.from_config(validation_config)
+        alpha_data = load_alpha_data()
+        beta_data = load_beta_data()
+        writer.reset()
+        stage_gates = StageQualityGates(run_id, quality_gate_config)
+        review_cache = ReviewDecisionCache(writer.engine)
+    _report(progress, "load", "completed")
+
+    _report(progress, "team", "running")
+    with _profiled(profiler, "team"), telemetry.stage("team"):
+        with phase("match"):
+            team_matches = match_teams(alpha_data["teams"], beta_data["teams"])
+        team_start = datetime.now(timezone.utc)
+        with phase("route"):
+            team_outcome = route_team_matches(
+                team_matches,
+                alpha_data["teams"],
+                beta_data["teams"],
+                run_id,
+                config=_routing_config(validation_config, stage_gates),
+                budget=llm_budget,
+                review_cache=review_cache,
+            )
+        team_outcome.metrics["started_at"] = team_start
+        team_outcome.metrics["finished_at"] = datetime.now(timezone.utc)
+        _finish_routing(writer, stage_gates, "team", team_outcome, progress, telemetry)
+        with phase("merge"):
+            team_entities, alpha_team_to_ues, _ = merge_teams(
+                team_outcome.approved_matches, alpha_data["teams"], beta_data["teams"]
+            )
+        with phase("write"):
+            writer.write_teams(team_entities)
+    _write_stage_metrics(writer, team_outcome, "team", telemetry)
     alpha_team_to_beta = {
         m["alpha_team_id"]: m["beta_team_id"] for m in team_outcome.approved_matches
     }
+    _report(progress, "team", "completed")
 
-    comp_matches = match_competitions(
-        alpha_data["competitions"], beta_data["competitions"]
-    )
-    comp_start = datetime.now(timezone.utc)
-    comp_outcome = route_competition_matches(
-        comp_matches,
-        alpha_data["competitions"],
-        beta_data["competitions"],
-        run_id,
-        config=validation_config,
-    )
-    comp_outcome.metrics["started_at"] = comp_start
-    comp_outcome.metrics["finished_at"] = datetime.now(timezone.utc)
-    writer.write_llm_reviews(comp_outcome.review_items)
-    writer.write_run_metrics(comp_outcome.metrics)
-    detect_anomalies(writer.engine, run_id, "competition")
-    generate_triage_report(writer.engine, run_id, "competition")
-    comp_entities, alpha_comp_to_ues, beta_comp_to_ues = build_competition_entities(
-        comp_outcome.approved_matches
-    )
-    writer.write_competitions(comp_entities)
+    _report(progress, "competition", "running")
+    with _profiled(profiler, "competition"), telemetry.stage("competition"):
+        with phase("match"):
+            comp_matches = match_competitions(
+                alpha_data["competitions"], beta_data["competitions"]
+            )
+        comp_start = datetime.now(timezone.utc)
+        with phase("route"):
+            comp_outcome = route_competition_matches(
+                comp_matches,
+                alpha_data["competitions"],
+                beta_data["competitions"],
+                run_id,
+                config=_routing_config(validation_config, stage_gates),
+                budget=llm_budget,
+                review_cache=review_cache,
+            )
+        comp_outcome.metrics["started_at"] = comp_start
+        comp_outcome.metrics["finished_at"] = datetime.now(timezone.utc)
+        _finish_routing(
+            writer, stage_gates, "competition", comp_outcome, progress, telemetry
+        )
+        with phase("merge"):
+            comp_entities, alpha_comp_to_ues, beta_comp_to_ues = (
+                build_competition_entities(comp_outcome.approved_matches)
+            )
+        with phase("write"):
+            writer.write_competitions(comp_entities)
+    _write_stage_metrics(writer, comp_outcome, "competition", telemetry)
+    _report(progress, "competition", "completed")
 
+    _report(progress, "season", "running")
     comp_map = {
         m["alpha_competition_id"]: m["beta_competition_id"]
         for m in comp_outcome.approved_matches
     }
-    season_matches = match_seasons(
-        alpha_data["seasons"], beta_data["seasons"], comp_map
-    )
-    season_start = datetime.now(timezone.utc)
-    season_outcome = route_season_matches(
-        season_matches,
-        alpha_data["seasons"],
-        beta_data["seasons"],
-        run_id,
-        config=validation_config,
-    )
-    season_outcome.metrics["started_at"] = season_start
-    season_outcome.metrics["finished_at"] = datetime.now(timezone.utc)
-    writer.write_llm_reviews(season_outcome.review_items)
-    writer.write_run_metrics(season_outcome.metrics)
-    detect_anomalies(writer.engine, run_id, "season")
-    generate_triage_report(writer.engine, run_id, "season")
-    season_entities, alpha_season_to_ues, beta_season_to_ues = build_season_entities(
-        season_outcome.approved_matches, alpha_comp_to_ues
-    )
-    writer.write_seasons(season_entities)
+    with _profiled(profiler, "season"), telemetry.stage("season"):
+        with phase("match"):
+            season_matches = match_seasons(
+                alpha_data["seasons"], beta_data["seasons"], comp_map
+            )
+        season_start = datetime.now(timezone.utc)
+        with phase("route"):
+            season_outcome = route_season_matches(
+                season_matches,
+                alpha_data["seasons"],
+                beta_data["seasons"],
+                run_id,
+                config=_routing_config(validation_config, stage_gates),
+                budget=llm_budget,
+                review_cache=review_cache,
+            )
+        season_outcome.metrics["started_at"] = season_start
+        season_outcome.metrics["finished_at"] = datetime.now(timezone.utc)
+        _finish_routing(
+            writer, stage_gates, "season", season_outcome, progress, telemetry
+        )
+        with phase("merge"):
+            season_entities, alpha_season_to_ues, beta_season_to_ues = (
+                build_season_entities(
+                    season_outcome.approved_matches, alpha_comp_to_ues
+                )
+            )
+        with phase("write"):
+            writer.write_seasons(season_entities)
+    _write_stage_metrics(writer, season_outcome, "season", telemetry)
+    _report(progress, "season", "completed")
 
-    player_matches = match_players(
-        alpha_data["players"],
-        beta_data["players"],
-        alpha_team_to_beta,
-        beta_data["teams"],
-    )
-    player_start = datetime.now(timezone.utc)
-    player_outcome = route_player_matches(
-        player_matches,
-        alpha_data["players"],
-        beta_data["players"],
-        run_id,
-        config=validation_config,
-    )
-    player_outcome.metrics["started_at"] = player_start
-    player_outcome.metrics["finished_at"] = datetime.now(timezone.utc)
-    writer.write_llm_reviews(player_outcome.review_items)
-    writer.write_run_metrics(player_outcome.metrics)
-    detect_anomalies(writer.engine, run_id, "player")
-    generate_triage_report(writer.engine, run_id, "player")
-    player_entities, alpha_player_to_ues, beta_player_to_ues = merge_players(
-        player_outcome.approved_matches,
-        alpha_data["players"],
-        beta_data["players"],
-        alpha_team_to_ues,
-    )
-    writer.write_players(player_entities)
+    _report(progress, "player", "running")
+    with _profiled(profiler, "player"), telemetry.stage("player"):
+        with phase("match"):
+            player_matches = match_players(
+                alpha_data["players"],
+                beta_data["players"],
+                alpha_team_to_beta,
+                beta_data["teams"],
+            )
+        player_start = datetime.now(timezone.utc)
+        with phase("route"):
+            player_outcome = route_player_matches(
+                player_matches,
+                alpha_data["players"],
+                beta_data["players"],
+                run_id,
+                config=_routing_config(validation_config, stage_gates),
+                budget=llm_budget,
+                review_cache=review_cache,
+            )
+        player_outcome.metrics["started_at"] = player_start
+        player_outcome.metrics["finished_at"] = datetime.now(timezone.utc)
+        _finish_routing(
+            writer, stage_gates, "player", player_outcome, progress, telemetry
+        )
+        with phase("merge"):
+            player_entities, alpha_player_to_ues, beta_player_to_ues = merge_players(
+                player_outcome.approved_matches,
+                alpha_data["players"],
+                beta_data["players"],
+                alpha_team_to_ues,
+            )
+        with phase("write"):
+            writer.write_players(player_entities)
+    _write_stage_metrics(writer, player_outcome, "player", telemetry)
+    _report(progress, "player", "completed")
 
+    _report(progress, "match", "running")
     competition_map_raw = {
         m["alpha_competition_id"]: m["beta_competition_id"]
         for m in comp_outcome.approved_matches
@@ -150,44 +307,91 @@ def main() -> str:
         m["alpha_season_id"]: m["beta_season_id"]
         for m in season_outcome.approved_matches
     }
-    match_matches_result = match_matches(
-        alpha_data["matches"],
-        beta_data["matches"],
-        alpha_team_to_beta,
-        competition_map_raw,
-        season_map_raw,
-    )
-    match_start = datetime.now(timezone.utc)
-    match_outcome = route_match_matches(
-        match_matches_result,
-        alpha_data["matches"],
-        beta_data["matches"],
-        run_id,
-        config=validation_config,
-    )
-    match_outcome.metrics["started_at"] = match_start
-    match_outcome.metrics["finished_at"] = datetime.now(timezone.utc)
-    writer.write_llm_reviews(match_outcome.review_items)
-    writer.write_run_metrics(match_outcome.metrics)
-    detect_anomalies(writer.engine, run_id, "match")
-    generate_triage_report(writer.engine, run_id, "match")
-    match_entities = merge_matches(
-        match_outcome.approved_matches,
-        alpha_data["matches"],
-        beta_data["matches"],
-        alpha_team_to_ues,
-        alpha_comp_to_ues,
-        alpha_season_to_ues,
-    )
-    writer.write_matches(match_entities)
+    with _profiled(profiler, "match"), telemetry.stage("match"):
+        with phase("match"):
+            match_matches_result = match_matches(
+                alpha_data["matches"],
+                beta_data["matches"],
+                alpha_team_to_beta,
+                competition_map_raw,
+                season_map_raw,
+            )
+        match_start = datetime.now(timezone.utc)
+        with phase("route"):
+            match_outcome = route_match_matches(
+                match_matches_result,
+                alpha_data["matches"],
+                beta_data["matches"],
+                run_id,
+                config=_routing_config(validation_config, stage_gates),
+                budget=llm_budget,
+                review_cache=review_cache,
+            )
+        match_outcome.metrics["started_at"] = match_start
+        match_outcome.metrics["finished_at"] = datetime.now(timezone.utc)
+        _finish_routing(
+            writer, stage_gates, "match", match_outcome, progress, telemetry
+        )
+        with phase("merge"):
+            match_entities = merge_matches(
+                match_outcome.approved_matches,
+                alpha_data["matches"],
+                beta_data["matches"],
+                alpha_team_to_ues,
+                alpha_comp_to_ues,
+                alpha_season_to_ues,
+            )
+        with phase("write"):
+            writer.write_matches(match_entities)
+    _write_stage_metrics(writer, match_outcome, "match", telemetry)
+    _report(progress, "match", "completed")
 
-    gate_result = evaluate_quality_gates(writer.engine, run_id, quality_gate_config)
-    writer.write_quality_gate_result(gate_result)
+    _report(progress, "quality_gates", "running")
+    with _profiled(profiler, "quality_gates"):
+        detect_all_anomalies(writer.engine, run_id)
+        # Triage reports (possibly LLM calls) are written in the background.
+        triage_worker = triage_worker or TriageWorker(writer.engine)
+        for entity_type in ENTITY_STAGES:
+            triage_worker.submit(run_id, entity_type)
+        summary = materialize_run_summary(writer.engine, run_id)
+        gate_result = evaluate_quality_gates(
+            writer.engine, run_id, quality_gate_config, summary=summary
+        )
+        gate_result["gate_values"].update(stage_gates.stage_gate_values())
+        if stage_gates.skip_llm:
+            gate_result["status"] = "FAIL"
+            gate_result["failed_gates"].extend(
+                f"{gate}@{stage_gates.failed_stage}"
+                for gate in stage_gates.failed_gates
+            )
+        writer.write_quality_gate_result(gate_result)
+    _report(progress, "quality_gates", "completed")
+
+    _report(progress, "publish", "running")
+    with _profiled(profiler, "publish"):
+        publish_lineage_snapshot(writer.engine, run_id)
+    _report(progress, "publish", "completed")
 
-    print("Mapping pipeline completed")
-    return run_id
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the entity mapping pipeline.")
+    parser.add_argument("--run-id")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=PROFILE_MODES,
+        help="profile every stage (default mode: cprofile)",
+    )
+    parser.add_argument("--profile-dir")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    run_id = main()
+    args = _parse_args()
+    if args.profile:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+    run_id = main(
+        run_id=args.run_id, profile=args.profile, profile_dir=args.profile_dir
+    )
     print(f"Run ID: {run_id}")
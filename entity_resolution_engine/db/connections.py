@@ -1,15 +1,23 @@
 import os
+import re
 from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, make_url, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 load_dotenv()
 
 BASE_DIR = Path(__file__).resolve().parent
 
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
 
 def get_engine(env_var: str, fallback: Optional[str] = None) -> Engine:
     url = os.getenv(env_var, fallback)
@@ -18,12 +26,40 @@ def get_engine(env_var: str, fallback: Optional[str] = None) -> Engine:
     return create_engine(url, echo=False, future=True)
 
 
+def get_async_engine(env_var: str, fallback: Optional[str] = None) -> AsyncEngine:
+    url = os.getenv(env_var, fallback)
+    if not url:
+        raise RuntimeError(f"Database URL for {env_var} is not configured")
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return create_async_engine(parsed.set(drivername=drivername), echo=False)
+
+
+# The schema files target Postgres. SQLite files are used as a local stand-in
+# (tests, benchmarks), so the few Postgres-only constructs are rewritten.
+SQLITE_REWRITES = [
+    (re.compile(r"\bSERIAL PRIMARY KEY\b"), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r"\bNOW\(\)"), "CURRENT_TIMESTAMP"),
+]
+
+
+def _dialect_statement(engine: Engine, stmt: str) -> Optional[str]:
+    if engine.dialect.name != "sqlite":
+        return stmt
+    if "ADD COLUMN IF NOT EXISTS" in stmt:
+        # Migrations for older Postgres databases; CREATE TABLE has the column.
+        return None
+    for pattern, replacement in SQLITE_REWRITES:
+        stmt = pattern.sub(replacement, stmt)
+    return stmt
+
+
 def init_db(engine: Engine, schema_file: str) -> None:
     path = BASE_DIR / schema_file
     sql = path.read_text()
     with engine.connect() as conn:
         for statement in sql.split(";"):
-            stmt = statement.strip()
+            stmt = _dialect_statement(engine, statement.strip())
             if stmt:
                 conn.execute(text(stmt))
         conn.commit()
@@ -3,7 +3,9 @@ CREATE TABLE IF NOT EXISTS ues_teams (
     name TEXT,
     country TEXT,
     merge_confidence NUMERIC,
-    lineage JSONB
+    lineage JSONB,
+    run_id TEXT,
+    updated_at TIMESTAMP DEFAULT NOW()
 );
 
 CREATE TABLE IF NOT EXISTS ues_competitions (
@@ -11,7 +13,9 @@ CREATE TABLE IF NOT EXISTS ues_competitions (
     name TEXT,
     country TEXT,
     merge_confidence NUMERIC,
-    lineage JSONB
+    lineage JSONB,
+    run_id TEXT,
+    updated_at TIMESTAMP DEFAULT NOW()
 );
 
 CREATE TABLE IF NOT EXISTS ues_seasons (
@@ -20,7 +24,9 @@ CREATE TABLE IF NOT EXISTS ues_seasons (
     end_year INTEGER,
     competition_ues_id TEXT REFERENCES ues_competitions(ues_competition_id),
     merge_confidence NUMERIC,
-    lineage JSONB
+    lineage JSONB,
+    run_id TEXT,
+    updated_at TIMESTAMP DEFAULT NOW()
 );
 
 CREATE TABLE IF NOT EXISTS ues_players (
@@ -33,7 +39,9 @@ CREATE TABLE IF NOT EXISTS ues_players (
     foot TEXT,
     team_ues_id TEXT REFERENCES ues_teams(ues_team_id),
     merge_confidence NUMERIC,
-    lineage JSONB
+    lineage JSONB,
+    run_id TEXT,
+    updated_at TIMESTAMP DEFAULT NOW()
 );
 
 CREATE TABLE IF NOT EXISTS ues_matches (
@@ -44,9 +52,22 @@ CREATE TABLE IF NOT EXISTS ues_matches (
     competition_ues_id TEXT REFERENCES ues_competitions(ues_competition_id),
     match_date DATE,
     merge_confidence NUMERIC,
-    lineage JSONB
+    lineage JSONB,
+    run_id TEXT,
+    updated_at TIMESTAMP DEFAULT NOW()
 );
 
+ALTER TABLE ues_teams ADD COLUMN IF NOT EXISTS run_id TEXT;
+ALTER TABLE ues_teams ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT NOW();
+ALTER TABLE ues_competitions ADD COLUMN IF NOT EXISTS run_id TEXT;
+ALTER TABLE ues_competitions ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT NOW();
+ALTER TABLE ues_seasons ADD COLUMN IF NOT EXISTS run_id TEXT;
+ALTER TABLE ues_seasons ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT NOW();
+ALTER TABLE ues_players ADD COLUMN IF NOT EXISTS run_id TEXT;
+ALTER TABLE ues_players ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT NOW();
+ALTER TABLE ues_matches ADD COLUMN IF NOT EXISTS run_id TEXT;
+ALTER TABLE ues_matches ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT NOW();
+
 CREATE TABLE IF NOT EXISTS source_lineage (
     source_system TEXT,
     source_id TEXT,
@@ -54,6 +75,9 @@ CREATE TABLE IF NOT EXISTS source_lineage (
     ues_entity_id TEXT
 );
 
+CREATE INDEX IF NOT EXISTS idx_source_lineage_lookup
+    ON source_lineage (source_system, ues_entity_type, source_id);
+
 CREATE TABLE IF NOT EXISTS llm_match_reviews (
     id SERIAL PRIMARY KEY,
     run_id TEXT,
@@ -86,14 +110,96 @@ CREATE TABLE IF NOT EXISTS pipeline_run_metrics (
     llm_no_match_count INTEGER,
     llm_review_count INTEGER,
     llm_call_count INTEGER,
+    llm_call_budget INTEGER,
+    review_cache_resolved_count INTEGER,
     llm_error_count INTEGER,
     llm_invalid_json_retry_count INTEGER,
     llm_avg_latency_ms NUMERIC,
+    llm_latency_p50_ms NUMERIC,
+    llm_latency_p95_ms NUMERIC,
+    llm_latency_p99_ms NUMERIC,
+    llm_latency_max_ms NUMERIC,
+    llm_retry_count INTEGER,
+    llm_prompt_tokens INTEGER,
+    llm_completion_tokens INTEGER,
+    llm_bytes_sent BIGINT,
+    llm_throttle_ms NUMERIC,
+    llm_effective_concurrency NUMERIC,
     llm_fallback_mode TEXT,
     llm_disabled_reason TEXT,
+    stage_wall_seconds NUMERIC,
+    stage_cpu_seconds NUMERIC,
+    peak_rss_mb NUMERIC,
+    load_seconds NUMERIC,
+    match_seconds NUMERIC,
+    normalize_seconds NUMERIC,
+    route_seconds NUMERIC,
+    merge_seconds NUMERIC,
+    write_seconds NUMERIC,
+    candidate_pairs BIGINT,
+    pruned_pairs BIGINT,
+    normalizer_calls BIGINT,
+    rows_written BIGINT,
     created_at TIMESTAMP DEFAULT NOW()
 );
 
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS llm_throttle_ms NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS llm_effective_concurrency NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS llm_call_budget INTEGER;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS review_cache_resolved_count INTEGER;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS llm_latency_p50_ms NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS llm_latency_p95_ms NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS llm_latency_p99_ms NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS llm_latency_max_ms NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS llm_retry_count INTEGER;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS llm_prompt_tokens INTEGER;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS llm_completion_tokens INTEGER;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS llm_bytes_sent BIGINT;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS stage_wall_seconds NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS stage_cpu_seconds NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS peak_rss_mb NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS load_seconds NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS match_seconds NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS normalize_seconds NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS route_seconds NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS merge_seconds NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS write_seconds NUMERIC;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS candidate_pairs BIGINT;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS pruned_pairs BIGINT;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS normalizer_calls BIGINT;
+ALTER TABLE pipeline_run_metrics ADD COLUMN IF NOT EXISTS rows_written BIGINT;
+
+CREATE INDEX IF NOT EXISTS idx_llm_match_reviews_pair_status
+    ON llm_match_reviews (entity_type, left_id, right_id, status);
+
+-- Keyset pagination: listings order by (created_at DESC, id DESC).
+CREATE INDEX IF NOT EXISTS idx_llm_match_reviews_created
+    ON llm_match_reviews (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_llm_match_reviews_status_created
+    ON llm_match_reviews (status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_llm_match_reviews_entity_status_created
+    ON llm_match_reviews (entity_type, status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_llm_match_reviews_run_status_created
+    ON llm_match_reviews (run_id, status, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_run_metrics_run
+    ON pipeline_run_metrics (run_id, entity_type);
+
+-- Welford running statistics per (entity_type, metric_name), kept across
+-- UESWriter.reset() so anomaly detection always has a baseline.
+CREATE TABLE IF NOT EXISTS metric_baselines (
+    entity_type TEXT NOT NULL,
+    metric_name TEXT NOT NULL,
+    sample_count INTEGER NOT NULL,
+    mean DOUBLE PRECISION,
+    m2 DOUBLE PRECISION,
+    last_run_id TEXT,
+    last_finished_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (entity_type, metric_name)
+);
+ALTER TABLE metric_baselines ADD COLUMN IF NOT EXISTS last_finished_at TIMESTAMP;
+
 CREATE TABLE IF NOT EXISTS anomaly_events (
     id SERIAL PRIMARY KEY,
     run_id TEXT,
@@ -106,6 +212,13 @@ CREATE TABLE IF NOT EXISTS anomaly_events (
     created_at TIMESTAMP DEFAULT NOW()
 );
 
+CREATE INDEX IF NOT EXISTS idx_anomaly_events_created
+    ON anomaly_events (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_anomaly_events_run_created
+    ON anomaly_events (run_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_anomaly_events_entity_created
+    ON anomaly_events (entity_type, created_at DESC, id DESC);
+
 CREATE TABLE IF NOT EXISTS anomaly_triage_reports (
     id SERIAL PRIMARY KEY,
     run_id TEXT,
@@ -114,6 +227,27 @@ CREATE TABLE IF NOT EXISTS anomaly_triage_reports (
     created_at TIMESTAMP DEFAULT NOW()
 );
 
+-- LLM triage reports keyed by anomaly signature, kept across resets so a
+-- recurring pattern reuses its earlier report.
+CREATE TABLE IF NOT EXISTS triage_report_cache (
+    signature TEXT PRIMARY KEY,
+    entity_type TEXT,
+    report JSONB,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS run_summaries (
+    run_id TEXT PRIMARY KEY,
+    metrics_row_count INTEGER,
+    totals JSONB,
+    rates JSONB,
+    llm_health JSONB,
+    review_counts JSONB,
+    review_counts_by_entity JSONB,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
 CREATE TABLE IF NOT EXISTS quality_gate_results (
     run_id TEXT PRIMARY KEY,
     status TEXT,
@@ -0,0 +1,267 @@
+"""Binary ``(source_system, entity_type, source_id) -> ues_id`` lookup snapshot.
+
+The pipeline publishes one snapshot per run; API workers memory-map it and
+answer lookups by binary search, so concurrent workers share the pages via
+the OS page cache instead of querying ``source_lineage``.
+
+File layout (little endian, sections 8-byte aligned)::
+
+    header | run_id | key offsets (u64 * n+1) | key bytes
+           | value offsets (u64 * n+1) | value bytes
+
+Keys are ``source_system \\x1f entity_type \\x1f source_id`` in UTF-8, sorted
+bytewise; values are the UES ids in the same order.
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+MAGIC = b"ERELIN01"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIIQQQQQ")
+SEPARATOR = "\x1f"
+DEFAULT_SNAPSHOT_PATH = "snapshots/lineage.snap"
+
+LineageEntry = Tuple[str, str, str, str]
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_path() -> Path:
+    return Path(os.getenv("LINEAGE_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH))
+
+
+def encode_key(source_system: str, entity_type: str, source_id: str) -> bytes:
+    return SEPARATOR.join((source_system, entity_type, str(source_id))).encode()
+
+
+def _align(position: int) -> int:
+    return (position + 7) & ~7
+
+
+def _pack_blob(items: Sequence[bytes]) -> Tuple[bytes, bytes]:
+    offsets = [0]
+    for item in items:
+        offsets.append(offsets[-1] + len(item))
+    return struct.pack(f"<{len(offsets)}Q", *offsets), b"".join(items)
+
+
+def write_lineage_snapshot(
+    entries: Iterable[LineageEntry], path: Path, run_id: str
+) -> int:
+    """Write a snapshot atomically (temp file + rename); returns the key count."""
+    pairs: Dict[bytes, bytes] = {}
+    for source_system, entity_type, source_id, ues_id in entries:
+        pairs.setdefault(
+            encode_key(source_system, entity_type, source_id), str(ues_id).encode()
+        )
+    keys = sorted(pairs)
+    key_offsets, key_blob = _pack_blob(keys)
+    value_offsets, value_blob = _pack_blob([pairs[key] for key in keys])
+    run_id_bytes = run_id.encode()
+
+    sections: List[bytes] = [run_id_bytes, key_offsets, key_blob, value_offsets]
+    positions = []
+    position = HEADER.size
+    for section in sections:
+        positions.append(position)
+        position = _align(position + len(section))
+    positions.append(position)
+
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(run_id_bytes), len(keys), *positions[1:]
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "wb") as handle:
+            handle.write(header)
+            for section, start in zip(sections + [value_blob], positions):
+                handle.seek(start)
+                handle.write(section)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return len(keys)
+
+
+def publish_lineage_snapshot(
+    engine: Engine, run_id: str, path: Optional[Path] = None
+) -> int:
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                """
+                SELECT source_system, ues_entity_type, source_id, ues_entity_id
+                FROM source_lineage
+                """
+            )
+        )
+        entries = [(str(a), str(b), str(c), str(d)) for a, b, c, d in rows]
+    return write_lineage_snapshot(entries, path or snapshot_path(), run_id)
+
+
+class LineageSnapshot:
+    """A memory-mapped snapshot file; raises ``ValueError`` if it is malformed."""
+
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        try:
+            self._load(path)
+        except (ValueError, struct.error) as exc:
+            self.close()
+            raise ValueError(f"{path} is not a valid lineage snapshot") from exc
+
+    def _load(self, path: Path) -> None:
+        (
+            magic,
+            version,
+            run_id_len,
+            self.count,
+            key_offsets_pos,
+            key_blob_pos,
+            value_offsets_pos,
+            value_blob_pos,
+        ) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a lineage snapshot")
+        span = (self.count + 1) * 8
+        size = len(self._mmap)
+        if not (
+            HEADER.size + run_id_len <= key_offsets_pos
+            and key_offsets_pos + span <= key_blob_pos <= value_offsets_pos
+            and value_offsets_pos + span <= value_blob_pos <= size
+        ):
+            raise ValueError(f"{path} is truncated")
+        view = self._view
+        self.run_id = bytes(view[HEADER.size : HEADER.size + run_id_len]).decode()
+        self._key_offsets: memoryview = view[
+            key_offsets_pos : key_offsets_pos + span
+        ].cast("Q")
+        self._value_offsets: memoryview = view[
+            value_offsets_pos : value_offsets_pos + span
+        ].cast("Q")
+        if (
+            key_blob_pos + self._key_offsets[-1] > value_offsets_pos
+            or value_blob_pos + self._value_offsets[-1] > size
+        ):
+            raise ValueError(f"{path} is truncated")
+        self._key_blob_pos = key_blob_pos
+        self._value_blob_pos = value_blob_pos
+
+    def close(self) -> None:
+        """Release the mapping; lookups on a closed snapshot raise ``ValueError``."""
+        for name in ("_key_offsets", "_value_offsets", "_view"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _key(self, index: int) -> bytes:
+        start = self._key_blob_pos + self._key_offsets[index]
+        end = self._key_blob_pos + self._key_offsets[index + 1]
+        return self._mmap[start:end]
+
+    def _value(self, index: int) -> str:
+        start = self._value_blob_pos + self._value_offsets[index]
+        end = self._value_blob_pos + self._value_offsets[index + 1]
+        return self._mmap[start:end].decode()
+
+    def lookup(
+        self, source_system: str, entity_type: str, source_id: str
+    ) -> Optional[str]:
+        target = encode_key(source_system, entity_type, source_id)
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._key(mid) < target:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.count and self._key(low) == target:
+            return self._value(low)
+        return None
+
+    def lookup_many(
+        self, source_system: str, entity_type: str, source_ids: Iterable[str]
+    ) -> Dict[str, str]:
+        found = {}
+        for source_id in source_ids:
+            ues_id = self.lookup(source_system, entity_type, source_id)
+            if ues_id is not None:
+                found[str(source_id)] = ues_id
+        return found
+
+
+class LineageSnapshotStore:
+    """Hands out the current snapshot, swapping in a newly published file.
+
+    The file is re-checked at most every ``check_interval_s``; a changed
+    inode/mtime/size opens the new file, replaces the reference and closes
+    the old mapping, so use a snapshot straight after :meth:`current` rather
+    than holding on to it. A file that fails to load is logged once and
+    treated as missing until it changes, so lookups fall back to SQL.
+    """
+
+    def __init__(self, path: Path, check_interval_s: float = 1.0) -> None:
+        self.path = path
+        self.check_interval_s = check_interval_s
+        self._snapshot: Optional[LineageSnapshot] = None
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[LineageSnapshot]:
+        now = time.monotonic()
+        if (
+            self._checked_at is not None
+            and now - self._checked_at < self.check_interval_s
+        ):
+            return self._snapshot
+        with self._lock:
+            self._checked_at = now
+            try:
+                stat = self.path.stat()
+            except FileNotFoundError:
+                self._replace(None, None)
+                return None
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if signature != self._signature:
+                snapshot: Optional[LineageSnapshot]
+                try:
+                    snapshot = LineageSnapshot(self.path)
+                except (OSError, ValueError):
+                    logger.exception("Ignoring unreadable lineage snapshot")
+                    snapshot = None
+                self._replace(snapshot, signature)
+            return self._snapshot
+
+    def _replace(
+        self,
+        snapshot: Optional[LineageSnapshot],
+        signature: Optional[Tuple[int, int, int]],
+    ) -> None:
+        previous, self._snapshot = self._snapshot, snapshot
+        self._signature = signature
+        if previous is not None and previous is not snapshot:
+            previous.close()
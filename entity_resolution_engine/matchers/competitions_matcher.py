@@ -11,6 +11,7 @@ from entity_resolution_engine.normalizers.nationality_normalizer import (
     normalize_country,
 )
 from entity_resolution_engine.lineage.lineage_builder import build_lineage
+from entity_resolution_engine.monitoring.stage_telemetry import count
 from entity_resolution_engine.ues_writer.writer import generate_ues_id
 
 CONFIG_PATH = (
@@ -26,28 +27,37 @@ COMP_THRESHOLD = THRESHOLDS.get("COMP_SIM_THRESHOLD", 0.75)
 
 def match_competitions(alpha_comp: pd.DataFrame, beta_comp: pd.DataFrame) -> List[Dict]:
     results: List[Dict] = []
+    scored = 0
     for _, alpha_row in alpha_comp.iterrows():
         norm_alpha = normalize_competition(alpha_row["name"])
         best = None
         best_score = 0.0
+        runner_up_score = 0.0
         for _, beta_row in beta_comp.iterrows():
             norm_beta = normalize_competition(beta_row["title"])
             score = token_sort_ratio(norm_alpha, norm_beta)
+            scored += 1
             if score > best_score:
+                runner_up_score = best_score
                 best_score = score
                 best = beta_row
+            elif score > runner_up_score:
+                runner_up_score = score
         if best is not None and best_score >= COMP_THRESHOLD:
             results.append(
                 {
                     "alpha_competition_id": alpha_row["competition_id"],
                     "beta_competition_id": best["id"],
                     "confidence": best_score,
+                    "runner_up_confidence": runner_up_score,
                     "name": alpha_row["name"],
                     "country": normalize_country(
                         alpha_row.get("country") or best.get("locale")
                     ),
                 }
             )
+    count("candidate_pairs", scored)
+    count("pruned_pairs", 0)
     return results
 
 
@@ -3,6 +3,8 @@ from typing import Dict, List
 import pandas as pd
 import yaml
 
+from entity_resolution_engine.monitoring.stage_telemetry import count
+
 CONFIG_PATH = (
     __import__("pathlib").Path(__file__).resolve().parents[1]
     / "config"
@@ -31,20 +33,25 @@ def match_matches(
     season_map: Dict[int, int],
 ) -> List[Dict]:
     matches: List[Dict] = []
+    scored = pruned = 0
     for _, alpha_row in alpha_matches.iterrows():
         best_score = 0.0
+        runner_up_score = 0.0
         best_match = None
         for _, beta_row in beta_matches.iterrows():
             comp_match = competition_map.get(alpha_row["competition_id"])
             if comp_match != beta_row["competition_id"]:
+                pruned += 1
                 continue
             season_match = season_map.get(alpha_row["season_id"])
             if season_match != beta_row["season_id"]:
+                pruned += 1
                 continue
             home_team_match = alpha_team_map.get(alpha_row["home_team_id"])
             away_team_match = alpha_team_map.get(alpha_row["away_team_id"])
 
             if home_team_match is None or away_team_match is None:
+                pruned += 1
                 continue
 
             teams_align = (
@@ -53,6 +60,7 @@ def match_matches(
             )
 
             if not teams_align:
+                pruned += 1
                 continue
 
             team_score = 1.0
@@ -60,9 +68,13 @@ def match_matches(
                 alpha_row.get("match_date"), beta_row.get("match_date")
             )
             confidence = 0.4 * team_score + 0.3 * date_score + 0.3
+            scored += 1
             if confidence > best_score:
+                runner_up_score = best_score
                 best_score = confidence
                 best_match = beta_row
+            elif confidence > runner_up_score:
+                runner_up_score = confidence
         if best_match is not None and best_score >= THRESHOLDS.get(
             "CONFIDENCE_REVIEW", 0.6
         ):
@@ -71,6 +83,9 @@ def match_matches(
                     "alpha_match_id": alpha_row["match_id"],
                     "beta_match_id": best_match["id"],
                     "confidence": best_score,
+                    "runner_up_confidence": runner_up_score,
                 }
             )
+    count("candidate_pairs", scored)
+    count("pruned_pairs", pruned)
     return matches
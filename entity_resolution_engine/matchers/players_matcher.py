@@ -3,6 +3,7 @@ from typing import Dict, List
 import pandas as pd
 import yaml
 
+from entity_resolution_engine.monitoring.stage_telemetry import count
 from entity_resolution_engine.normalizers.name_normalizer import (
     normalize_name,
     token_sort_ratio,
@@ -44,9 +45,11 @@ def match_players(
         for _, row in beta_teams.iterrows()
     }
     matches: List[Dict] = []
+    scored = 0
     for _, alpha_row in alpha_players.iterrows():
         norm_alpha_name = normalize_name(alpha_row["name"])
         best_score = 0.0
+        runner_up_score = 0.0
         best_match = None
         for _, beta_row in beta_players.iterrows():
             norm_beta_name = normalize_name(beta_row["full_name"])
@@ -67,7 +70,9 @@ def match_players(
                 + WEIGHTS["dob"] * dob_score
                 + WEIGHTS["team"] * team_score
             )
+            scored += 1
             if confidence > best_score:
+                runner_up_score = best_score
                 best_score = confidence
                 best_match = beta_row
                 best_breakdown = {
@@ -75,6 +80,8 @@ def match_players(
                     "dob_similarity": dob_score,
                     "team_similarity": team_score,
                 }
+            elif confidence > runner_up_score:
+                runner_up_score = confidence
         if best_match is not None and best_score >= THRESHOLDS.get(
             "CONFIDENCE_AUTOPASS", 0.85
         ):
@@ -83,7 +90,11 @@ def match_players(
                     "alpha_player_id": alpha_row["player_id"],
                     "beta_player_id": best_match["id"],
                     "confidence": best_score,
+                    "runner_up_confidence": runner_up_score,
                     "breakdown": best_breakdown,
                 }
             )
+    count("candidate_pairs", scored)
+    # Every pair is scored; there is no blocking to prune with yet.
+    count("pruned_pairs", 0)
     return matches
@@ -0,0 +1,356 @@
+"""Frozen brute-force matchers, kept as reference oracles.
+
+These are the matcher loops as they stood before any fast path: every alpha
+row is scored against every beta row, ties keep the earliest beta row and the
+runner-up is the second-best score seen. ``qa/equivalence.py`` fuzzes each
+production matcher against them. Do not optimise this module; when matching
+behaviour changes on purpose, change it here too.
+
+The thresholds, aliases, weights and normalizers below are snapshots of
+``config/*.yml`` and ``normalizers/`` rather than imports, so an edit there
+shows up as a divergence instead of moving the oracle along with it.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from rapidfuzz import fuzz
+
+TEAM_THRESHOLD = 0.7
+COMP_THRESHOLD = 0.75
+DOB_PARTIAL_SCORE = 0.6
+CONFIDENCE_AUTOPASS = 0.85
+CONFIDENCE_REVIEW = 0.60
+ALIASES = {
+    "man city": "manchester city",
+    "city fc": "city football club",
+}
+WEIGHTS = {
+    "name": 0.6,
+    "dob": 0.3,
+    "team": 0.1,
+}
+SPONSORS = ["presented by", "powered by", "sponsored by"]
+COUNTRY_MAP = {
+    "brazil": "Brazil",
+    "brasil": "Brazil",
+    "br": "Brazil",
+    "bra": "Brazil",
+    "england": "England",
+    "en": "England",
+    "usa": "USA",
+    "united states": "USA",
+    "germany": "Germany",
+}
+
+PUNCT_PATTERN = re.compile(r"[^\w\s]")
+ALIAS_PATTERNS = [
+    (re.compile(r"\bfc\b"), "football club"),
+]
+SEASON_REGEXES = [
+    re.compile(r"(?P<start>\d{2,4})\s*[-/]\s*(?P<end>\d{2,4})"),
+    re.compile(r"(?P<year>\d{4})"),
+]
+
+
+def normalize_name(name: Optional[str]) -> str:
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = text.lower().strip()
+    text = PUNCT_PATTERN.sub(" ", text)
+    text = re.sub(r"\s+", " ", text)
+    for pattern, replacement in ALIAS_PATTERNS:
+        if pattern.search(text):
+            text = pattern.sub(replacement, text)
+    text = re.sub(r"\s+", " ", text)
+    return text
+
+
+def token_sort_ratio(a: str, b: str) -> float:
+    if not a or not b:
+        return 0.0
+    return fuzz.token_sort_ratio(a, b) / 100.0
+
+
+def normalize_competition(name: str) -> str:
+    if not name:
+        return ""
+    lowered = name.lower()
+    for sponsor in SPONSORS:
+        lowered = lowered.replace(sponsor, "")
+    lowered = re.sub(r"\s+", " ", lowered).strip()
+    return lowered
+
+
+def normalize_country(value: str) -> str:
+    if not value:
+        return ""
+    return COUNTRY_MAP.get(value.lower(), value)
+
+
+def _expand_year(fragment: str, reference_start: Optional[int] = None) -> int:
+    if len(fragment) == 4:
+        return int(fragment)
+    value = int(fragment)
+    if reference_start is not None:
+        return int(f"{str(reference_start)[:2]}{fragment}")
+    return 2000 + value if value <= 30 else 1900 + value
+
+
+def normalize_season(season_name: str) -> Tuple[Optional[int], Optional[int]]:
+    if not season_name:
+        return None, None
+    for regex in SEASON_REGEXES:
+        match = regex.search(season_name)
+        if match:
+            if "year" in match.groupdict():
+                year = int(match.group("year"))
+                return year, year + 1
+            start = _expand_year(match.group("start"))
+            end = _expand_year(match.group("end"), reference_start=start)
+            if end < start:
+                end = start + 1
+            return start, end
+    return None, None
+
+
+def _apply_alias(name: str) -> str:
+    return ALIASES.get(name.lower(), name)
+
+
+def match_teams(alpha_teams: pd.DataFrame, beta_teams: pd.DataFrame) -> List[Dict]:
+    matches: List[Dict] = []
+    for _, alpha_row in alpha_teams.iterrows():
+        alpha_name = _apply_alias(alpha_row["name"])
+        norm_alpha = normalize_name(alpha_name)
+        best = None
+        best_score = 0.0
+        runner_up_score = 0.0
+        for _, beta_row in beta_teams.iterrows():
+            beta_name = _apply_alias(beta_row["display_name"])
+            norm_beta = normalize_name(beta_name)
+            score = token_sort_ratio(norm_alpha, norm_beta)
+            if score > best_score:
+                runner_up_score = best_score
+                best_score = score
+                best = beta_row
+            elif score > runner_up_score:
+                runner_up_score = score
+        if best is not None and best_score >= TEAM_THRESHOLD:
+            matches.append(
+                {
+                    "alpha_team_id": alpha_row["team_id"],
+                    "beta_team_id": best["id"],
+                    "confidence": best_score,
+                    "runner_up_confidence": runner_up_score,
+                    "name": alpha_row["name"],
+                    "country": alpha_row.get("country") or best.get("region"),
+                }
+            )
+    return matches
+
+
+def match_competitions(alpha_comp: pd.DataFrame, beta_comp: pd.DataFrame) -> List[Dict]:
+    results: List[Dict] = []
+    for _, alpha_row in alpha_comp.iterrows():
+        norm_alpha = normalize_competition(alpha_row["name"])
+        best = None
+        best_score = 0.0
+        runner_up_score = 0.0
+        for _, beta_row in beta_comp.iterrows():
+            norm_beta = normalize_competition(beta_row["title"])
+            score = token_sort_ratio(norm_alpha, norm_beta)
+            if score > best_score:
+                runner_up_score = best_score
+                best_score = score
+                best = beta_row
+            elif score > runner_up_score:
+                runner_up_score = score
+        if best is not None and best_score >= COMP_THRESHOLD:
+            results.append(
+                {
+                    "alpha_competition_id": alpha_row["competition_id"],
+                    "beta_competition_id": best["id"],
+                    "confidence": best_score,
+                    "runner_up_confidence": runner_up_score,
+                    "name": alpha_row["name"],
+                    "country": normalize_country(
+                        alpha_row.get("country") or best.get("locale")
+                    ),
+                }
+            )
+    return results
+
+
+def match_seasons(
+    alpha_seasons: pd.DataFrame,
+    beta_seasons: pd.DataFrame,
+    competition_map: Dict[int, int],
+) -> List[Dict]:
+    results: List[Dict] = []
+    for _, alpha_row in alpha_seasons.iterrows():
+        alpha_start, alpha_end = normalize_season(alpha_row["name"])
+        for _, beta_row in beta_seasons.iterrows():
+            comp_match = competition_map.get(alpha_row["competition_id"])
+            if comp_match != beta_row["competition_id"]:
+                continue
+            beta_start, beta_end = normalize_season(beta_row["label"])
+            if alpha_start and beta_start and abs(alpha_start - beta_start) <= 0:
+                confidence = 1.0
+            elif alpha_start and beta_start and abs(alpha_start - beta_start) == 1:
+                confidence = 0.7
+            else:
+                confidence = 0.0
+            if confidence >= CONFIDENCE_REVIEW:
+                results.append(
+                    {
+                        "alpha_season_id": alpha_row["season_id"],
+                        "beta_season_id": beta_row["id"],
+                        "confidence": confidence,
+                        "start_year": alpha_start or beta_start,
+                        "end_year": alpha_end or beta_end,
+                        "alpha_competition_id": alpha_row["competition_id"],
+                        "beta_competition_id": beta_row["competition_id"],
+                    }
+                )
+    return results
+
+
+def _dob_similarity(alpha_dob, beta_birth_year) -> float:
+    if pd.isna(alpha_dob) or pd.isna(beta_birth_year):
+        return 0.0
+    if alpha_dob.year == int(beta_birth_year):
+        return 1.0
+    if abs(alpha_dob.year - int(beta_birth_year)) == 1:
+        return DOB_PARTIAL_SCORE
+    return 0.0
+
+
+def match_players(
+    alpha_players: pd.DataFrame,
+    beta_players: pd.DataFrame,
+    team_map: Dict[int, int],
+    beta_teams: pd.DataFrame,
+) -> List[Dict]:
+    beta_team_lookup = {
+        normalize_name(row["display_name"]): row["id"]
+        for _, row in beta_teams.iterrows()
+    }
+    matches: List[Dict] = []
+    for _, alpha_row in alpha_players.iterrows():
+        norm_alpha_name = normalize_name(alpha_row["name"])
+        best_score = 0.0
+        runner_up_score = 0.0
+        best_match = None
+        for _, beta_row in beta_players.iterrows():
+            norm_beta_name = normalize_name(beta_row["full_name"])
+            name_score = token_sort_ratio(norm_alpha_name, norm_beta_name)
+            dob_score = _dob_similarity(
+                alpha_row.get("dob"), beta_row.get("birth_year")
+            )
+            beta_team_norm = normalize_name(beta_row.get("team_name"))
+            beta_team_id = beta_team_lookup.get(beta_team_norm)
+            team_score = (
+                1.0
+                if beta_team_id
+                and team_map.get(alpha_row.get("team_id")) == beta_team_id
+                else 0.0
+            )
+            confidence = (
+                WEIGHTS["name"] * name_score
+                + WEIGHTS["dob"] * dob_score
+                + WEIGHTS["team"] * team_score
+            )
+            if confidence > best_score:
+                runner_up_score = best_score
+                best_score = confidence
+                best_match = beta_row
+                best_breakdown = {
+                    "name_similarity": name_score,
+                    "dob_similarity": dob_score,
+                    "team_similarity": team_score,
+                }
+            elif confidence > runner_up_score:
+                runner_up_score = confidence
+        if best_match is not None and best_score >= CONFIDENCE_AUTOPASS:
+            matches.append(
+                {
+                    "alpha_player_id": alpha_row["player_id"],
+                    "beta_player_id": best_match["id"],
+                    "confidence": best_score,
+                    "runner_up_confidence": runner_up_score,
+                    "breakdown": best_breakdown,
+                }
+            )
+    return matches
+
+
+def _date_similarity(alpha_date, beta_date) -> float:
+    if pd.isna(alpha_date) or pd.isna(beta_date):
+        return 0.0
+    delta = abs(alpha_date - beta_date)
+    if delta.days == 0:
+        return 1.0
+    if delta.days <= 1:
+        return 0.8
+    return 0.0
+
+
+def match_matches(
+    alpha_matches: pd.DataFrame,
+    beta_matches: pd.DataFrame,
+    alpha_team_map: Dict[int, int],
+    competition_map: Dict[int, int],
+    season_map: Dict[int, int],
+) -> List[Dict]:
+    matches: List[Dict] = []
+    for _, alpha_row in alpha_matches.iterrows():
+        best_score = 0.0
+        runner_up_score = 0.0
+        best_match = None
+        for _, beta_row in beta_matches.iterrows():
+            comp_match = competition_map.get(alpha_row["competition_id"])
+            if comp_match != beta_row["competition_id"]:
+                continue
+            season_match = season_map.get(alpha_row["season_id"])
+            if season_match != beta_row["season_id"]:
+                continue
+            home_team_match = alpha_team_map.get(alpha_row["home_team_id"])
+            away_team_match = alpha_team_map.get(alpha_row["away_team_id"])
+
+            if home_team_match is None or away_team_match is None:
+                continue
+
+            teams_align = (
+                home_team_match == beta_row["home_team_id"]
+                and away_team_match == beta_row["away_team_id"]
+            )
+
+            if not teams_align:
+                continue
+
+            team_score = 1.0
+            date_score = _date_similarity(
+                alpha_row.get("match_date"), beta_row.get("match_date")
+            )
+            confidence = 0.4 * team_score + 0.3 * date_score + 0.3
+            if confidence > best_score:
+                runner_up_score = best_score
+                best_score = confidence
+                best_match = beta_row
+            elif confidence > runner_up_score:
+                runner_up_score = confidence
+        if best_match is not None and best_score >= CONFIDENCE_REVIEW:
+            matches.append(
+                {
+                    "alpha_match_id": alpha_row["match_id"],
+                    "beta_match_id": best_match["id"],
+                    "confidence": best_score,
+                    "runner_up_confidence": runner_up_score,
+                }
+            )
+    return matches
@@ -3,6 +3,7 @@ from typing import Dict, List, Tuple
 import pandas as pd
 import yaml
 
+from entity_resolution_engine.monitoring.stage_telemetry import count
 from entity_resolution_engine.normalizers.season_normalizer import normalize_season
 from entity_resolution_engine.lineage.lineage_builder import build_lineage
 from entity_resolution_engine.ues_writer.writer import generate_ues_id
@@ -22,11 +23,13 @@ def match_seasons(
     competition_map: Dict[int, int],
 ) -> List[Dict]:
     results: List[Dict] = []
+    scored = pruned = 0
     for _, alpha_row in alpha_seasons.iterrows():
         alpha_start, alpha_end = normalize_season(alpha_row["name"])
         for _, beta_row in beta_seasons.iterrows():
             comp_match = competition_map.get(alpha_row["competition_id"])
             if comp_match != beta_row["competition_id"]:
+                pruned += 1
                 continue
             beta_start, beta_end = normalize_season(beta_row["label"])
             if alpha_start and beta_start and abs(alpha_start - beta_start) <= 0:
@@ -35,6 +38,7 @@ def match_seasons(
                 confidence = 0.7
             else:
                 confidence = 0.0
+            scored += 1
             if confidence >= THRESHOLDS.get("CONFIDENCE_REVIEW", 0.6):
                 results.append(
                     {
@@ -47,6 +51,8 @@ def match_seasons(
                         "beta_competition_id": beta_row["competition_id"],
                     }
                 )
+    count("candidate_pairs", scored)
+    count("pruned_pairs", pruned)
     return results
 
 
@@ -8,6 +8,7 @@ from entity_resolution_engine.normalizers.name_normalizer import (
     token_sort_ratio,
 )
 from entity_resolution_engine.lineage.lineage_builder import build_lineage
+from entity_resolution_engine.monitoring.stage_telemetry import count
 from entity_resolution_engine.ues_writer.writer import generate_ues_id
 
 CONFIG_PATH = (
@@ -35,28 +36,38 @@ def _apply_alias(name: str) -> str:
 
 def match_teams(alpha_teams: pd.DataFrame, beta_teams: pd.DataFrame) -> List[Dict]:
     matches: List[Dict] = []
+    scored = 0
     for _, alpha_row in alpha_teams.iterrows():
         alpha_name = _apply_alias(alpha_row["name"])
         norm_alpha = normalize_name(alpha_name)
         best = None
         best_score = 0.0
+        runner_up_score = 0.0
         for _, beta_row in beta_teams.iterrows():
             beta_name = _apply_alias(beta_row["display_name"])
             norm_beta = normalize_name(beta_name)
             score = token_sort_ratio(norm_alpha, norm_beta)
+            scored += 1
             if score > best_score:
+                runner_up_score = best_score
                 best_score = score
                 best = beta_row
+            elif score > runner_up_score:
+                runner_up_score = score
         if best is not None and best_score >= TEAM_THRESHOLD:
             matches.append(
                 {
                     "alpha_team_id": alpha_row["team_id"],
                     "beta_team_id": best["id"],
                     "confidence": best_score,
+                    "runner_up_confidence": runner_up_score,
                     "name": alpha_row["name"],
                     "country": alpha_row.get("country") or best.get("region"),
                 }
             )
+    count("candidate_pairs", scored)
+    # Every pair is scored; there is no blocking to prune with yet.
+    count("pruned_pairs", 0)
     return matches
 
 
@@ -1,130 +1,301 @@
+"""Rate-drift anomaly detection against incrementally maintained baselines.
+
+``metric_baselines`` keeps Welford running statistics (count, mean, M2) per
+``(entity_type, metric_name)``. Each run reads its current rates and the
+baselines, z-scores them, and folds the run into the baselines exactly once,
+so detection never rescans ``pipeline_run_metrics`` history. The table is not
+touched by ``UESWriter.reset()``.
+
+Besides the routing rates, the stage telemetry values (wall/CPU time, peak
+RSS, work counters) are watched as-is, so performance regressions surface as
+anomalies too. Only increases are flagged for those, since a faster or
+smaller stage is not a problem, and they are kept out of the quality gate's
+high-severity check (see ``QUALITY_METRICS``). Rows without telemetry are
+skipped for those metrics.
+"""
+
 from __future__ import annotations
 
-from statistics import mean, stdev
-from typing import Any, Dict, List, Mapping, Optional
+import warnings
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import text
-from sqlalchemy.engine import Engine
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection, Engine
 
+METRIC_COLUMNS = [
+    "total_candidates",
+    "auto_match_count",
+    "auto_reject_count",
+    "gray_zone_sent_count",
+    "llm_review_count",
+]
+RATE_NUMERATORS = {
+    "llm_review_rate": "llm_review_count",
+    "auto_match_rate": "auto_match_count",
+    "auto_reject_rate": "auto_reject_count",
+}
+PERFORMANCE_METRICS = [
+    "stage_wall_seconds",
+    "stage_cpu_seconds",
+    "peak_rss_mb",
+    "candidate_pairs",
+    "pruned_pairs",
+    "normalizer_calls",
+    "rows_written",
+]
+# Routing-rate metrics; the only ones the high-severity quality gate counts.
+QUALITY_METRICS = ["gray_zone_rate", *RATE_NUMERATORS]
+METRIC_NAMES = [*QUALITY_METRICS, *PERFORMANCE_METRICS]
+BASELINE_COLUMNS = ["sample_count", "mean", "m2", "last_run_id"]
 
-def _z_score(current: float, baseline: List[float]) -> Optional[float]:
-    if len(baseline) < 2:
-        return None
-    baseline_std = stdev(baseline)
-    if baseline_std == 0:
-        return None
-    return (current - mean(baseline)) / baseline_std
+_UPSERT_BASELINE_SQL = """
+    INSERT INTO metric_baselines
+    (entity_type, metric_name, sample_count, mean, m2, last_run_id,
+     last_finished_at, updated_at)
+    VALUES (:entity_type, :metric_name, :sample_count, :mean, :m2, :last_run_id,
+            :last_finished_at, CURRENT_TIMESTAMP)
+    ON CONFLICT (entity_type, metric_name) DO UPDATE SET
+        sample_count = excluded.sample_count,
+        mean = excluded.mean,
+        m2 = excluded.m2,
+        last_run_id = excluded.last_run_id,
+        last_finished_at = excluded.last_finished_at,
+        updated_at = excluded.updated_at
+"""
 
+_RUN_FINISHED_AT_SQL = """
+    SELECT MAX(finished_at) FROM pipeline_run_metrics WHERE run_id = :run_id
+"""
+
+# True when the baselines already hold a run that finished after ``run_id``.
+# Compared on metric_baselines itself: reset() clears pipeline_run_metrics.
+_NEWER_RUN_FOLDED_SQL = """
+    SELECT 1
+    FROM metric_baselines
+    WHERE last_run_id <> :run_id
+      AND last_finished_at > :finished_at
+    LIMIT 1
+"""
 
-def detect_anomalies(
-    engine: Engine,
-    run_id: str,
-    entity_type: str,
-    lookback: int = 8,
-    z_threshold: float = 2.0,
-) -> List[Dict[str, float | str]]:
-    with engine.connect() as conn:
-        current = (
-            conn.execute(
-                text(
-                    """
-                SELECT * FROM pipeline_run_metrics
-                WHERE run_id = :run_id AND entity_type = :entity_type
-                LIMIT 1
-                """
-                ),
-                {"run_id": run_id, "entity_type": entity_type},
-            )
-            .mappings()
-            .first()
-        )
-        if not current:
-            return []
-        current_row: Dict[str, Any] = dict(current)
-        baseline_rows = (
-            conn.execute(
-                text(
-                    """
-                SELECT * FROM pipeline_run_metrics
-                WHERE entity_type = :entity_type AND run_id != :run_id
-                ORDER BY finished_at DESC NULLS LAST
-                LIMIT :limit
-                """
-                ),
-                {"entity_type": entity_type, "run_id": run_id, "limit": lookback},
-            )
-            .mappings()
-            .all()
-        )
 
-    baseline_data: List[Dict[str, Any]] = [dict(row) for row in baseline_rows]
-
-    if len(baseline_data) < 2:
-        return []
-
-    def _rate(row: Mapping[str, Any], numerator: str) -> float:
-        total = row.get("total_candidates") or 0
-        if total <= 0:
-            return 0.0
-        return float(row.get(numerator) or 0) / float(total)
-
-    metrics = {
-        "gray_zone_rate": (
-            float(current_row.get("gray_zone_sent_count") or 0)
-            / max(float(current_row.get("total_candidates") or 1), 1.0)
-        ),
-        "llm_review_rate": _rate(current_row, "llm_review_count"),
-        "auto_match_rate": _rate(current_row, "auto_match_count"),
-        "auto_reject_rate": _rate(current_row, "auto_reject_count"),
-    }
-
-    baseline_metrics: Dict[str, List[float]] = {}
-    for key in metrics:
-        values: List[float] = []
-        for row in baseline_data:
-            if key == "gray_zone_rate":
-                values.append(
-                    float(row.get("gray_zone_sent_count") or 0)
-                    / max(float(row.get("total_candidates") or 1), 1.0)
-                )
-            elif key == "llm_review_rate":
-                values.append(_rate(row, "llm_review_count"))
-            elif key == "auto_match_rate":
-                values.append(_rate(row, "auto_match_count"))
-            elif key == "auto_reject_rate":
-                values.append(_rate(row, "auto_reject_count"))
-        baseline_metrics[key] = values
+def _metric_rates(frame: pd.DataFrame) -> pd.DataFrame:
+    totals = frame["total_candidates"]
+    rates = pd.DataFrame(index=frame.index)
+    gray_zone_denominator = totals.fillna(1).clip(lower=1.0)
+    rates["gray_zone_rate"] = frame["gray_zone_sent_count"].fillna(0) / (
+        gray_zone_denominator
+    )
+    for metric, numerator in RATE_NUMERATORS.items():
+        values = frame[numerator].fillna(0) / totals
+        rates[metric] = values.where(totals.fillna(0) > 0, 0.0)
+    return rates
+
+
+def _select(
+    conn: Connection,
+    sql: str,
+    params: Dict[str, Any],
+    entity_types: Optional[Sequence[str]],
+) -> List[Dict[str, Any]]:
+    if entity_types is not None:
+        sql += " AND entity_type IN :entity_types"
+        params = {**params, "entity_types": list(entity_types)}
+    query = text(sql)
+    if entity_types is not None:
+        query = query.bindparams(bindparam("entity_types", expanding=True))
+    return [dict(row) for row in conn.execute(query, params).mappings()]
+
+
+def _load_current_rates(
+    conn: Connection, run_id: str, entity_types: Optional[Sequence[str]]
+) -> pd.DataFrame:
+    columns = [*METRIC_COLUMNS, *PERFORMANCE_METRICS]
+    rows = _select(
+        conn,
+        f"SELECT entity_type, {', '.join(columns)} FROM pipeline_run_metrics "
+        "WHERE run_id = :run_id",
+        {"run_id": run_id},
+        entity_types,
+    )
+    frame = pd.DataFrame(rows, columns=["entity_type", *columns])
+    frame = frame.drop_duplicates("entity_type").set_index("entity_type")
+    frame = frame.apply(pd.to_numeric).astype(float)
+    values = _metric_rates(frame).join(frame[PERFORMANCE_METRICS])
+    current = values.stack().dropna()
+    current.index.names = ["entity_type", "metric_name"]
+    return current.rename("current_value").to_frame()
+
+
+def _load_baselines(
+    conn: Connection, entity_types: Optional[Sequence[str]]
+) -> pd.DataFrame:
+    rows = _select(
+        conn,
+        "SELECT entity_type, metric_name, sample_count, mean, m2, last_run_id "
+        "FROM metric_baselines WHERE 1 = 1",
+        {},
+        entity_types,
+    )
+    frame = pd.DataFrame(
+        rows, columns=["entity_type", "metric_name", *BASELINE_COLUMNS]
+    )
+    return frame.set_index(["entity_type", "metric_name"])
+
+
+def prior_statistics(frame: pd.DataFrame, run_id: str) -> pd.DataFrame:
+    """Baseline count/mean/M2 excluding ``run_id``.
+
+    A run that was already folded in (re-detection, e.g. from the triage
+    endpoint) is taken out again with the inverse Welford update.
+    """
+    count = frame["sample_count"].fillna(0).astype(float)
+    mean = frame["mean"].astype(float).fillna(0.0)
+    m2 = frame["m2"].astype(float).fillna(0.0)
+    x = frame["current_value"]
+    included = (frame["last_run_id"] == run_id) & (count > 0)
+    prior_count = count - included.astype(float)
+    safe_count = prior_count.where(prior_count > 0, 1.0)
+    removed_mean = ((count * mean - x) / safe_count).where(prior_count > 0, 0.0)
+    removed_m2 = (m2 - (x - removed_mean) * (x - mean)).where(prior_count > 0, 0.0)
+    return pd.DataFrame(
+        {
+            "prior_count": prior_count,
+            "prior_mean": mean.where(~included, removed_mean),
+            "prior_m2": m2.where(~included, removed_m2),
+        },
+        index=frame.index,
+    )
+
+
+def compute_anomalies(
+    frame: pd.DataFrame, run_id: str, z_threshold: float = 2.0
+) -> List[Dict[str, float | str]]:
+    """Z-score ``current_value`` against the ``prior_*`` baseline columns.
 
+    Routing rates are flagged in both directions, performance metrics only
+    when they grow.
+    """
+    # A baseline needs at least two runs for a sample standard deviation.
+    eligible = frame[frame["prior_count"] >= 2]
+    variance = eligible["prior_m2"].clip(lower=0.0) / (eligible["prior_count"] - 1)
+    std = np.sqrt(variance)
+    z_scores = (eligible["current_value"] - eligible["prior_mean"]) / std.where(std > 0)
+    performance = eligible.index.get_level_values("metric_name").isin(
+        PERFORMANCE_METRICS
+    )
+    deviation = z_scores.where(performance, z_scores.abs())
+    flagged = eligible.assign(z_score=z_scores)
+    flagged = flagged[(deviation >= z_threshold).to_numpy()]
     anomalies: List[Dict[str, float | str]] = []
-    for metric_name, current_value in metrics.items():
-        z = _z_score(current_value, baseline_metrics[metric_name])
-        if z is None or abs(z) < z_threshold:
-            continue
-        severity = "HIGH" if abs(z) >= 3.0 else "MEDIUM"
+    for (entity_type, metric_name), row in flagged.iterrows():
+        z = float(row["z_score"])
         anomalies.append(
             {
                 "run_id": run_id,
-                "entity_type": entity_type,
-                "metric_name": metric_name,
-                "current_value": current_value,
-                "baseline_value": mean(baseline_metrics[metric_name]),
+                "entity_type": str(entity_type),
+                "metric_name": str(metric_name),
+                "current_value": float(row["current_value"]),
+                "baseline_value": float(row["prior_mean"]),
                 "z_score": z,
-                "severity": severity,
+                "severity": "HIGH" if abs(z) >= 3.0 else "MEDIUM",
             }
         )
+    return anomalies
+
+
+def updated_baselines(
+    frame: pd.DataFrame, run_id: str, finished_at: Any = None
+) -> List[Dict[str, Any]]:
+    """Fold ``current_value`` into the prior statistics (Welford update)."""
+    count = frame["prior_count"] + 1
+    delta = frame["current_value"] - frame["prior_mean"]
+    mean = frame["prior_mean"] + delta / count
+    m2 = frame["prior_m2"] + delta * (frame["current_value"] - mean)
+    keys: List[Tuple[str, str]] = list(frame.index)
+    return [
+        {
+            "entity_type": entity_type,
+            "metric_name": metric_name,
+            "sample_count": int(count[(entity_type, metric_name)]),
+            "mean": float(mean[(entity_type, metric_name)]),
+            "m2": float(m2[(entity_type, metric_name)]),
+            "last_run_id": run_id,
+            "last_finished_at": finished_at,
+        }
+        for entity_type, metric_name in keys
+    ]
 
+
+def write_anomaly_events(
+    conn: Connection, anomalies: List[Dict[str, float | str]]
+) -> None:
     if anomalies:
-        with engine.begin() as conn:
-            for anomaly in anomalies:
-                conn.execute(
-                    text(
-                        """
-                        INSERT INTO anomaly_events
-                        (run_id, entity_type, metric_name, current_value, baseline_value, z_score, severity)
-                        VALUES (:run_id, :entity_type, :metric_name, :current_value, :baseline_value, :z_score, :severity)
-                        """
-                    ),
-                    anomaly,
-                )
+        pd.DataFrame(anomalies).to_sql(
+            "anomaly_events", conn, if_exists="append", index=False, method="multi"
+        )
+
+
+def _warn_lookback(lookback: Optional[int]) -> None:
+    if lookback is not None:
+        warnings.warn(
+            "lookback is ignored: baselines are maintained incrementally",
+            DeprecationWarning,
+            stacklevel=3,
+        )
+
+
+def detect_all_anomalies(
+    engine: Engine,
+    run_id: str,
+    entity_types: Optional[Sequence[str]] = None,
+    lookback: Optional[int] = None,
+    z_threshold: float = 2.0,
+) -> List[Dict[str, float | str]]:
+    """Detect and record anomalies for every entity type of ``run_id`` at once.
 
+    Reads the run's metrics and the matching baselines, computes the z-scores
+    in one vectorized pass, writes all events with one multi-row insert and
+    upserts the updated baselines, all in one transaction. Re-detecting a run
+    older than the last one folded in (e.g. triage of a past run) leaves the
+    baselines alone. ``lookback`` is deprecated and ignored.
+    """
+    _warn_lookback(lookback)
+    with engine.begin() as conn:
+        current = _load_current_rates(conn, run_id, entity_types)
+        if current.empty:
+            return []
+        frame = current.join(_load_baselines(conn, entity_types), how="left")
+        frame = frame.join(prior_statistics(frame, run_id))
+        anomalies = compute_anomalies(frame, run_id, z_threshold)
+        write_anomaly_events(conn, anomalies)
+        finished_at = conn.execute(
+            text(_RUN_FINISHED_AT_SQL), {"run_id": run_id}
+        ).scalar()
+        if (
+            finished_at is not None
+            and conn.execute(
+                text(_NEWER_RUN_FOLDED_SQL),
+                {"run_id": run_id, "finished_at": finished_at},
+            ).first()
+        ):
+            return anomalies
+        conn.execute(
+            text(_UPSERT_BASELINE_SQL),
+            updated_baselines(frame, run_id, finished_at),
+        )
     return anomalies
+
+
+def detect_anomalies(
+    engine: Engine,
+    run_id: str,
+    entity_type: str,
+    lookback: Optional[int] = None,
+    z_threshold: float = 2.0,
+) -> List[Dict[str, float | str]]:
+    _warn_lookback(lookback)
+    return detect_all_anomalies(
+        engine, run_id, entity_types=[entity_type], z_threshold=z_threshold
+    )
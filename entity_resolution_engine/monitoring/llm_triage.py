@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 from typing import Any, Dict, List, Optional
@@ -49,22 +50,111 @@ def _fallback_report(anomalies: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
 
-def generate_triage_report(
+def anomaly_signature(entity_type: str, anomalies: List[Dict[str, Any]]) -> str:
+    """Stable key for an anomaly pattern: which metrics drifted, how and how badly."""
+    pattern = sorted(
+        {
+            (
+                str(item["metric_name"]),
+                str(item["severity"]),
+                "up" if float(item["z_score"]) > 0 else "down",
+            )
+            for item in anomalies
+        }
+    )
+    encoded = json.dumps([entity_type, pattern]).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _stamp_report(
+    report: Dict[str, Any], run_id: str, anomalies: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Attach this run's id and anomaly values to a (possibly reused) report.
+
+    A cached report was written for an earlier run with the same signature,
+    so its run id in ``queries_to_run`` is swapped for this one and the
+    current values and z-scores travel with it.
+    """
+    stamped = dict(report)
+    source_run_id = report.get("run_id")
+    if source_run_id and source_run_id != run_id:
+        stamped["queries_to_run"] = [
+            query.replace(str(source_run_id), run_id)
+            for query in report.get("queries_to_run", [])
+        ]
+    stamped["run_id"] = run_id
+    stamped["anomalies"] = [
+        {
+            "metric_name": item.get("metric_name"),
+            "severity": item.get("severity"),
+            **{
+                field: None if item.get(field) is None else float(item[field])
+                for field in ("current_value", "baseline_value", "z_score")
+            },
+        }
+        for item in anomalies
+    ]
+    return stamped
+
+
+def _cached_report(engine: Engine, signature: str) -> Optional[Dict[str, Any]]:
+    with engine.connect() as conn:
+        report = conn.execute(
+            text("SELECT report FROM triage_report_cache WHERE signature = :signature"),
+            {"signature": signature},
+        ).scalar()
+    if isinstance(report, str):
+        report = json.loads(report)
+    return report
+
+
+def _store_cached_report(
+    engine: Engine, signature: str, entity_type: str, report: Dict[str, Any]
+) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                INSERT INTO triage_report_cache (signature, entity_type, report)
+                VALUES (:signature, :entity_type, :report)
+                ON CONFLICT (signature) DO NOTHING
+                """
+            ),
+            {
+                "signature": signature,
+                "entity_type": entity_type,
+                "report": json.dumps(report),
+            },
+        )
+
+
+def _llm_report(
     engine: Engine,
     run_id: str,
     entity_type: str,
-    config: Optional[LLMValidationConfig] = None,
-    llm_client: Optional[LLMClient] = None,
+    anomalies: List[Dict[str, Any]],
+    config: LLMValidationConfig,
+    llm_client: Optional[LLMClient],
 ) -> Dict[str, Any]:
-    config = config or get_llm_validation_config()
+    provider = os.getenv(config.provider_env, "")
+    model = os.getenv(config.model_env, "")
+    api_key = os.getenv(config.api_key_env, "")
+    if not (provider and model and api_key):
+        return _fallback_report(anomalies)
+    signature = anomaly_signature(entity_type, anomalies)
+    cached = _cached_report(engine, signature)
+    if cached is not None:
+        return cached
     with engine.connect() as conn:
-        anomalies = (
+        reviews = (
             conn.execute(
                 text(
                     """
-                SELECT * FROM anomaly_events
+                SELECT left_id, right_id, matcher_score, signals
+                FROM llm_match_reviews
                 WHERE run_id = :run_id AND entity_type = :entity_type
                 ORDER BY created_at DESC
+                LIMIT 20
                 """
                 ),
                 {"run_id": run_id, "entity_type": entity_type},
@@ -72,15 +162,52 @@ def generate_triage_report(
             .mappings()
             .all()
         )
-        reviews = (
+    llm_client = llm_client or LLMClient(
+        provider=provider,
+        model=model,
+        api_key=api_key,
+        rate_limit=config.rate_limit,
+    )
+    payload = {
+        "run_id": run_id,
+        "entity_type": entity_type,
+        "anomalies": anomalies,
+        "review_samples": [dict(item) for item in reviews],
+    }
+    user_prompt = json.dumps(payload, sort_keys=True, default=str)
+    try:
+        response = llm_client.request_json(SYSTEM_PROMPT, user_prompt)
+        report = TriageReport.model_validate(response).model_dump()
+    except Exception:
+        return _fallback_report(anomalies)
+    report["run_id"] = run_id
+    _store_cached_report(engine, signature, entity_type, report)
+    return report
+
+
+def generate_triage_report(
+    engine: Engine,
+    run_id: str,
+    entity_type: str,
+    config: Optional[LLMValidationConfig] = None,
+    llm_client: Optional[LLMClient] = None,
+) -> Dict[str, Any]:
+    """Write and return the triage report for one entity type of a run.
+
+    The LLM is only asked when there are anomalies, and a report generated
+    for the same anomaly signature earlier is reused from
+    ``triage_report_cache``. Every report carries the run id and the run's
+    own anomaly values, even when its text was written for an earlier run.
+    """
+    config = config or get_llm_validation_config()
+    with engine.connect() as conn:
+        anomalies = (
             conn.execute(
                 text(
                     """
-                SELECT left_id, right_id, matcher_score, signals
-                FROM llm_match_reviews
+                SELECT * FROM anomaly_events
                 WHERE run_id = :run_id AND entity_type = :entity_type
                 ORDER BY created_at DESC
-                LIMIT 20
                 """
                 ),
                 {"run_id": run_id, "entity_type": entity_type},
@@ -90,32 +217,14 @@ def generate_triage_report(
         )
 
     anomalies_payload = [dict(item) for item in anomalies]
-    reviews_payload = [dict(item) for item in reviews]
 
-    if not config.enabled:
+    if not anomalies_payload or not config.enabled:
         report = _fallback_report(anomalies_payload)
     else:
-        provider = os.getenv(config.provider_env, "")
-        model = os.getenv(config.model_env, "")
-        api_key = os.getenv(config.api_key_env, "")
-        if not (provider and model and api_key):
-            report = _fallback_report(anomalies_payload)
-        else:
-            llm_client = llm_client or LLMClient(
-                provider=provider, model=model, api_key=api_key
-            )
-            payload = {
-                "run_id": run_id,
-                "entity_type": entity_type,
-                "anomalies": anomalies_payload,
-                "review_samples": reviews_payload,
-            }
-            user_prompt = json.dumps(payload, sort_keys=True)
-            try:
-                response = llm_client.request_json(SYSTEM_PROMPT, user_prompt)
-                report = TriageReport.model_validate(response).model_dump()
-            except Exception:
-                report = _fallback_report(anomalies_payload)
+        report = _llm_report(
+            engine, run_id, entity_type, anomalies_payload, config, llm_client
+        )
+    report = _stamp_report(report, run_id, anomalies_payload)
 
     with engine.begin() as conn:
         conn.execute(
@@ -0,0 +1,225 @@
+"""Opt-in per-stage profiling for mapping runs.
+
+``run_mapping --profile`` wraps every pipeline stage in
+``StageProfiler.stage()``. Depending on the mode a stage is recorded with
+cProfile (``<stage>.pstats``, readable with ``pstats``, snakeviz or flameprof)
+or with a wall-clock stack sampler (``<stage>.folded``, collapsed stacks for
+flamegraph.pl or speedscope). Each stage also gets a tracemalloc snapshot
+(``<stage>.tracemalloc``). Files go under ``<output_dir>/<run_id>/`` next to
+a ``summary.json``, and the top-N hotspots of each stage are logged.
+
+Nothing here runs unless profiling was requested; ``run_mapping`` uses a
+``nullcontext`` otherwise.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import logging
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from types import FrameType
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sampling")
+DEFAULT_PROFILE_DIR = "profiles"
+
+
+def _frame_label(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_name}"
+
+
+def fold_stack(frame: Optional[FrameType]) -> str:
+    """Collapse a frame chain into ``outer;...;inner`` flamegraph notation."""
+    labels: List[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed wall-clock interval."""
+
+    def __init__(self, thread_id: int, interval: float = 0.005) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stage-profiler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[fold_stack(frame)] += 1
+
+    def write(self, path: Path) -> None:
+        lines = [f"{stack} {samples}" for stack, samples in self.stacks.items()]
+        path.write_text("\n".join(lines) + ("\n" if lines else ""))
+
+    def hotspots(self, top_n: int) -> List[Dict[str, Any]]:
+        own: Counter[str] = Counter()
+        inclusive: Counter[str] = Counter()
+        for stack, samples in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += samples
+            for label in set(frames):
+                inclusive[label] += samples
+        return [
+            {
+                "function": label,
+                "calls": None,
+                "self_seconds": samples * self.interval,
+                "cumulative_seconds": inclusive[label] * self.interval,
+            }
+            for label, samples in own.most_common(top_n)
+        ]
+
+
+def _cprofile_hotspots(profile: cProfile.Profile, top_n: int) -> List[Dict[str, Any]]:
+    functions = pstats.Stats(profile).get_stats_profile().func_profiles
+    ranked = sorted(functions.items(), key=lambda item: item[1].tottime, reverse=True)
+    return [
+        {
+            "function": f"{name} ({stats.file_name}:{stats.line_number})",
+            "calls": stats.ncalls,
+            "self_seconds": stats.tottime,
+            "cumulative_seconds": stats.cumtime,
+        }
+        for name, stats in ranked[:top_n]
+    ]
+
+
+class StageProfiler:
+    def __init__(
+        self,
+        run_id: str,
+        output_dir: str | Path = DEFAULT_PROFILE_DIR,
+        mode: str = "cprofile",
+        top_n: int = 20,
+        sample_interval: float = 0.005,
+    ) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(
+                f"Unknown profile mode {mode!r}; expected one of {PROFILE_MODES}"
+            )
+        self.run_id = run_id
+        self.directory = Path(output_dir) / run_id
+        self.mode = mode
+        self.top_n = top_n
+        self.sample_interval = sample_interval
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        profile: Optional[cProfile.Profile] = None
+        sampler: Optional[StackSampler] = None
+        if self.mode == "cprofile":
+            profile = cProfile.Profile()
+            profile.enable()
+        else:
+            sampler = StackSampler(threading.get_ident(), self.sample_interval)
+            sampler.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_seconds = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+            if sampler is not None:
+                sampler.stop()
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if not already_tracing:
+                tracemalloc.stop()
+            self._record(name, wall_seconds, profile, sampler, before, after, peak)
+
+    def _record(
+        self,
+        name: str,
+        wall_seconds: float,
+        profile: Optional[cProfile.Profile],
+        sampler: Optional[StackSampler],
+        before: tracemalloc.Snapshot,
+        after: tracemalloc.Snapshot,
+        peak: int,
+    ) -> None:
+        files: Dict[str, str] = {}
+        if profile is not None:
+            path = self.directory / f"{name}.pstats"
+            profile.dump_stats(path)
+            files["pstats"] = str(path)
+            hotspots = _cprofile_hotspots(profile, self.top_n)
+        else:
+            assert sampler is not None
+            path = self.directory / f"{name}.folded"
+            sampler.write(path)
+            files["folded"] = str(path)
+            hotspots = sampler.hotspots(self.top_n)
+        snapshot_path = self.directory / f"{name}.tracemalloc"
+        after.dump(str(snapshot_path))
+        files["tracemalloc"] = str(snapshot_path)
+        allocations = [
+            {"location": str(stat.traceback), "size_diff_bytes": stat.size_diff}
+            for stat in after.compare_to(before, "lineno")[: self.top_n]
+        ]
+        self.stages[name] = {
+            "wall_seconds": wall_seconds,
+            "traced_peak_bytes": peak,
+            "files": files,
+            "hotspots": hotspots,
+            "allocations": allocations,
+        }
+        # Rewritten after every stage so an aborted run keeps what it has.
+        summary = {"run_id": self.run_id, "mode": self.mode, "stages": self.stages}
+        (self.directory / "summary.json").write_text(json.dumps(summary, indent=2))
+        self._log(name)
+
+    def _log(self, name: str) -> None:
+        stage = self.stages[name]
+        logger.info(
+            "Profile %s: %.3fs wall, traced peak %.1f MiB, files in %s",
+            name,
+            stage["wall_seconds"],
+            stage["traced_peak_bytes"] / (1024 * 1024),
+            self.directory,
+        )
+        for row in stage["hotspots"]:
+            logger.info(
+                "  %9.3fs self %9.3fs cum %8s calls  %s",
+                row["self_seconds"],
+                row["cumulative_seconds"],
+                row["calls"] or "-",
+                row["function"],
+            )
+        for row in stage["allocations"][:5]:
+            logger.info(
+                "  %+10.1f KiB  %s", row["size_diff_bytes"] / 1024, row["location"]
+            )
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Mapping, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+INTEGER_TOTALS = [
+    "total_candidates",
+    "auto_match_count",
+    "auto_reject_count",
+    "gray_zone_sent_count",
+    "llm_match_count",
+    "llm_no_match_count",
+    "llm_review_count",
+    "llm_call_count",
+    "llm_error_count",
+    "llm_invalid_json_retry_count",
+    "llm_retry_count",
+    "llm_prompt_tokens",
+    "llm_completion_tokens",
+    "llm_bytes_sent",
+]
+JSON_COLUMNS = [
+    "totals",
+    "rates",
+    "llm_health",
+    "review_counts",
+    "review_counts_by_entity",
+]
+LATENCY_COLUMNS = (
+    ("p50_ms", "llm_latency_p50_ms"),
+    ("p95_ms", "llm_latency_p95_ms"),
+    ("p99_ms", "llm_latency_p99_ms"),
+    ("max_ms", "llm_latency_max_ms"),
+)
+
+_TOTALS_SQL = (
+    "SELECT COUNT(*) AS metrics_row_count, "
+    + ", ".join(f"COALESCE(SUM({column}), 0) AS {column}" for column in INTEGER_TOTALS)
+    + ", COALESCE(SUM(COALESCE(llm_avg_latency_ms, 0) * COALESCE(llm_call_count, 0)),"
+    " 0) AS llm_total_latency_ms"
+    + ", MAX(llm_latency_max_ms) AS llm_latency_max_ms"
+    + " FROM pipeline_run_metrics WHERE run_id = :run_id"
+)
+
+
+def _review_counts(conn: Connection, run_id: str) -> Dict[str, Any]:
+    rows = conn.execute(
+        text(
+            """
+            SELECT entity_type, status, COUNT(*) AS count
+            FROM llm_match_reviews
+            WHERE run_id = :run_id
+            GROUP BY entity_type, status
+            """
+        ),
+        {"run_id": run_id},
+    ).mappings()
+    by_status: Dict[str, int] = {}
+    by_entity: Dict[str, Dict[str, int]] = {}
+    for row in rows:
+        count = int(row["count"])
+        by_status[row["status"]] = by_status.get(row["status"], 0) + count
+        by_entity.setdefault(row["entity_type"], {})[row["status"]] = count
+    return {"review_counts": by_status, "review_counts_by_entity": by_entity}
+
+
+def summary_rates(totals: Mapping[str, Any]) -> Dict[str, float]:
+    total_candidates = totals.get("total_candidates") or 0
+    llm_call_count = totals.get("llm_call_count") or 0
+    return {
+        "gray_zone_rate": (
+            (totals.get("gray_zone_sent_count") or 0) / total_candidates
+            if total_candidates
+            else 0.0
+        ),
+        "llm_review_rate": (
+            (totals.get("llm_review_count") or 0) / total_candidates
+            if total_candidates
+            else 0.0
+        ),
+        "llm_error_rate": (
+            (totals.get("llm_error_count") or 0) / llm_call_count
+            if llm_call_count
+            else 0.0
+        ),
+    }
+
+
+def compute_run_summary(conn: Connection, run_id: str) -> Dict[str, Any]:
+    """Aggregate ``pipeline_run_metrics`` and review counts for ``run_id`` in SQL."""
+    aggregate = conn.execute(text(_TOTALS_SQL), {"run_id": run_id}).mappings().one()
+    latency_rows = conn.execute(
+        text(
+            "SELECT entity_type, "
+            + ", ".join(column for _, column in LATENCY_COLUMNS)
+            + " FROM pipeline_run_metrics WHERE run_id = :run_id"
+        ),
+        {"run_id": run_id},
+    ).mappings()
+
+    totals: Dict[str, Any] = {
+        column: int(aggregate[column] or 0) for column in INTEGER_TOTALS
+    }
+    totals["llm_total_latency_ms"] = float(aggregate["llm_total_latency_ms"] or 0)
+    latency_by_entity_type = {
+        row["entity_type"]: {
+            key: float(row[column]) if row[column] is not None else None
+            for key, column in LATENCY_COLUMNS
+        }
+        for row in latency_rows
+    }
+
+    llm_call_count = totals["llm_call_count"]
+    rates = summary_rates(totals)
+    latency_max = aggregate["llm_latency_max_ms"]
+    llm_health = {
+        "llm_call_count": llm_call_count,
+        "llm_error_count": totals["llm_error_count"],
+        "llm_invalid_json_retry_count": totals["llm_invalid_json_retry_count"],
+        "llm_avg_latency_ms": (
+            totals["llm_total_latency_ms"] / llm_call_count if llm_call_count else None
+        ),
+        "llm_latency_max_ms": float(latency_max) if latency_max is not None else None,
+        "llm_latency_by_entity_type": latency_by_entity_type,
+        "llm_retry_count": totals["llm_retry_count"],
+        "llm_prompt_tokens": totals["llm_prompt_tokens"],
+        "llm_completion_tokens": totals["llm_completion_tokens"],
+        "llm_bytes_sent": totals["llm_bytes_sent"],
+    }
+    return {
+        "run_id": run_id,
+        "metrics_row_count": int(aggregate["metrics_row_count"] or 0),
+        "totals": totals,
+        "rates": rates,
+        "llm_health": llm_health,
+        **_review_counts(conn, run_id),
+    }
+
+
+def _store(conn: Connection, summary: Dict[str, Any]) -> None:
+    params = {column: json.dumps(summary[column]) for column in JSON_COLUMNS}
+    params["run_id"] = summary["run_id"]
+    params["metrics_row_count"] = summary["metrics_row_count"]
+    conn.execute(
+        text(
+            """
+            INSERT INTO run_summaries
+            (run_id, metrics_row_count, totals, rates, llm_health,
+             review_counts, review_counts_by_entity)
+            VALUES (:run_id, :metrics_row_count, :totals, :rates, :llm_health,
+                    :review_counts, :review_counts_by_entity)
+            ON CONFLICT (run_id) DO UPDATE SET
+                metrics_row_count = excluded.metrics_row_count,
+                totals = excluded.totals,
+                rates = excluded.rates,
+                llm_health = excluded.llm_health,
+                review_counts = excluded.review_counts,
+                review_counts_by_entity = excluded.review_counts_by_entity,
+                updated_at = CURRENT_TIMESTAMP
+            """
+        ),
+        params,
+    )
+
+
+def materialize_run_summary(engine: Engine, run_id: str) -> Dict[str, Any]:
+    with engine.begin() as conn:
+        summary = compute_run_summary(conn, run_id)
+        _store(conn, summary)
+    return summary
+
+
+def deserialize_summary(row: Any) -> Dict[str, Any]:
+    summary = dict(row)
+    for column in JSON_COLUMNS:
+        if isinstance(summary.get(column), str):
+            summary[column] = json.loads(summary[column])
+    return summary
+
+
+def get_run_summary(engine: Engine, run_id: str) -> Dict[str, Any]:
+    """Read the stored summary, backfilling it for runs that predate the table."""
+    with engine.connect() as conn:
+        row = (
+            conn.execute(
+                text("SELECT * FROM run_summaries WHERE run_id = :run_id"),
+                {"run_id": run_id},
+            )
+            .mappings()
+            .first()
+        )
+    if row is not None:
+        return deserialize_summary(row)
+    return backfill_run_summary(engine, run_id)
+
+
+def backfill_run_summary(engine: Engine, run_id: str) -> Dict[str, Any]:
+    with engine.begin() as conn:
+        summary = compute_run_summary(conn, run_id)
+        # Only persist runs that exist; unknown ids just get the empty summary.
+        if summary["metrics_row_count"]:
+            _store(conn, summary)
+    return summary
+
+
+def refresh_review_counts(conn: Connection, run_id: Optional[str]) -> None:
+    """Keep a stored summary's review counts in step with reviewer decisions."""
+    if not run_id:
+        return
+    counts = _review_counts(conn, run_id)
+    conn.execute(
+        text(
+            """
+            UPDATE run_summaries
+            SET review_counts = :review_counts,
+                review_counts_by_entity = :review_counts_by_entity,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE run_id = :run_id
+            """
+        ),
+        {
+            "run_id": run_id,
+            "review_counts": json.dumps(counts["review_counts"]),
+            "review_counts_by_entity": json.dumps(counts["review_counts_by_entity"]),
+        },
+    )
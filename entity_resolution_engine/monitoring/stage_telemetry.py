@@ -0,0 +1,154 @@
+"""Per-stage performance telemetry stored alongside the routing metrics.
+
+``run_mapping`` opens a ``RunTelemetry`` for the run and wraps each entity
+stage in ``telemetry.stage(entity_type)``. That records wall time, CPU time
+and the process' peak RSS, and makes the stage the target of ``phase()``
+timings and ``count()`` work counters reported by loaders, matchers,
+normalizers and the writer. With no active run both are no-ops, so library
+code called from the API or tests pays only a context-variable lookup.
+"""
+
+from __future__ import annotations
+
+import functools
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+PHASES = ["load", "match", "normalize", "route", "merge", "write"]
+COUNTERS = ["candidate_pairs", "pruned_pairs", "normalizer_calls", "rows_written"]
+TELEMETRY_COLUMNS = [
+    "stage_wall_seconds",
+    "stage_cpu_seconds",
+    "peak_rss_mb",
+    *(f"{phase}_seconds" for phase in PHASES),
+    *COUNTERS,
+]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_active_run: ContextVar[Optional["RunTelemetry"]] = ContextVar(
+    "run_telemetry", default=None
+)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """High-water mark of this process' resident set size, in MiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class StageTelemetry:
+    def __init__(self, entity_type: str) -> None:
+        self.entity_type = entity_type
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_rss_mb: Optional[float] = None
+        self.phase_seconds: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.counters: Counter[str] = Counter(dict.fromkeys(COUNTERS, 0))
+
+    def metrics(self) -> Dict[str, Any]:
+        values: Dict[str, Any] = {
+            "stage_wall_seconds": self.wall_seconds,
+            "stage_cpu_seconds": self.cpu_seconds,
+            "peak_rss_mb": self.peak_rss_mb,
+        }
+        for phase, seconds in self.phase_seconds.items():
+            values[f"{phase}_seconds"] = seconds
+        values.update((name, self.counters[name]) for name in COUNTERS)
+        return values
+
+
+class RunTelemetry:
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageTelemetry] = {}
+        self.current: Optional[StageTelemetry] = None
+
+    def stage_for(self, entity_type: str) -> StageTelemetry:
+        if entity_type not in self.stages:
+            self.stages[entity_type] = StageTelemetry(entity_type)
+        return self.stages[entity_type]
+
+    def metrics(self, entity_type: str) -> Dict[str, Any]:
+        return self.stage_for(entity_type).metrics()
+
+    @contextmanager
+    def activate(self) -> Iterator["RunTelemetry"]:
+        token = _active_run.set(self)
+        try:
+            yield self
+        finally:
+            _active_run.reset(token)
+
+    @contextmanager
+    def stage(self, entity_type: str) -> Iterator[StageTelemetry]:
+        stage = self.stage_for(entity_type)
+        previous, self.current = self.current, stage
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield stage
+        finally:
+            stage.wall_seconds += time.perf_counter() - wall_start
+            stage.cpu_seconds += time.process_time() - cpu_start
+            stage.peak_rss_mb = peak_rss_mb()
+            self.current = previous
+
+
+@contextmanager
+def phase(name: str, entity_type: Optional[str] = None) -> Iterator[None]:
+    """Add the time spent in the block to ``name`` of the current stage.
+
+    ``entity_type`` attributes the time to another stage, e.g. per-table
+    reads during the shared load step. Time spent in normalizers inside the
+    block goes to ``normalize`` only, so the phases do not overlap.
+    """
+    run = _active_run.get()
+    if run is None:
+        yield
+        return
+    stage = run.stage_for(entity_type) if entity_type else run.current
+    start = time.perf_counter()
+    normalize_start = stage.phase_seconds["normalize"] if stage else 0.0
+    try:
+        yield
+    finally:
+        if stage is not None:
+            nested = stage.phase_seconds["normalize"] - normalize_start
+            stage.phase_seconds[name] += time.perf_counter() - start - nested
+
+
+def count(name: str, amount: int = 1) -> None:
+    run = _active_run.get()
+    if run is not None and run.current is not None:
+        run.current.counters[name] += amount
+
+
+def normalizer(func: F) -> F:
+    """Count calls to, and time spent in, a normalizer function."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        run = _active_run.get()
+        stage = run.current if run is not None else None
+        if stage is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stage.phase_seconds["normalize"] += time.perf_counter() - start
+            stage.counters["normalizer_calls"] += 1
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import math
+from typing import Optional, Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile; ``None`` for an empty sample."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return float(ordered[min(rank, len(ordered)) - 1])
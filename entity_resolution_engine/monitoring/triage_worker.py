@@ -0,0 +1,69 @@
+"""Background worker that writes anomaly triage reports off the critical path.
+
+``run_mapping`` submits one job per entity type and returns without waiting.
+The worker thread is started on demand and exits once its queue is empty;
+it is not a daemon, so a CLI process still finishes the queued reports
+before exiting.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from entity_resolution_engine.monitoring.llm_triage import generate_triage_report
+
+logger = logging.getLogger(__name__)
+
+TriageFn = Callable[..., Dict[str, Any]]
+
+
+class TriageWorker:
+    def __init__(
+        self,
+        engine: Engine,
+        triage: TriageFn = generate_triage_report,
+        **triage_kwargs: Any,
+    ) -> None:
+        self.engine = engine
+        self.triage = triage
+        self.triage_kwargs = triage_kwargs
+        self.completed: List[Tuple[str, str]] = []
+        self.failed: List[Tuple[str, str, str]] = []
+        self._queue: "queue.Queue[Tuple[str, str]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, run_id: str, entity_type: str) -> None:
+        with self._lock:
+            self._queue.put((run_id, entity_type))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="triage-worker", daemon=False
+                )
+                self._thread.start()
+
+    def drain(self) -> None:
+        """Block until every submitted job has been processed."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                try:
+                    run_id, entity_type = self._queue.get_nowait()
+                except queue.Empty:
+                    self._thread = None
+                    return
+            try:
+                self.triage(self.engine, run_id, entity_type, **self.triage_kwargs)
+                self.completed.append((run_id, entity_type))
+            except Exception as exc:  # one failed report must not stop the rest
+                logger.warning("Triage for %s/%s failed: %s", run_id, entity_type, exc)
+                self.failed.append((run_id, entity_type, str(exc)))
+            finally:
+                self._queue.task_done()
@@ -2,6 +2,8 @@ import re
 from pathlib import Path
 import yaml
 
+from entity_resolution_engine.monitoring.stage_telemetry import normalizer
+
 CONFIG_PATH = Path(__file__).resolve().parents[1] / "config" / "normalization.yml"
 with CONFIG_PATH.open() as f:
     CONFIG = yaml.safe_load(f)
@@ -9,6 +11,7 @@ with CONFIG_PATH.open() as f:
 SPONSORS = [phrase.lower() for phrase in CONFIG.get("competition_sponsors", [])]
 
 
+@normalizer
 def normalize_competition(name: str) -> str:
     if not name:
         return ""
@@ -4,6 +4,8 @@ from typing import Optional
 
 from rapidfuzz import fuzz
 
+from entity_resolution_engine.monitoring.stage_telemetry import normalizer
+
 
 PUNCT_PATTERN = re.compile(r"[^\w\s]")
 ALIAS_PATTERNS = [
@@ -11,6 +13,7 @@ ALIAS_PATTERNS = [
 ]
 
 
+@normalizer
 def normalize_name(name: Optional[str]) -> str:
     if not name:
         return ""
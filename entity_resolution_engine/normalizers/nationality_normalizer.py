@@ -1,6 +1,8 @@
 import yaml
 from pathlib import Path
 
+from entity_resolution_engine.monitoring.stage_telemetry import normalizer
+
 CONFIG_PATH = Path(__file__).resolve().parents[1] / "config" / "normalization.yml"
 with CONFIG_PATH.open() as f:
     CONFIG = yaml.safe_load(f)
@@ -8,6 +10,7 @@ with CONFIG_PATH.open() as f:
 COUNTRY_MAP = {k.lower(): v for k, v in CONFIG.get("countries", {}).items()}
 
 
+@normalizer
 def normalize_country(value: str) -> str:
     if not value:
         return ""
@@ -1,6 +1,8 @@
 import re
 from typing import Optional, Tuple
 
+from entity_resolution_engine.monitoring.stage_telemetry import normalizer
+
 SEASON_REGEXES = [
     re.compile(r"(?P<start>\d{2,4})\s*[-/]\s*(?P<end>\d{2,4})"),
     re.compile(r"(?P<year>\d{4})"),
@@ -17,6 +19,7 @@ def _expand_year(fragment: str, reference_start: Optional[int] = None) -> int:
     return 2000 + value if value <= 30 else 1900 + value
 
 
+@normalizer
 def normalize_season(season_name: str) -> Tuple[Optional[int], Optional[int]]:
     if not season_name:
         return None, None
@@ -0,0 +1,495 @@
+"""Fuzzed equivalence of the matchers against their frozen reference oracles.
+
+Every matcher in ``MATCHERS`` pairs a reference from ``matchers/reference.py``
+with one or more engines, i.e. implementations that must produce the same
+matches. Each case builds small random alpha/beta frames from a tiny
+vocabulary, so duplicate names, score ties, aliases, missing dates and
+partial id maps come up often. An engine passes a case when:
+
+* it returns the same (alpha id, beta id) pairs as the reference,
+* in the same order,
+* and every other field is equal, with floats allowed to differ by
+  ``tolerance``.
+
+If the reference raises, the engine must raise the same exception type.
+An engine may list documented differences, keyed by field name or
+``"order"``, each with the reason it is allowed. Those checks are then
+skipped for that engine. The pairs themselves are never exempt.
+
+A mismatch reports the case seed, so ``case_inputs(spec, seed)`` rebuilds its
+inputs. Register a fast path as a new ``Engine`` on its matcher.
+
+Example:
+    python -m entity_resolution_engine.qa.equivalence --matcher match_players \
+        --cases 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import datetime as dt
+import math
+import random
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from numbers import Real
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from entity_resolution_engine.matchers import reference
+from entity_resolution_engine.matchers.competitions_matcher import (
+    match_competitions,
+)
+from entity_resolution_engine.matchers.matches_matcher import match_matches
+from entity_resolution_engine.matchers.players_matcher import match_players
+from entity_resolution_engine.matchers.seasons_matcher import match_seasons
+from entity_resolution_engine.matchers.teams_matcher import match_teams
+
+DEFAULT_CASES = 200
+RANDOM_SEED = 42
+TOLERANCE = 1e-9
+MAX_ROWS = 8
+
+Matcher = Callable[..., List[Dict[str, Any]]]
+
+TEAM_NAMES = [
+    "Manchester City",
+    "Man City",
+    "Manchester City FC",
+    "City FC",
+    "City Football Club",
+    "Manchester United",
+    "Arsenal",
+    "Arsenal FC",
+    "Real Madrid",
+    "Real Madrid CF",
+    "Madrid Real",
+    "",
+]
+COMPETITION_NAMES = [
+    "Premier League",
+    "Barclays Premier League",
+    "English Premier League",
+    "La Liga",
+    "LaLiga Santander",
+    "Serie A",
+    "Serie A TIM",
+    "Champions League",
+    "",
+]
+SEASON_LABELS = ["2022/23", "2022-2023", "2023/24", "2023", "21/22", "Season", ""]
+PLAYER_NAMES = [
+    "Lionel Messi",
+    "Messi Lionel",
+    "L. Messi",
+    "Cristiano Ronaldo",
+    "C. Ronaldo",
+    "Kylian Mbappe",
+    "Kylian Mbappé",
+    "Erling Haaland",
+    "Erling Braut Haaland",
+]
+COUNTRIES = ["England", "Spain", "ES", None]
+BASE_DATE = dt.date(2023, 8, 12)
+
+
+@dataclass(frozen=True)
+class Engine:
+    name: str
+    run: Matcher
+    # Field name (or "order") -> why this engine may differ from the reference.
+    documented_differences: Mapping[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class MatcherSpec:
+    name: str
+    reference: Matcher
+    pair_fields: Tuple[str, str]
+    random_inputs: Callable[[random.Random], Tuple[Any, ...]]
+    engines: Sequence[Engine]
+
+
+@dataclass
+class Mismatch:
+    matcher: str
+    engine: str
+    case_seed: int
+    differences: List[str]
+
+
+def _maybe(rng: random.Random, value: Any, missing: float = 0.15) -> Any:
+    return None if rng.random() < missing else value
+
+
+def _rows(rng: random.Random, minimum: int = 0) -> int:
+    return rng.randint(minimum, MAX_ROWS)
+
+
+def _date(rng: random.Random) -> Optional[dt.date]:
+    return _maybe(rng, BASE_DATE + dt.timedelta(days=rng.randint(0, 3)))
+
+
+def _id_map(rng: random.Random, ids: int, coverage: float = 0.8) -> Dict[int, int]:
+    return {
+        idx: rng.randint(1, ids) for idx in range(1, ids + 1) if rng.random() < coverage
+    }
+
+
+def random_team_inputs(rng: random.Random) -> Tuple[Any, ...]:
+    alpha = pd.DataFrame(
+        [
+            {
+                "team_id": idx,
+                "name": rng.choice(TEAM_NAMES),
+                "country": rng.choice(COUNTRIES),
+            }
+            for idx in range(1, _rows(rng) + 1)
+        ],
+        columns=["team_id", "name", "country"],
+    )
+    beta = pd.DataFrame(
+        [
+            {
+                "id": 100 + idx,
+                "display_name": rng.choice(TEAM_NAMES),
+                "region": rng.choice(COUNTRIES),
+            }
+            for idx in range(1, _rows(rng) + 1)
+        ],
+        columns=["id", "display_name", "region"],
+    )
+    return alpha, beta
+
+
+def random_competition_inputs(rng: random.Random) -> Tuple[Any, ...]:
+    alpha = pd.DataFrame(
+        [
+            {
+                "competition_id": idx,
+                "name": rng.choice(COMPETITION_NAMES),
+                "country": rng.choice(COUNTRIES),
+            }
+            for idx in range(1, _rows(rng) + 1)
+        ],
+        columns=["competition_id", "name", "country"],
+    )
+    beta = pd.DataFrame(
+        [
+            {
+                "id": 100 + idx,
+                "title": rng.choice(COMPETITION_NAMES),
+                "locale": rng.choice(COUNTRIES),
+            }
+            for idx in range(1, _rows(rng) + 1)
+        ],
+        columns=["id", "title", "locale"],
+    )
+    return alpha, beta
+
+
+def random_season_inputs(rng: random.Random) -> Tuple[Any, ...]:
+    competitions = 3
+    alpha = pd.DataFrame(
+        [
+            {
+                "season_id": idx,
+                "competition_id": rng.randint(1, competitions),
+                "name": rng.choice(SEASON_LABELS),
+            }
+            for idx in range(1, _rows(rng) + 1)
+        ],
+        columns=["season_id", "competition_id", "name"],
+    )
+    beta = pd.DataFrame(
+        [
+            {
+                "id": 100 + idx,
+                "competition_id": rng.randint(1, competitions),
+                "label": rng.choice(SEASON_LABELS),
+            }
+            for idx in range(1, _rows(rng) + 1)
+        ],
+        columns=["id", "competition_id", "label"],
+    )
+    return alpha, beta, _id_map(rng, competitions)
+
+
+def random_player_inputs(rng: random.Random) -> Tuple[Any, ...]:
+    teams = 3
+    beta_teams = pd.DataFrame(
+        [
+            {"id": idx, "display_name": rng.choice(TEAM_NAMES)}
+            for idx in range(1, teams + 1)
+        ],
+        columns=["id", "display_name"],
+    )
+    alpha = pd.DataFrame(
+        [
+            {
+                "player_id": idx,
+                "name": rng.choice(PLAYER_NAMES),
+                "dob": _maybe(rng, dt.date(rng.randint(1985, 1988), 6, 24)),
+                "team_id": _maybe(rng, rng.randint(1, teams)),
+            }
+            for idx in range(1, _rows(rng) + 1)
+        ],
+        columns=["player_id", "name", "dob", "team_id"],
+    )
+    beta = pd.DataFrame(
+        [
+            {
+                "id": 100 + idx,
+                "full_name": rng.choice(PLAYER_NAMES),
+                "birth_year": _maybe(rng, rng.randint(1985, 1988)),
+                "team_name": _maybe(rng, rng.choice(TEAM_NAMES)),
+            }
+            for idx in range(1, _rows(rng) + 1)
+        ],
+        columns=["id", "full_name", "birth_year", "team_name"],
+    )
+    return alpha, beta, _id_map(rng, teams), beta_teams
+
+
+MATCH_COLUMNS = [
+    "competition_id",
+    "season_id",
+    "home_team_id",
+    "away_team_id",
+    "match_date",
+]
+
+
+def random_match_inputs(rng: random.Random) -> Tuple[Any, ...]:
+    teams, competitions, seasons = 4, 2, 2
+    maps = {
+        "home_team_id": _id_map(rng, teams),
+        "competition_id": _id_map(rng, competitions),
+        "season_id": _id_map(rng, seasons),
+    }
+    maps["away_team_id"] = maps["home_team_id"]
+
+    def fixture() -> Dict[str, Any]:
+        return {
+            "competition_id": rng.randint(1, competitions),
+            "season_id": rng.randint(1, seasons),
+            "home_team_id": rng.randint(1, teams),
+            "away_team_id": rng.randint(1, teams),
+            "match_date": _date(rng),
+        }
+
+    alpha_rows = [fixture() for _ in range(_rows(rng))]
+    beta_rows = []
+    for _ in range(_rows(rng)):
+        row = fixture()
+        # Most beta fixtures mirror an alpha one so the id maps line up.
+        if alpha_rows and rng.random() < 0.7:
+            source = rng.choice(alpha_rows)
+            row.update(
+                {
+                    column: _maybe(rng, maps[column].get(source[column]), 0.05)
+                    for column in maps
+                }
+            )
+        beta_rows.append(row)
+    alpha = pd.DataFrame(alpha_rows, columns=MATCH_COLUMNS)
+    alpha.insert(0, "match_id", range(1, len(alpha) + 1))
+    beta = pd.DataFrame(beta_rows, columns=MATCH_COLUMNS)
+    beta.insert(0, "id", range(101, len(beta) + 101))
+    return (
+        alpha,
+        beta,
+        maps["home_team_id"],
+        maps["competition_id"],
+        maps["season_id"],
+    )
+
+
+MATCHERS: Dict[str, MatcherSpec] = {
+    spec.name: spec
+    for spec in [
+        MatcherSpec(
+            "match_teams",
+            reference.match_teams,
+            ("alpha_team_id", "beta_team_id"),
+            random_team_inputs,
+            [Engine("production", match_teams)],
+        ),
+        MatcherSpec(
+            "match_competitions",
+            reference.match_competitions,
+            ("alpha_competition_id", "beta_competition_id"),
+            random_competition_inputs,
+            [Engine("production", match_competitions)],
+        ),
+        MatcherSpec(
+            "match_seasons",
+            reference.match_seasons,
+            ("alpha_season_id", "beta_season_id"),
+            random_season_inputs,
+            [Engine("production", match_seasons)],
+        ),
+        MatcherSpec(
+            "match_players",
+            reference.match_players,
+            ("alpha_player_id", "beta_player_id"),
+            random_player_inputs,
+            [Engine("production", match_players)],
+        ),
+        MatcherSpec(
+            "match_matches",
+            reference.match_matches,
+            ("alpha_match_id", "beta_match_id"),
+            random_match_inputs,
+            [Engine("production", match_matches)],
+        ),
+    ]
+}
+
+
+def _missing(value: Any) -> bool:
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def _same(expected: Any, actual: Any, tolerance: float) -> bool:
+    if isinstance(expected, Mapping) and isinstance(actual, Mapping):
+        return expected.keys() == actual.keys() and all(
+            _same(expected[key], actual[key], tolerance) for key in expected
+        )
+    if _missing(expected) or _missing(actual):
+        return _missing(expected) and _missing(actual)
+    if (
+        isinstance(expected, Real)
+        and isinstance(actual, Real)
+        and not isinstance(expected, bool)
+        and not isinstance(actual, bool)
+    ):
+        return math.isclose(expected, actual, rel_tol=0.0, abs_tol=tolerance)
+    return bool(expected == actual)
+
+
+def compare_matches(
+    expected: Sequence[Dict[str, Any]],
+    actual: Sequence[Dict[str, Any]],
+    pair_fields: Tuple[str, str],
+    tolerance: float = TOLERANCE,
+    documented: Mapping[str, str] | None = None,
+) -> List[str]:
+    """Describe how ``actual`` differs from the reference output ``expected``."""
+    documented = documented or {}
+
+    def pair(match: Dict[str, Any]) -> Tuple[Any, ...]:
+        return tuple(match.get(name) for name in pair_fields)
+
+    expected_pairs = Counter(map(pair, expected))
+    actual_pairs = Counter(map(pair, actual))
+    if expected_pairs != actual_pairs:
+        return [
+            f"pairs: missing {sorted(expected_pairs - actual_pairs, key=repr)}, "
+            f"unexpected {sorted(actual_pairs - expected_pairs, key=repr)}"
+        ]
+
+    differences = []
+    if "order" not in documented and [pair(m) for m in expected] != [
+        pair(m) for m in actual
+    ]:
+        differences.append("order: pairs are returned in a different order")
+    # Pairs can repeat (e.g. duplicate alpha ids), so match them up in order.
+    remaining: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = {}
+    for match in actual:
+        remaining.setdefault(pair(match), []).append(match)
+    for match in expected:
+        other = remaining[pair(match)].pop(0)
+        for name in sorted(match.keys() | other.keys()):
+            if name in pair_fields or name in documented:
+                continue
+            if name not in match or name not in other:
+                differences.append(f"{pair(match)} {name}: present on one side only")
+            elif not _same(match[name], other[name], tolerance):
+                differences.append(
+                    f"{pair(match)} {name}: expected {match[name]!r}, "
+                    f"got {other[name]!r}"
+                )
+    return differences
+
+
+def case_inputs(spec: MatcherSpec, case_seed: int) -> Tuple[Any, ...]:
+    return spec.random_inputs(random.Random(case_seed))
+
+
+def _run(matcher: Matcher, inputs: Tuple[Any, ...]) -> Any:
+    # Copy per call so neither side can see the other's mutations.
+    try:
+        return matcher(*copy.deepcopy(inputs))
+    except Exception as exc:
+        return exc
+
+
+def check_engine(
+    spec: MatcherSpec,
+    engine: Engine,
+    cases: int = DEFAULT_CASES,
+    seed: int = RANDOM_SEED,
+    tolerance: float = TOLERANCE,
+) -> List[Mismatch]:
+    rng = random.Random(seed)
+    mismatches = []
+    for _ in range(cases):
+        case_seed = rng.randrange(2**32)
+        inputs = case_inputs(spec, case_seed)
+        expected = _run(spec.reference, inputs)
+        actual = _run(engine.run, inputs)
+        if isinstance(expected, Exception) or isinstance(actual, Exception):
+            if type(expected) is type(actual):
+                continue
+            differences = [f"outcome: expected {expected!r:.200}, got {actual!r:.200}"]
+        else:
+            differences = compare_matches(
+                expected,
+                actual,
+                spec.pair_fields,
+                tolerance,
+                engine.documented_differences,
+            )
+        if differences:
+            mismatches.append(Mismatch(spec.name, engine.name, case_seed, differences))
+    return mismatches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--matcher", nargs="+", choices=sorted(MATCHERS))
+    parser.add_argument("--cases", type=int, default=DEFAULT_CASES)
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    failed = False
+    for name, spec in MATCHERS.items():
+        if args.matcher and name not in args.matcher:
+            continue
+        for engine in spec.engines:
+            mismatches = check_engine(
+                spec, engine, args.cases, args.seed, args.tolerance
+            )
+            status = f"{len(mismatches)} mismatches" if mismatches else "ok"
+            print(f"{name:<20} {engine.name:<16} {args.cases} cases  {status}")
+            for difference, reason in engine.documented_differences.items():
+                print(f"  documented {difference}: {reason}")
+            for mismatch in mismatches[:5]:
+                print(f"  case seed {mismatch.case_seed}:")
+                for difference in mismatch.differences:
+                    print(f"    {difference}")
+            failed = failed or bool(mismatches)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
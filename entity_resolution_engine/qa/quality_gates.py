@@ -3,26 +3,53 @@ from __future__ import annotations
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Mapping, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 import yaml
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.engine import Engine
 
+from entity_resolution_engine.monitoring.anomaly_detector import QUALITY_METRICS
+from entity_resolution_engine.monitoring.run_summary import (
+    INTEGER_TOTALS,
+    get_run_summary,
+    summary_rates,
+)
+
 CONFIG_PATH = Path(__file__).resolve().parents[1] / "config" / "quality_gates.yml"
 
 
+STAGE_FAILURE_ACTIONS = ("continue", "skip_llm", "abort")
+RATE_GATES = {
+    "max_gray_zone_rate": "gray_zone_rate",
+    "max_llm_review_rate": "llm_review_rate",
+    "max_llm_error_rate": "llm_error_rate",
+}
+
+
 @dataclass(frozen=True)
 class QualityGateConfig:
     max_llm_review_rate: float
     max_gray_zone_rate: float
     fail_on_high_severity_anomalies: bool
     max_llm_error_rate: float
+    # Checked after every entity stage against that stage's own rates.
+    hard_gates: Tuple[str, ...] = ("max_gray_zone_rate", "max_llm_error_rate")
+    on_stage_failure: str = "continue"
 
 
-@lru_cache
-def get_quality_gate_config(path: Path = CONFIG_PATH) -> QualityGateConfig:
-    data = yaml.safe_load(path.read_text()) if path.exists() else {}
+def _config_from_mapping(data: Mapping[str, Any]) -> QualityGateConfig:
+    on_stage_failure = str(data.get("on_stage_failure", "continue"))
+    if on_stage_failure not in STAGE_FAILURE_ACTIONS:
+        raise ValueError(
+            f"on_stage_failure must be one of {', '.join(STAGE_FAILURE_ACTIONS)}"
+        )
+    hard_gates = tuple(
+        data.get("hard_gates", ("max_gray_zone_rate", "max_llm_error_rate"))
+    )
+    unknown = [gate for gate in hard_gates if gate not in RATE_GATES]
+    if unknown:
+        raise ValueError(f"Unknown hard gates: {', '.join(unknown)}")
     return QualityGateConfig(
         max_llm_review_rate=float(data.get("max_llm_review_rate", 0.15)),
         max_gray_zone_rate=float(data.get("max_gray_zone_rate", 0.35)),
@@ -30,9 +57,17 @@ def get_quality_gate_config(path: Path = CONFIG_PATH) -> QualityGateConfig:
             data.get("fail_on_high_severity_anomalies", True)
         ),
         max_llm_error_rate=float(data.get("max_llm_error_rate", 0.05)),
+        hard_gates=hard_gates,
+        on_stage_failure=on_stage_failure,
     )
 
 
+@lru_cache
+def get_quality_gate_config(path: Path = CONFIG_PATH) -> QualityGateConfig:
+    data = yaml.safe_load(path.read_text()) if path.exists() else {}
+    return _config_from_mapping(data or {})
+
+
 def _normalize_config(
     config: Optional[QualityGateConfig | Mapping[str, Any]],
 ) -> QualityGateConfig:
@@ -40,73 +75,45 @@ def _normalize_config(
         return get_quality_gate_config()
     if isinstance(config, QualityGateConfig):
         return config
-    return QualityGateConfig(
-        max_llm_review_rate=float(config.get("max_llm_review_rate", 0.15)),
-        max_gray_zone_rate=float(config.get("max_gray_zone_rate", 0.35)),
-        fail_on_high_severity_anomalies=bool(
-            config.get("fail_on_high_severity_anomalies", True)
-        ),
-        max_llm_error_rate=float(config.get("max_llm_error_rate", 0.05)),
-    )
+    return _config_from_mapping(config)
+
+
+def _failed_rate_gates(
+    rates: Mapping[str, float], config: QualityGateConfig, gates: Sequence[str]
+) -> List[str]:
+    return [
+        gate for gate in gates if rates[RATE_GATES[gate]] > float(getattr(config, gate))
+    ]
 
 
 def evaluate_quality_gates(
-    engine: Engine, run_id: str, config: Optional[QualityGateConfig | Mapping[str, Any]]
+    engine: Engine,
+    run_id: str,
+    config: Optional[QualityGateConfig | Mapping[str, Any]],
+    summary: Optional[Mapping[str, Any]] = None,
 ) -> Dict[str, Any]:
     config = _normalize_config(config)
+    if summary is None:
+        summary = get_run_summary(engine, run_id)
     with engine.connect() as conn:
-        metrics_rows = (
-            conn.execute(
-                text("SELECT * FROM pipeline_run_metrics WHERE run_id = :run_id"),
-                {"run_id": run_id},
-            )
-            .mappings()
-            .all()
-        )
+        # Performance anomalies are informational; only routing rates gate.
         high_severity_count = conn.execute(
             text(
                 """
                 SELECT COUNT(*) FROM anomaly_events
                 WHERE run_id = :run_id AND severity = 'HIGH'
+                  AND metric_name IN :metric_names
                 """
-            ),
-            {"run_id": run_id},
+            ).bindparams(bindparam("metric_names", expanding=True)),
+            {"run_id": run_id, "metric_names": QUALITY_METRICS},
         ).scalar()
 
-    totals: Dict[str, float] = {
-        "total_candidates": 0.0,
-        "gray_zone_sent_count": 0.0,
-        "llm_review_count": 0.0,
-        "llm_call_count": 0.0,
-        "llm_error_count": 0.0,
-    }
-    for row in metrics_rows:
-        totals["total_candidates"] += float(row.get("total_candidates") or 0)
-        totals["gray_zone_sent_count"] += float(row.get("gray_zone_sent_count") or 0)
-        totals["llm_review_count"] += float(row.get("llm_review_count") or 0)
-        totals["llm_call_count"] += float(row.get("llm_call_count") or 0)
-        totals["llm_error_count"] += float(row.get("llm_error_count") or 0)
-
-    total_candidates = totals["total_candidates"] or 0.0
-    llm_call_count = totals["llm_call_count"] or 0.0
-
-    gray_zone_rate = (
-        totals["gray_zone_sent_count"] / total_candidates if total_candidates else 0.0
-    )
-    llm_review_rate = (
-        totals["llm_review_count"] / total_candidates if total_candidates else 0.0
-    )
-    llm_error_rate = (
-        totals["llm_error_count"] / llm_call_count if llm_call_count else 0.0
-    )
+    rates = summary["rates"]
+    gray_zone_rate = rates["gray_zone_rate"]
+    llm_review_rate = rates["llm_review_rate"]
+    llm_error_rate = rates["llm_error_rate"]
 
-    failed_gates = []
-    if gray_zone_rate > config.max_gray_zone_rate:
-        failed_gates.append("max_gray_zone_rate")
-    if llm_review_rate > config.max_llm_review_rate:
-        failed_gates.append("max_llm_review_rate")
-    if llm_error_rate > config.max_llm_error_rate:
-        failed_gates.append("max_llm_error_rate")
+    failed_gates = _failed_rate_gates(rates, config, list(RATE_GATES))
     if config.fail_on_high_severity_anomalies and (high_severity_count or 0) > 0:
         failed_gates.append("high_severity_anomalies")
 
@@ -116,8 +123,8 @@ def evaluate_quality_gates(
         "llm_review_rate": llm_review_rate,
         "llm_error_rate": llm_error_rate,
         "high_severity_anomaly_count": int(high_severity_count or 0),
-        "total_candidates": int(total_candidates),
-        "llm_call_count": int(llm_call_count),
+        "total_candidates": int(summary["totals"]["total_candidates"]),
+        "llm_call_count": int(summary["totals"]["llm_call_count"]),
     }
     return {
         "run_id": run_id,
@@ -125,3 +132,80 @@ def evaluate_quality_gates(
         "failed_gates": failed_gates,
         "gate_values": gate_values,
     }
+
+
+class StageQualityGates:
+    """Evaluates the hard gates after each entity stage from in-memory metrics.
+
+    Each stage is gated on its own rates, so a bad stage is not diluted by
+    the volume of the clean ones before it. Totals still accumulate across
+    stages for the ``ABORTED`` row written by :meth:`partial_result`.
+    """
+
+    def __init__(self, run_id: str, config: QualityGateConfig) -> None:
+        self.run_id = run_id
+        self.config = config
+        self.totals: Dict[str, int] = {column: 0 for column in INTEGER_TOTALS}
+        self.completed_stages: List[str] = []
+        self.failed_stage: Optional[str] = None
+        self.failed_gates: List[str] = []
+
+    @property
+    def tripped(self) -> bool:
+        return self.failed_stage is not None
+
+    @property
+    def skip_llm(self) -> bool:
+        return self.tripped and self.config.on_stage_failure == "skip_llm"
+
+    @property
+    def should_abort(self) -> bool:
+        return self.tripped and self.config.on_stage_failure == "abort"
+
+    def record(self, stage: str, metrics: Mapping[str, Any]) -> List[str]:
+        """Add a stage's routing metrics; returns the hard gates now failing."""
+        for column in self.totals:
+            self.totals[column] += int(metrics.get(column) or 0)
+        self.completed_stages.append(stage)
+        stage_totals = {column: int(metrics.get(column) or 0) for column in self.totals}
+        failed = _failed_rate_gates(
+            summary_rates(stage_totals), self.config, self.config.hard_gates
+        )
+        if failed and not self.tripped:
+            self.failed_stage = stage
+            self.failed_gates = failed
+        return failed
+
+    def stage_gate_values(self) -> Dict[str, Any]:
+        return {
+            "failed_stage": self.failed_stage,
+            "failed_stage_gates": self.failed_gates,
+            "completed_stages": list(self.completed_stages),
+            "on_stage_failure": self.config.on_stage_failure,
+        }
+
+    def partial_result(self) -> Dict[str, Any]:
+        """``quality_gate_results`` row for a run aborted by a hard gate."""
+        rates = summary_rates(self.totals)
+        return {
+            "run_id": self.run_id,
+            "status": "ABORTED",
+            "failed_gates": list(self.failed_gates),
+            "gate_values": {
+                **rates,
+                "total_candidates": self.totals["total_candidates"],
+                "llm_call_count": self.totals["llm_call_count"],
+                **self.stage_gate_values(),
+            },
+        }
+
+
+class QualityGateAbort(RuntimeError):
+    def __init__(self, run_id: str, stage: str, failed_gates: Sequence[str]) -> None:
+        super().__init__(
+            f"Run {run_id} aborted after stage {stage}: "
+            f"failed {', '.join(failed_gates)}"
+        )
+        self.run_id = run_id
+        self.stage = stage
+        self.failed_gates = list(failed_gates)
@@ -5,6 +5,8 @@ from typing import Any, Dict
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from entity_resolution_engine.monitoring.run_summary import get_run_summary
+
 
 def build_quality_report(engine: Engine, run_id: str) -> Dict[str, Any]:
     with engine.connect() as conn:
@@ -24,28 +26,10 @@ def build_quality_report(engine: Engine, run_id: str) -> Dict[str, Any]:
             .mappings()
             .all()
         )
-        review_counts = (
-            conn.execute(
-                text(
-                    """
-                SELECT entity_type, status, COUNT(*) AS count
-                FROM llm_match_reviews
-                WHERE run_id = :run_id
-                GROUP BY entity_type, status
-                """
-                ),
-                {"run_id": run_id},
-            )
-            .mappings()
-            .all()
-        )
 
     metrics_payload = [dict(row) for row in metrics]
     anomalies_payload = [dict(row) for row in anomalies]
-    reviews_by_entity: Dict[str, Dict[str, int]] = {}
-    for row in review_counts:
-        entity = row["entity_type"]
-        reviews_by_entity.setdefault(entity, {})[row["status"]] = row["count"]
+    reviews_by_entity = get_run_summary(engine, run_id)["review_counts_by_entity"]
 
     return {
         "run_id": run_id,
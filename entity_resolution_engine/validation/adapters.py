@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional, Union
 
 import pandas as pd
 
@@ -27,8 +27,23 @@ class ValidationCandidate:
     signals: Dict[str, Any]
 
 
-def _lookup(df: pd.DataFrame, id_field: str) -> Dict[Any, Dict[str, Any]]:
-    return {row[id_field]: row.to_dict() for _, row in df.iterrows()}
+RowLookup = Mapping[Any, Dict[str, Any]]
+Rows = Union[pd.DataFrame, RowLookup]
+
+
+def index_rows(df: pd.DataFrame, id_field: str) -> Dict[Any, Dict[str, Any]]:
+    """Rows of ``df`` keyed by ``id_field``.
+
+    Build this once per frame and hand it to the ``adapt_*`` functions when
+    adapting many matches; passing the frame re-indexes it on every call.
+    """
+    return dict(zip(df[id_field], df.to_dict("records")))
+
+
+def _lookup(rows: Rows, id_field: str) -> RowLookup:
+    if isinstance(rows, pd.DataFrame):
+        return index_rows(rows, id_field)
+    return rows
 
 
 def _conflict_flags(*flags: Optional[str]) -> List[str]:
@@ -39,6 +54,13 @@ def _normalize_country(value: Any) -> str:
     return normalize_country(str(value)) if value is not None else ""
 
 
+def _runner_up_margin(match: Dict[str, Any]) -> Optional[float]:
+    runner_up = match.get("runner_up_confidence")
+    if runner_up is None:
+        return None
+    return float(match["confidence"]) - float(runner_up)
+
+
 def _coerce_int(value: Any) -> Optional[int]:
     if value is None or pd.isna(value):
         return None
@@ -46,7 +68,7 @@ def _coerce_int(value: Any) -> Optional[int]:
 
 
 def adapt_team_match(
-    match: Dict[str, Any], alpha_teams: pd.DataFrame, beta_teams: pd.DataFrame
+    match: Dict[str, Any], alpha_teams: Rows, beta_teams: Rows
 ) -> ValidationCandidate:
     alpha_lookup = _lookup(alpha_teams, "team_id")
     beta_lookup = _lookup(beta_teams, "id")
@@ -72,13 +94,14 @@ def adapt_team_match(
         signals={
             "name_similarity": float(match["confidence"]),
             "country_match": alpha_country == beta_country if alpha_country else None,
+            "runner_up_margin": _runner_up_margin(match),
             "conflict_flags": _conflict_flags(conflict),
         },
     )
 
 
 def adapt_competition_match(
-    match: Dict[str, Any], alpha_comp: pd.DataFrame, beta_comp: pd.DataFrame
+    match: Dict[str, Any], alpha_comp: Rows, beta_comp: Rows
 ) -> ValidationCandidate:
     alpha_lookup = _lookup(alpha_comp, "competition_id")
     beta_lookup = _lookup(beta_comp, "id")
@@ -104,13 +127,14 @@ def adapt_competition_match(
         signals={
             "name_similarity": float(match["confidence"]),
             "country_match": alpha_country == beta_country if alpha_country else None,
+            "runner_up_margin": _runner_up_margin(match),
             "conflict_flags": _conflict_flags(conflict),
         },
     )
 
 
 def adapt_season_match(
-    match: Dict[str, Any], alpha_seasons: pd.DataFrame, beta_seasons: pd.DataFrame
+    match: Dict[str, Any], alpha_seasons: Rows, beta_seasons: Rows
 ) -> ValidationCandidate:
     alpha_lookup = _lookup(alpha_seasons, "season_id")
     beta_lookup = _lookup(beta_seasons, "id")
@@ -151,7 +175,7 @@ def adapt_season_match(
 
 
 def adapt_player_match(
-    match: Dict[str, Any], alpha_players: pd.DataFrame, beta_players: pd.DataFrame
+    match: Dict[str, Any], alpha_players: Rows, beta_players: Rows
 ) -> ValidationCandidate:
     alpha_lookup = _lookup(alpha_players, "player_id")
     beta_lookup = _lookup(beta_players, "id")
@@ -185,13 +209,14 @@ def adapt_player_match(
             "team_similarity": breakdown.get("team_similarity"),
             "birth_year_alpha": alpha_year,
             "birth_year_beta": beta_year,
+            "runner_up_margin": _runner_up_margin(match),
             "conflict_flags": _conflict_flags(conflict),
         },
     )
 
 
 def adapt_match_match(
-    match: Dict[str, Any], alpha_matches: pd.DataFrame, beta_matches: pd.DataFrame
+    match: Dict[str, Any], alpha_matches: Rows, beta_matches: Rows
 ) -> ValidationCandidate:
     alpha_lookup = _lookup(alpha_matches, "match_id")
     beta_lookup = _lookup(beta_matches, "id")
@@ -218,6 +243,7 @@ def adapt_match_match(
         matcher_score=float(match["confidence"]),
         signals={
             "date_delta_days": date_delta,
+            "runner_up_margin": _runner_up_margin(match),
             "conflict_flags": _conflict_flags(conflict),
         },
     )
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
 import yaml
 
@@ -23,6 +23,28 @@ class CircuitBreakerConfig:
     max_invalid_json_rate: float
 
 
+@dataclass(frozen=True)
+class RateLimitConfig:
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    max_concurrency: int = 1
+    min_concurrency: int = 1
+    target_latency_ms: float = 0.0
+    max_retries: int = 2
+    max_retry_after_s: float = 30.0
+
+
+@dataclass(frozen=True)
+class SchedulingConfig:
+    prioritize_gray_zone: bool = True
+    boundary_weight: float = 1.0
+    conflict_weight: float = 1.0
+    runner_up_weight: float = 0.5
+    runner_up_margin_scale: float = 0.1
+    max_calls_per_run: Optional[int] = None
+    redistribute_unused_budget: bool = True
+
+
 @dataclass(frozen=True)
 class LLMValidationConfig:
     enabled: bool
@@ -34,6 +56,8 @@ class LLMValidationConfig:
     max_calls_per_entity_type_per_run: int
     circuit_breaker: CircuitBreakerConfig
     fallback_mode_when_llm_unhealthy: str
+    rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
+    scheduling: SchedulingConfig = field(default_factory=SchedulingConfig)
 
     def threshold_for(self, entity_type: str) -> GrayZoneThreshold:
         return self.gray_zone.get(entity_type, GrayZoneThreshold(low=0.0, high=1.0))
@@ -54,6 +78,33 @@ def get_llm_validation_config(path: Path = CONFIG_PATH) -> LLMValidationConfig:
             circuit_breaker_data.get("max_invalid_json_rate", 0.1)
         ),
     )
+    rate_limit_data = data.get("rate_limit") or {}
+    rate_limit = RateLimitConfig(
+        requests_per_minute=int(rate_limit_data.get("requests_per_minute", 0)),
+        tokens_per_minute=int(rate_limit_data.get("tokens_per_minute", 0)),
+        max_concurrency=int(rate_limit_data.get("max_concurrency", 1)),
+        min_concurrency=int(rate_limit_data.get("min_concurrency", 1)),
+        target_latency_ms=float(rate_limit_data.get("target_latency_ms", 0.0)),
+        max_retries=int(rate_limit_data.get("max_retries", 2)),
+        max_retry_after_s=float(rate_limit_data.get("max_retry_after_s", 30.0)),
+    )
+    scheduling_data = data.get("scheduling") or {}
+    max_calls_per_run = scheduling_data.get("max_calls_per_run")
+    scheduling = SchedulingConfig(
+        prioritize_gray_zone=bool(scheduling_data.get("prioritize_gray_zone", True)),
+        boundary_weight=float(scheduling_data.get("boundary_weight", 1.0)),
+        conflict_weight=float(scheduling_data.get("conflict_weight", 1.0)),
+        runner_up_weight=float(scheduling_data.get("runner_up_weight", 0.5)),
+        runner_up_margin_scale=float(
+            scheduling_data.get("runner_up_margin_scale", 0.1)
+        ),
+        max_calls_per_run=(
+            int(max_calls_per_run) if max_calls_per_run is not None else None
+        ),
+        redistribute_unused_budget=bool(
+            scheduling_data.get("redistribute_unused_budget", True)
+        ),
+    )
     return LLMValidationConfig(
         enabled=bool(data.get("enabled", False)),
         gray_zone=gray_zone,
@@ -68,4 +119,6 @@ def get_llm_validation_config(path: Path = CONFIG_PATH) -> LLMValidationConfig:
         fallback_mode_when_llm_unhealthy=data.get(
             "fallback_mode_when_llm_unhealthy", "auto_approve"
         ),
+        rate_limit=rate_limit,
+        scheduling=scheduling,
     )
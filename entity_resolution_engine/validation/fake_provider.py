@@ -0,0 +1,119 @@
+"""In-process stand-in for a chat-completions LLM provider.
+
+Used by tests and the routing benchmark to exercise ``LLMClient`` without a
+real provider. Plug it in with ``LLMClient(..., transport=FakeLLMTransport())``.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+
+@dataclass(frozen=True)
+class FakeProviderConfig:
+    latency_distribution: str = "fixed"  # fixed | uniform | lognormal
+    latency_ms: float = 5.0
+    latency_jitter_ms: float = 0.0
+    latency_sigma: float = 0.5
+    error_rate: float = 0.0
+    invalid_json_rate: float = 0.0
+    rate_limited_rate: float = 0.0
+    retry_after_s: float = 0.0
+    match_threshold: float = 0.8
+    seed: int = 7
+
+
+class FakeLLMTransport(httpx.BaseTransport):
+    def __init__(self, config: Optional[FakeProviderConfig] = None) -> None:
+        self.config = config or FakeProviderConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.call_count = 0
+        self.error_count = 0
+        self.invalid_json_count = 0
+        self.rate_limited_count = 0
+        self.latencies_ms: List[float] = []
+
+    def _sample_latency_ms(self) -> float:
+        config = self.config
+        with self._lock:
+            if config.latency_distribution == "uniform":
+                value = self._random.uniform(
+                    config.latency_ms - config.latency_jitter_ms,
+                    config.latency_ms + config.latency_jitter_ms,
+                )
+            elif config.latency_distribution == "lognormal":
+                # latency_ms is the median; latency_sigma controls the tail.
+                value = config.latency_ms * self._random.lognormvariate(
+                    0.0, config.latency_sigma
+                )
+            else:
+                value = config.latency_ms
+        return max(value, 0.0)
+
+    def _roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+
+    def _decision(self, request: httpx.Request) -> Dict[str, Any]:
+        body = json.loads(request.content or b"{}")
+        messages = body.get("messages") or []
+        user_prompt = messages[-1]["content"] if messages else "{}"
+        try:
+            payload = json.loads(user_prompt[user_prompt.index("{") :])
+        except ValueError:
+            payload = {}
+        score = float(payload.get("matcher_score") or 0.0)
+        conflicts = (payload.get("signals") or {}).get("conflict_flags") or []
+        if conflicts:
+            decision = "REVIEW"
+        elif score >= self.config.match_threshold:
+            decision = "MATCH"
+        else:
+            decision = "NO_MATCH"
+        return {
+            "decision": decision,
+            "confidence": min(max(score, 0.0), 1.0),
+            "reasons": ["fake provider"],
+            "risk_flags": [],
+        }
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        latency_ms = self._sample_latency_ms()
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+        with self._lock:
+            self.call_count += 1
+            self.latencies_ms.append(latency_ms)
+        if self._roll(self.config.rate_limited_rate):
+            with self._lock:
+                self.rate_limited_count += 1
+            return httpx.Response(
+                429,
+                headers={"Retry-After": str(self.config.retry_after_s)},
+                request=request,
+            )
+        if self._roll(self.config.error_rate):
+            with self._lock:
+                self.error_count += 1
+            return httpx.Response(500, json={"error": "fake"}, request=request)
+        if self._roll(self.config.invalid_json_rate):
+            with self._lock:
+                self.invalid_json_count += 1
+            content = "not-json"
+        else:
+            content = json.dumps(self._decision(request))
+        return httpx.Response(
+            200,
+            json={"choices": [{"message": {"role": "assistant", "content": content}}]},
+            request=request,
+        )
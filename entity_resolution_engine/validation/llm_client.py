@@ -3,14 +3,27 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
 import time
-from typing import Any, Dict, Optional
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, ContextManager, Dict, Optional
 from uuid import uuid4
 
 import httpx
 
+from entity_resolution_engine.validation.config import RateLimitConfig
+from entity_resolution_engine.validation.rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    TokenBucket,
+)
+
 logger = logging.getLogger(__name__)
 
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+CHARS_PER_TOKEN = 4
+
 
 class LLMClient:
     def __init__(
@@ -20,6 +33,8 @@ class LLMClient:
         api_key: str,
         api_url: Optional[str] = None,
         timeout_s: float = 12.0,
+        rate_limit: Optional[RateLimitConfig] = None,
+        transport: Optional[httpx.BaseTransport] = None,
     ) -> None:
         self.provider = provider
         self.model = model
@@ -29,9 +44,72 @@ class LLMClient:
             raise ValueError("LLM API URL is required")
         self.api_url: str = api_url
         self.timeout_s = timeout_s
-        self.last_invalid_json_retry = False
-        self.last_latency_ms: Optional[float] = None
-        self.last_request_id: Optional[str] = None
+        self.transport = transport
+        self.rate_limit = rate_limit or RateLimitConfig()
+        self.request_bucket = TokenBucket(self.rate_limit.requests_per_minute)
+        self.token_bucket = TokenBucket(self.rate_limit.tokens_per_minute)
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            max_limit=self.rate_limit.max_concurrency,
+            min_limit=self.rate_limit.min_concurrency,
+            target_latency_ms=self.rate_limit.target_latency_ms or None,
+        )
+        self.total_throttle_ms = 0.0
+        self._stats_lock = threading.Lock()
+        # Per-call results are thread-local so concurrent routing can read
+        # the outcome of the call it just made.
+        self._local = threading.local()
+
+    @property
+    def last_invalid_json_retry(self) -> bool:
+        return getattr(self._local, "invalid_json_retry", False)
+
+    @last_invalid_json_retry.setter
+    def last_invalid_json_retry(self, value: bool) -> None:
+        self._local.invalid_json_retry = value
+
+    @property
+    def last_latency_ms(self) -> Optional[float]:
+        return getattr(self._local, "latency_ms", None)
+
+    @last_latency_ms.setter
+    def last_latency_ms(self, value: Optional[float]) -> None:
+        self._local.latency_ms = value
+
+    @property
+    def last_request_id(self) -> Optional[str]:
+        return getattr(self._local, "request_id", None)
+
+    @last_request_id.setter
+    def last_request_id(self, value: Optional[str]) -> None:
+        self._local.request_id = value
+
+    @property
+    def last_retry_count(self) -> int:
+        return getattr(self._local, "retry_count", 0)
+
+    @last_retry_count.setter
+    def last_retry_count(self, value: int) -> None:
+        self._local.retry_count = value
+
+    @property
+    def last_usage(self) -> Dict[str, int]:
+        """Prompt/completion tokens and request bytes for the last call."""
+        usage = getattr(self._local, "usage", None)
+        if usage is None:
+            usage = {"prompt_tokens": 0, "completion_tokens": 0, "bytes_sent": 0}
+            self._local.usage = usage
+        return usage
+
+    def last_call_stats(self) -> Dict[str, Any]:
+        return {
+            "latency_ms": self.last_latency_ms,
+            "retry_count": self.last_retry_count,
+            **self.last_usage,
+        }
+
+    @property
+    def effective_concurrency(self) -> Optional[float]:
+        return self.concurrency.effective_concurrency
 
     @staticmethod
     def _resolve_api_url(provider: str, api_url: Optional[str]) -> Optional[str]:
@@ -67,6 +145,8 @@ class LLMClient:
         request_id = str(uuid4())
         self.last_request_id = request_id
         self.last_invalid_json_retry = False
+        self.last_retry_count = 0
+        self._local.usage = None
         response_text = self._send_request(system_prompt, user_prompt, request_id)
         first_latency_ms = self.last_latency_ms or 0.0
         try:
@@ -93,6 +173,38 @@ class LLMClient:
                     f"request_id={request_id}"
                 ) from retry_exc
 
+    def _add_throttle(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        with self._stats_lock:
+            self.total_throttle_ms += seconds * 1000
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or ``None`` when we should give up.
+
+        A provider ``Retry-After`` is honoured as-is; if it asks for longer
+        than ``max_retry_after_s`` we fail the call instead of retrying early.
+        """
+        if attempt >= self.rate_limit.max_retries:
+            return None
+        header = response.headers.get("Retry-After")
+        delay: Optional[float] = None
+        if header:
+            try:
+                delay = float(header)
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(header)
+                    delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    delay = None
+        if delay is None:
+            delay = 0.5 * (2**attempt)
+        delay = max(delay, 0.0)
+        if delay > self.rate_limit.max_retry_after_s:
+            return None
+        return delay
+
     def _send_request(
         self, system_prompt: str, user_prompt: str, request_id: str
     ) -> str:
@@ -105,24 +217,84 @@ class LLMClient:
                 {"role": "user", "content": user_prompt},
             ],
         }
-        start_time = time.monotonic()
+        estimated_tokens = (len(system_prompt) + len(user_prompt)) // CHARS_PER_TOKEN
+        body = json.dumps(payload).encode()
+        headers["Content-Type"] = "application/json"
+        usage = self.last_usage
+        network_ms = 0.0
+        attempt = 0
         try:
-            with httpx.Client(timeout=self.timeout_s) as client:
-                response = client.post(self.api_url, headers=headers, json=payload)
-                response.raise_for_status()
-                data = response.json()
-        except httpx.HTTPError as exc:
-            raise ValueError(
-                f"LLM request failed for provider={self.provider} "
-                f"request_id={request_id}"
-            ) from exc
-        except ValueError as exc:
-            raise ValueError(
-                f"Invalid JSON response from provider={self.provider} "
-                f"request_id={request_id}"
-            ) from exc
+            while True:
+                self._add_throttle(self.request_bucket.acquire())
+                self._add_throttle(self.token_bucket.acquire(estimated_tokens))
+                slot: ContextManager[float] = (
+                    self.concurrency.slot()
+                    if self.rate_limit.max_concurrency > 1
+                    else nullcontext(0.0)
+                )
+                with slot as slot_wait_s:
+                    self._add_throttle(slot_wait_s)
+                    call_start = time.monotonic()
+                    usage["bytes_sent"] += len(body)
+                    try:
+                        with httpx.Client(
+                            timeout=self.timeout_s, transport=self.transport
+                        ) as client:
+                            response = client.post(
+                                self.api_url, headers=headers, content=body
+                            )
+                    except httpx.HTTPError as exc:
+                        self.concurrency.on_overload()
+                        raise ValueError(
+                            f"LLM request failed for provider={self.provider} "
+                            f"request_id={request_id}"
+                        ) from exc
+                    finally:
+                        call_ms = (time.monotonic() - call_start) * 1000
+                        network_ms += call_ms
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    self.concurrency.on_overload()
+                    delay = self._retry_delay(response, attempt)
+                    if delay is None:
+                        outcome = (
+                            "throttled"
+                            if response.status_code == 429
+                            else "unavailable"
+                        )
+                        raise ValueError(
+                            f"LLM request {outcome} for provider={self.provider} "
+                            f"request_id={request_id} "
+                            f"status={response.status_code}"
+                        )
+                    logger.debug(
+                        "LLM request retrying request_id=%s status=%s delay_s=%.2f",
+                        request_id,
+                        response.status_code,
+                        delay,
+                    )
+                    self.request_bucket.pause(delay)
+                    time.sleep(delay)
+                    self._add_throttle(delay)
+                    self.last_retry_count += 1
+                    attempt += 1
+                    continue
+                try:
+                    response.raise_for_status()
+                    data = response.json()
+                except httpx.HTTPError as exc:
+                    raise ValueError(
+                        f"LLM request failed for provider={self.provider} "
+                        f"request_id={request_id}"
+                    ) from exc
+                except ValueError as exc:
+                    raise ValueError(
+                        f"Invalid JSON response from provider={self.provider} "
+                        f"request_id={request_id}"
+                    ) from exc
+                self.concurrency.on_success(call_ms)
+                break
         finally:
-            self.last_latency_ms = (time.monotonic() - start_time) * 1000
+            self.last_latency_ms = network_ms
             logger.debug(
                 "LLM request completed request_id=%s provider=%s latency_ms=%.2f",
                 request_id,
@@ -130,6 +302,15 @@ class LLMClient:
                 self.last_latency_ms,
             )
         content = self._extract_content(data)
+        provider_usage = data.get("usage") if isinstance(data, dict) else None
+        if isinstance(provider_usage, dict):
+            usage["prompt_tokens"] += int(provider_usage.get("prompt_tokens") or 0)
+            usage["completion_tokens"] += int(
+                provider_usage.get("completion_tokens") or 0
+            )
+        else:
+            usage["prompt_tokens"] += estimated_tokens
+            usage["completion_tokens"] += len(content or "") // CHARS_PER_TOKEN
         if content is None:
             keys = sorted(list(data.keys())) if isinstance(data, dict) else []
             raise ValueError(
@@ -48,7 +48,10 @@ def validate_pair(
         )
 
     llm_client = llm_client or LLMClient(
-        provider=provider, model=model, api_key=api_key
+        provider=provider,
+        model=model,
+        api_key=api_key,
+        rate_limit=config.rate_limit,
     )
     payload = {
         "entity_type": entity_type,
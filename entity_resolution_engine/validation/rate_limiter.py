@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple
+
+
+class TokenBucket:
+    """Refilling bucket used for requests-per-minute and tokens-per-minute limits.
+
+    A ``rate_per_minute`` of zero or less disables the bucket.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate_per_s = max(float(rate_per_minute), 0.0) / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate_per_s > 0 and self.capacity > 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(now - self._updated_at, 0.0)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_s)
+        self._updated_at = now
+
+    def pause(self, seconds: float) -> None:
+        """Block every caller for ``seconds`` (used for provider Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take ``amount`` tokens, sleeping until available. Returns seconds waited."""
+        if not self.enabled:
+            return 0.0
+        amount = min(max(float(amount), 0.0), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= amount:
+                        self._tokens -= amount
+                        return waited
+                    delay = (amount - self._tokens) / self.rate_per_s
+            self._sleep(delay)
+            waited += delay
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on in-flight LLM requests.
+
+    The limit grows by one slot per ``limit`` healthy completions (additive
+    increase) and halves on throttling, server errors or latency above target
+    (multiplicative decrease).
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: Optional[int] = None,
+        target_latency_ms: Optional[float] = None,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        self.max_limit = max(int(max_limit), 1)
+        self.min_limit = min(max(int(min_limit), 1), self.max_limit)
+        start = initial_limit if initial_limit is not None else self.min_limit
+        self._limit = float(min(max(start, self.min_limit), self.max_limit))
+        self.target_latency_ms = target_latency_ms
+        self.decrease_factor = decrease_factor
+        self._in_flight = 0
+        self._acquired = 0
+        self._in_flight_total = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def effective_concurrency(self) -> Optional[float]:
+        """Mean number of requests in flight (including itself) when a slot was taken."""
+        return self.effective_concurrency_since((0, 0))
+
+    def counters(self) -> Tuple[int, int]:
+        """Slots taken so far and the sum of their in-flight counts."""
+        with self._condition:
+            return self._acquired, self._in_flight_total
+
+    def effective_concurrency_since(self, counters: Tuple[int, int]) -> Optional[float]:
+        """:attr:`effective_concurrency` of the slots taken after ``counters``."""
+        acquired, in_flight_total = self.counters()
+        acquired -= counters[0]
+        if not acquired:
+            return None
+        return (in_flight_total - counters[1]) / acquired
+
+    @contextmanager
+    def slot(self) -> Iterator[float]:
+        """Hold one in-flight slot; yields seconds spent waiting for it."""
+        start = time.monotonic()
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+            self._acquired += 1
+            self._in_flight_total += self._in_flight
+        try:
+            yield time.monotonic() - start
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self, latency_ms: float) -> None:
+        if self.target_latency_ms and latency_ms > self.target_latency_ms:
+            self.on_overload()
+            return
+        with self._condition:
+            self._limit = min(self._limit + 1.0 / self._limit, float(self.max_limit))
+            self._condition.notify_all()
+
+    def on_overload(self) -> None:
+        with self._condition:
+            self._limit = max(self._limit * self.decrease_factor, float(self.min_limit))
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Engine
+
+REVIEW_DECISION_STATUSES = ("APPROVED", "REJECTED")
+# Two binds per pair; stays under SQLite's 999-parameter default.
+LOOKUP_CHUNK_PAIRS = 400
+
+_LOOKUP_SQL = """
+    SELECT left_id, right_id, status
+    FROM llm_match_reviews
+    WHERE entity_type = :entity_type
+      AND {pair_filter}
+      AND status IN :statuses
+    ORDER BY updated_at DESC, id DESC
+"""
+
+
+class ReviewDecisionCache:
+    """Prior human decisions from ``llm_match_reviews``, keyed by id pair."""
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+
+    def lookup(
+        self, entity_type: str, pairs: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], str]:
+        wanted = sorted({(str(left), str(right)) for left, right in pairs})
+        if not wanted:
+            return {}
+        decisions: Dict[Tuple[str, str], str] = {}
+        with self.engine.connect() as conn:
+            if self.engine.dialect.name == "postgresql":
+                # Two array binds, whatever the number of pairs.
+                pair_filter = (
+                    "(left_id, right_id) IN (SELECT * FROM unnest("
+                    "CAST(:left_ids AS TEXT[]), CAST(:right_ids AS TEXT[])))"
+                )
+                batches: List[Dict[str, object]] = [
+                    {
+                        "left_ids": [left for left, _ in wanted],
+                        "right_ids": [right for _, right in wanted],
+                    }
+                ]
+                query = text(_LOOKUP_SQL.format(pair_filter=pair_filter))
+            else:
+                query = text(
+                    _LOOKUP_SQL.format(pair_filter="(left_id, right_id) IN :pairs")
+                ).bindparams(bindparam("pairs", expanding=True))
+                batches = [
+                    {"pairs": wanted[start : start + LOOKUP_CHUNK_PAIRS]}
+                    for start in range(0, len(wanted), LOOKUP_CHUNK_PAIRS)
+                ]
+            query = query.bindparams(bindparam("statuses", expanding=True))
+            for params in batches:
+                rows = conn.execute(
+                    query,
+                    {
+                        "entity_type": entity_type,
+                        "statuses": list(REVIEW_DECISION_STATUSES),
+                        **params,
+                    },
+                ).mappings()
+                for row in rows:
+                    key = (str(row["left_id"]), str(row["right_id"]))
+                    # Rows are newest first, so the latest reviewer decision wins.
+                    decisions.setdefault(key, row["status"])
+        return decisions
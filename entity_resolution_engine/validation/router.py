@@ -3,12 +3,14 @@ from __future__ import annotations
 import logging
 import os
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Callable, Deque, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from entity_resolution_engine.monitoring.stats import percentile
 from entity_resolution_engine.validation.adapters import (
     ValidationCandidate,
     adapt_competition_match,
@@ -16,6 +18,7 @@ from entity_resolution_engine.validation.adapters import (
     adapt_player_match,
     adapt_season_match,
     adapt_team_match,
+    index_rows,
 )
 from entity_resolution_engine.validation.config import (
     LLMValidationConfig,
@@ -23,6 +26,11 @@ from entity_resolution_engine.validation.config import (
 )
 from entity_resolution_engine.validation.llm_client import LLMClient
 from entity_resolution_engine.validation.llm_validator import validate_pair
+from entity_resolution_engine.validation.review_cache import ReviewDecisionCache
+from entity_resolution_engine.validation.scheduler import (
+    RunCallBudget,
+    gray_zone_priority,
+)
 from entity_resolution_engine.validation.schemas import ValidationResult
 
 logger = logging.getLogger(__name__)
@@ -100,9 +108,17 @@ def _route_matches(
     adapter: Callable[[Dict[str, Any]], ValidationCandidate],
     config: Optional[LLMValidationConfig],
     run_id: str,
+    llm_client: Optional[LLMClient] = None,
+    budget: Optional[RunCallBudget] = None,
+    review_cache: Optional[ReviewDecisionCache] = None,
 ) -> RoutingOutcome:
     config = config or get_llm_validation_config()
     threshold = config.threshold_for(entity_type)
+    max_calls = (
+        budget.allocate()
+        if budget is not None
+        else config.max_calls_per_entity_type_per_run
+    )
     approved: List[Dict[str, Any]] = []
     rejected: List[Dict[str, Any]] = []
     review_items: List[Dict[str, Any]] = []
@@ -115,32 +131,52 @@ def _route_matches(
     llm_error_count = 0
     llm_invalid_json_retry_count = 0
     llm_total_latency_ms = 0.0
+    llm_latencies_ms: List[float] = []
+    llm_retry_count = 0
+    llm_prompt_tokens = 0
+    llm_completion_tokens = 0
+    llm_bytes_sent = 0
     llm_disabled_reason: Optional[str] = None
     fallback_mode = config.fallback_mode_when_llm_unhealthy
     circuit_breaker = config.circuit_breaker
     circuit_window: Deque[Dict[str, bool]] = deque(maxlen=circuit_breaker.window)
 
-    llm_client: Optional[LLMClient] = None
     llm_available = _llm_validation_available(config)
-    if llm_available:
+    if not llm_available:
+        llm_client = None
+        llm_disabled_reason = "llm_unavailable"
+    elif llm_client is None:
         llm_client = LLMClient(
             provider=os.getenv(config.provider_env, ""),
             model=os.getenv(config.model_env, ""),
             api_key=os.getenv(config.api_key_env, ""),
+            rate_limit=config.rate_limit,
         )
-    else:
-        llm_disabled_reason = "llm_unavailable"
-
-    def _record_llm_outcome(result: ValidationResult) -> None:
+    # An injected client carries totals from earlier stages; the metrics
+    # below report only what this stage added.
+    throttle_ms_start = llm_client.total_throttle_ms if llm_client else 0.0
+    concurrency_start = llm_client.concurrency.counters() if llm_client else (0, 0)
+
+    def _record_llm_outcome(
+        result: ValidationResult, call_stats: Dict[str, Any]
+    ) -> None:
         nonlocal llm_error_count, llm_invalid_json_retry_count, llm_total_latency_ms
+        nonlocal llm_retry_count, llm_prompt_tokens, llm_completion_tokens
+        nonlocal llm_bytes_sent
         error_flag = "llm_error" in result.risk_flags
         invalid_retry = "llm_invalid_json_retry" in result.risk_flags
         if error_flag:
             llm_error_count += 1
         if invalid_retry:
             llm_invalid_json_retry_count += 1
-        if llm_client and llm_client.last_latency_ms is not None:
-            llm_total_latency_ms += llm_client.last_latency_ms
+        latency_ms = call_stats.get("latency_ms")
+        if latency_ms is not None:
+            llm_total_latency_ms += latency_ms
+            llm_latencies_ms.append(latency_ms)
+        llm_retry_count += int(call_stats.get("retry_count") or 0)
+        llm_prompt_tokens += int(call_stats.get("prompt_tokens") or 0)
+        llm_completion_tokens += int(call_stats.get("completion_tokens") or 0)
+        llm_bytes_sent += int(call_stats.get("bytes_sent") or 0)
         circuit_window.append(
             {"success": not error_flag, "invalid_json_retry": invalid_retry}
         )
@@ -159,43 +195,21 @@ def _route_matches(
             or invalid_rate >= circuit_breaker.max_invalid_json_rate
         )
 
-    for match in matches:
-        candidate = adapter(match)
-        score = candidate.matcher_score
-        if score < threshold.low:
-            rejected.append(match)
-            continue
-        if score >= threshold.high and not candidate.signals.get("conflict_flags"):
+    def _apply_fallback(match: Dict[str, Any], candidate: ValidationCandidate) -> None:
+        nonlocal llm_review
+        fallback_result = _fallback_decision(fallback_mode)
+        decision = _decision_from_result(fallback_result)
+        if decision == "approved":
             approved.append(match)
-            continue
-
-        if llm_disabled_reason:
-            fallback_result = _fallback_decision(fallback_mode)
-            decision = _decision_from_result(fallback_result)
-            if decision == "approved":
-                approved.append(match)
-            else:
-                llm_review += 1
-                review_items.append(
-                    _build_review_item(run_id, entity_type, candidate, fallback_result)
-                )
-            continue
-
-        if llm_call_count >= config.max_calls_per_entity_type_per_run:
-            llm_disabled_reason = "max_calls_exceeded"
-            fallback_result = _fallback_decision(fallback_mode)
-            decision = _decision_from_result(fallback_result)
-            if decision == "approved":
-                approved.append(match)
-            else:
-                llm_review += 1
-                review_items.append(
-                    _build_review_item(run_id, entity_type, candidate, fallback_result)
-                )
-            continue
+        else:
+            llm_review += 1
+            review_items.append(
+                _build_review_item(run_id, entity_type, candidate, fallback_result)
+            )
 
-        gray_zone_sent += 1
-        llm_call_count += 1
+    def _validate(
+        candidate: ValidationCandidate,
+    ) -> Tuple[ValidationResult, Dict[str, Any]]:
         result = validate_pair(
             entity_type,
             candidate.left,
@@ -205,21 +219,101 @@ def _route_matches(
             config=config,
             llm_client=llm_client,
         )
-        _record_llm_outcome(result)
-        if _circuit_open():
-            llm_disabled_reason = "circuit_breaker_open"
-        decision = _decision_from_result(result)
-        if decision == "approved":
+        return result, llm_client.last_call_stats() if llm_client else {}
+
+    candidates = [(match, adapter(match)) for match in matches]
+    # Reviewer decisions from earlier runs are authoritative; one bulk query
+    # resolves them before any LLM call is made.
+    review_decisions = (
+        review_cache.lookup(
+            entity_type,
+            [(candidate.left_id, candidate.right_id) for _, candidate in candidates],
+        )
+        if review_cache is not None
+        else {}
+    )
+    review_approved = 0
+    review_rejected = 0
+    gray_zone_items: List[Tuple[Dict[str, Any], ValidationCandidate]] = []
+    for match, candidate in candidates:
+        prior_decision = review_decisions.get((candidate.left_id, candidate.right_id))
+        if prior_decision == "APPROVED":
             approved.append(match)
-            llm_match += 1
-        elif decision == "rejected":
+            review_approved += 1
+            continue
+        if prior_decision == "REJECTED":
             rejected.append(match)
-            llm_no_match += 1
-        else:
-            llm_review += 1
-            review_items.append(
-                _build_review_item(run_id, entity_type, candidate, result)
+            review_rejected += 1
+            continue
+        score = candidate.matcher_score
+        if score < threshold.low:
+            rejected.append(match)
+            continue
+        if score >= threshold.high and not candidate.signals.get("conflict_flags"):
+            approved.append(match)
+            continue
+        gray_zone_items.append((match, candidate))
+
+    if config.scheduling.prioritize_gray_zone:
+        # Spend the call budget on the pairs where an LLM decision is worth
+        # most; the stable sort keeps arrival order among equal priorities.
+        gray_zone_items.sort(
+            key=lambda item: gray_zone_priority(item[1], threshold, config.scheduling),
+            reverse=True,
+        )
+    gray_zone = deque(gray_zone_items)
+
+    max_concurrency = max(config.rate_limit.max_concurrency, 1)
+    executor = (
+        ThreadPoolExecutor(max_workers=max_concurrency)
+        if llm_client is not None and max_concurrency > 1
+        else None
+    )
+    try:
+        while gray_zone:
+            if llm_disabled_reason:
+                _apply_fallback(*gray_zone.popleft())
+                continue
+            remaining_calls = max_calls - llm_call_count
+            if remaining_calls <= 0:
+                llm_disabled_reason = "max_calls_exceeded"
+                continue
+            # One call at a time unless concurrency is enabled; batches follow
+            # the client's adaptive limit so the circuit breaker still sees
+            # outcomes between waves.
+            batch_size = min(
+                remaining_calls,
+                len(gray_zone),
+                llm_client.concurrency.limit if executor and llm_client else 1,
             )
+            batch = [gray_zone.popleft() for _ in range(batch_size)]
+            if executor is not None and len(batch) > 1:
+                results = list(executor.map(_validate, [c for _, c in batch]))
+            else:
+                results = [_validate(candidate) for _, candidate in batch]
+            for (match, candidate), (result, call_stats) in zip(batch, results):
+                gray_zone_sent += 1
+                llm_call_count += 1
+                _record_llm_outcome(result, call_stats)
+                decision = _decision_from_result(result)
+                if decision == "approved":
+                    approved.append(match)
+                    llm_match += 1
+                elif decision == "rejected":
+                    rejected.append(match)
+                    llm_no_match += 1
+                else:
+                    llm_review += 1
+                    review_items.append(
+                        _build_review_item(run_id, entity_type, candidate, result)
+                    )
+            if _circuit_open():
+                llm_disabled_reason = "circuit_breaker_open"
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if budget is not None:
+            budget.record(max_calls, llm_call_count)
 
     llm_avg_latency_ms = (
         llm_total_latency_ms / llm_call_count if llm_call_count else None
@@ -230,16 +324,34 @@ def _route_matches(
         "started_at": None,
         "finished_at": None,
         "total_candidates": len(matches),
-        "auto_match_count": len(approved) - llm_match,
-        "auto_reject_count": len(rejected) - llm_no_match,
+        "auto_match_count": len(approved) - llm_match - review_approved,
+        "auto_reject_count": len(rejected) - llm_no_match - review_rejected,
+        "review_cache_resolved_count": review_approved + review_rejected,
         "gray_zone_sent_count": gray_zone_sent,
         "llm_match_count": llm_match,
         "llm_no_match_count": llm_no_match,
         "llm_review_count": llm_review,
         "llm_call_count": llm_call_count,
+        "llm_call_budget": max_calls,
         "llm_error_count": llm_error_count,
         "llm_invalid_json_retry_count": llm_invalid_json_retry_count,
         "llm_avg_latency_ms": llm_avg_latency_ms,
+        "llm_latency_p50_ms": percentile(llm_latencies_ms, 50),
+        "llm_latency_p95_ms": percentile(llm_latencies_ms, 95),
+        "llm_latency_p99_ms": percentile(llm_latencies_ms, 99),
+        "llm_latency_max_ms": max(llm_latencies_ms) if llm_latencies_ms else None,
+        "llm_retry_count": llm_retry_count,
+        "llm_prompt_tokens": llm_prompt_tokens,
+        "llm_completion_tokens": llm_completion_tokens,
+        "llm_bytes_sent": llm_bytes_sent,
+        "llm_throttle_ms": (
+            llm_client.total_throttle_ms - throttle_ms_start if llm_client else 0.0
+        ),
+        "llm_effective_concurrency": (
+            llm_client.concurrency.effective_concurrency_since(concurrency_start)
+            if llm_client
+            else None
+        ),
         "llm_fallback_mode": fallback_mode,
         "llm_disabled_reason": llm_disabled_reason,
     }
@@ -262,13 +374,21 @@ def route_team_matches(
     beta_teams: pd.DataFrame,
     run_id: str,
     config: Optional[LLMValidationConfig] = None,
+    llm_client: Optional[LLMClient] = None,
+    budget: Optional[RunCallBudget] = None,
+    review_cache: Optional[ReviewDecisionCache] = None,
 ) -> RoutingOutcome:
+    alpha_rows = index_rows(alpha_teams, "team_id")
+    beta_rows = index_rows(beta_teams, "id")
     return _route_matches(
         "team",
         matches,
-        lambda match: adapt_team_match(match, alpha_teams, beta_teams),
+        lambda match: adapt_team_match(match, alpha_rows, beta_rows),
         config,
         run_id,
+        llm_client,
+        budget,
+        review_cache,
     )
 
 
@@ -278,13 +398,21 @@ def route_competition_matches(
     beta_comp: pd.DataFrame,
     run_id: str,
     config: Optional[LLMValidationConfig] = None,
+    llm_client: Optional[LLMClient] = None,
+    budget: Optional[RunCallBudget] = None,
+    review_cache: Optional[ReviewDecisionCache] = None,
 ) -> RoutingOutcome:
+    alpha_rows = index_rows(alpha_comp, "competition_id")
+    beta_rows = index_rows(beta_comp, "id")
     return _route_matches(
         "competition",
         matches,
-        lambda match: adapt_competition_match(match, alpha_comp, beta_comp),
+        lambda match: adapt_competition_match(match, alpha_rows, beta_rows),
         config,
         run_id,
+        llm_client,
+        budget,
+        review_cache,
     )
 
 
@@ -294,13 +422,21 @@ def route_season_matches(
     beta_seasons: pd.DataFrame,
     run_id: str,
     config: Optional[LLMValidationConfig] = None,
+    llm_client: Optional[LLMClient] = None,
+    budget: Optional[RunCallBudget] = None,
+    review_cache: Optional[ReviewDecisionCache] = None,
 ) -> RoutingOutcome:
+    alpha_rows = index_rows(alpha_seasons, "season_id")
+    beta_rows = index_rows(beta_seasons, "id")
     return _route_matches(
         "season",
         matches,
-        lambda match: adapt_season_match(match, alpha_seasons, beta_seasons),
+        lambda match: adapt_season_match(match, alpha_rows, beta_rows),
         config,
         run_id,
+        llm_client,
+        budget,
+        review_cache,
     )
 
 
@@ -310,13 +446,21 @@ def route_player_matches(
     beta_players: pd.DataFrame,
     run_id: str,
     config: Optional[LLMValidationConfig] = None,
+    llm_client: Optional[LLMClient] = None,
+    budget: Optional[RunCallBudget] = None,
+    review_cache: Optional[ReviewDecisionCache] = None,
 ) -> RoutingOutcome:
+    alpha_rows = index_rows(alpha_players, "player_id")
+    beta_rows = index_rows(beta_players, "id")
     return _route_matches(
         "player",
         matches,
-        lambda match: adapt_player_match(match, alpha_players, beta_players),
+        lambda match: adapt_player_match(match, alpha_rows, beta_rows),
         config,
         run_id,
+        llm_client,
+        budget,
+        review_cache,
     )
 
 
@@ -326,11 +470,19 @@ def route_match_matches(
     beta_matches: pd.DataFrame,
     run_id: str,
     config: Optional[LLMValidationConfig] = None,
+    llm_client: Optional[LLMClient] = None,
+    budget: Optional[RunCallBudget] = None,
+    review_cache: Optional[ReviewDecisionCache] = None,
 ) -> RoutingOutcome:
+    alpha_rows = index_rows(alpha_matches, "match_id")
+    beta_rows = index_rows(beta_matches, "id")
     return _route_matches(
         "match",
         matches,
-        lambda match: adapt_match_match(match, alpha_matches, beta_matches),
+        lambda match: adapt_match_match(match, alpha_rows, beta_rows),
         config,
         run_id,
+        llm_client,
+        budget,
+        review_cache,
     )
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from entity_resolution_engine.validation.adapters import ValidationCandidate
+from entity_resolution_engine.validation.config import (
+    GrayZoneThreshold,
+    LLMValidationConfig,
+    SchedulingConfig,
+)
+
+
+def gray_zone_priority(
+    candidate: ValidationCandidate,
+    threshold: GrayZoneThreshold,
+    scheduling: SchedulingConfig,
+) -> float:
+    """Expected value of sending ``candidate`` to the LLM; higher goes first.
+
+    Combines how ambiguous the score is (1.0 at the middle of the gray zone,
+    0.0 at its edges), whether the adapter raised conflict flags, and how
+    narrowly the best candidate beat the runner-up.
+    """
+    half_width = (threshold.high - threshold.low) / 2
+    midpoint = threshold.low + half_width
+    if half_width > 0:
+        distance = abs(candidate.matcher_score - midpoint) / half_width
+        boundary = max(1.0 - distance, 0.0)
+    else:
+        boundary = 1.0
+    conflict = 1.0 if candidate.signals.get("conflict_flags") else 0.0
+    runner_up = 0.0
+    margin = candidate.signals.get("runner_up_margin")
+    if margin is not None and scheduling.runner_up_margin_scale > 0:
+        runner_up = max(1.0 - float(margin) / scheduling.runner_up_margin_scale, 0.0)
+    return (
+        scheduling.boundary_weight * boundary
+        + scheduling.conflict_weight * conflict
+        + scheduling.runner_up_weight * runner_up
+    )
+
+
+class RunCallBudget:
+    """Run-level LLM call allocator shared by the entity stages.
+
+    Each stage is offered the per-entity cap plus whatever earlier stages
+    left unused, bounded by the optional ``max_calls_per_run`` total.
+    """
+
+    def __init__(
+        self,
+        per_stage_calls: int,
+        max_calls_per_run: Optional[int] = None,
+        redistribute_unused: bool = True,
+    ) -> None:
+        self.per_stage_calls = per_stage_calls
+        self.max_calls_per_run = max_calls_per_run
+        self.redistribute_unused = redistribute_unused
+        self.spent = 0
+        self.carryover = 0
+
+    @classmethod
+    def from_config(cls, config: LLMValidationConfig) -> "RunCallBudget":
+        return cls(
+            per_stage_calls=config.max_calls_per_entity_type_per_run,
+            max_calls_per_run=config.scheduling.max_calls_per_run,
+            redistribute_unused=config.scheduling.redistribute_unused_budget,
+        )
+
+    def allocate(self) -> int:
+        allowance = self.per_stage_calls
+        if self.redistribute_unused:
+            allowance += self.carryover
+        if self.max_calls_per_run is not None:
+            allowance = min(allowance, self.max_calls_per_run - self.spent)
+        return max(allowance, 0)
+
+    def record(self, allocated: int, used: int) -> None:
+        self.spent += used
+        self.carryover = max(allocated - used, 0)
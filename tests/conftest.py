@@ -0,0 +1,21 @@
+import pytest
+
+import entity_resolution_engine.api.main as main
+from entity_resolution_engine.api.cache import ResponseCache
+from entity_resolution_engine.lineage.snapshot import LineageSnapshotStore
+
+
+@pytest.fixture(autouse=True)
+def fresh_response_cache(monkeypatch):
+    """Keep cached API responses from leaking between tests."""
+    cache = ResponseCache()
+    monkeypatch.setattr(main, "response_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def no_lineage_snapshot(monkeypatch, tmp_path):
+    """Lookups go to the database unless a test publishes a snapshot."""
+    store = LineageSnapshotStore(tmp_path / "lineage.snap", check_interval_s=0)
+    monkeypatch.setattr(main, "lineage_snapshots", store)
+    return store
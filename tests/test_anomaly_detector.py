@@ -0,0 +1,256 @@
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from entity_resolution_engine.monitoring.anomaly_detector import (
+    detect_all_anomalies,
+    detect_anomalies,
+)
+from entity_resolution_engine.qa.quality_gates import (
+    evaluate_quality_gates,
+    get_quality_gate_config,
+)
+
+ROUTING_COLUMNS = (
+    "run_id, entity_type, finished_at, total_candidates, auto_match_count, "
+    "auto_reject_count, gray_zone_sent_count, llm_review_count"
+)
+
+
+def _setup_engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE pipeline_run_metrics (
+                    run_id TEXT,
+                    entity_type TEXT,
+                    finished_at TIMESTAMP,
+                    total_candidates INTEGER,
+                    auto_match_count INTEGER,
+                    auto_reject_count INTEGER,
+                    gray_zone_sent_count INTEGER,
+                    llm_review_count INTEGER,
+                    stage_wall_seconds NUMERIC,
+                    stage_cpu_seconds NUMERIC,
+                    peak_rss_mb NUMERIC,
+                    candidate_pairs BIGINT,
+                    pruned_pairs BIGINT,
+                    normalizer_calls BIGINT,
+                    rows_written BIGINT
+                )
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                CREATE TABLE anomaly_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT,
+                    entity_type TEXT,
+                    metric_name TEXT,
+                    current_value NUMERIC,
+                    baseline_value NUMERIC,
+                    z_score NUMERIC,
+                    severity TEXT
+                )
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                CREATE TABLE metric_baselines (
+                    entity_type TEXT NOT NULL,
+                    metric_name TEXT NOT NULL,
+                    sample_count INTEGER NOT NULL,
+                    mean DOUBLE PRECISION,
+                    m2 DOUBLE PRECISION,
+                    last_run_id TEXT,
+                    last_finished_at TIMESTAMP,
+                    updated_at TIMESTAMP,
+                    PRIMARY KEY (entity_type, metric_name)
+                )
+                """
+            )
+        )
+        insert = text(
+            f"""
+            INSERT INTO pipeline_run_metrics ({ROUTING_COLUMNS}) VALUES
+            (:run_id, :entity_type, :finished_at, 100, :auto_match, 10, :gray, 0)
+            """
+        )
+        for day, (auto_match, gray) in enumerate([(80, 10), (82, 9), (78, 11)]):
+            for entity_type in ("team", "player"):
+                conn.execute(
+                    insert,
+                    {
+                        "run_id": f"run-{day}",
+                        "entity_type": entity_type,
+                        "finished_at": f"2024-01-0{day + 1}",
+                        "auto_match": auto_match,
+                        "gray": gray,
+                    },
+                )
+        # Only players drift in the current run; seasons have no baseline.
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO pipeline_run_metrics ({ROUTING_COLUMNS}) VALUES
+                ('run-now', 'team', '2024-02-01', 100, 80, 10, 10, 0),
+                ('run-now', 'player', '2024-02-01', 100, 20, 10, 70, 0),
+                ('run-now', 'season', '2024-02-01', 0, 0, 0, 0, 0)
+                """
+            )
+        )
+    return engine
+
+
+def _baselines(engine):
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT * FROM metric_baselines")).mappings()
+        return {(r["entity_type"], r["metric_name"]): dict(r) for r in rows}
+
+
+def test_single_pass_detection_against_incremental_baselines():
+    engine = _setup_engine()
+    for day in range(3):
+        detect_all_anomalies(engine, f"run-{day}")
+    # Simulate UESWriter.reset(): run history is gone, baselines are not.
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM pipeline_run_metrics WHERE run_id != 'run-now'"))
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    anomalies = detect_all_anomalies(engine, "run-now")
+
+    def count(prefix):
+        return sum(" ".join(s.split()).startswith(prefix) for s in statements)
+
+    assert count("SELECT entity_type, total_candidates") == 1
+    assert count("SELECT entity_type, metric_name") == 1
+    assert count("INSERT INTO anomaly_events") == 1
+    assert count("INSERT INTO metric_baselines") == 1
+    assert {(a["entity_type"], a["metric_name"]) for a in anomalies} == {
+        ("player", "gray_zone_rate"),
+        ("player", "auto_match_rate"),
+    }
+    player_gray = next(a for a in anomalies if a["metric_name"] == "gray_zone_rate")
+    assert player_gray["current_value"] == pytest.approx(0.7)
+    assert player_gray["baseline_value"] == pytest.approx(0.1)
+    assert player_gray["z_score"] == pytest.approx(60.0)
+    assert player_gray["severity"] == "HIGH"
+    with engine.connect() as conn:
+        assert (
+            conn.execute(
+                text("SELECT COUNT(*) FROM anomaly_events WHERE run_id = 'run-now'")
+            ).scalar()
+            == 2
+        )
+
+    baselines = _baselines(engine)
+    assert baselines[("player", "gray_zone_rate")]["sample_count"] == 4
+    assert baselines[("season", "gray_zone_rate")]["sample_count"] == 1
+    # Re-detecting the same run does not fold it into the baseline twice.
+    redetected = detect_anomalies(engine, "run-now", "player")
+    assert [pytest.approx(a) for a in anomalies] == redetected
+    for key, row in _baselines(engine).items():
+        assert row["sample_count"] == baselines[key]["sample_count"]
+        assert row["mean"] == pytest.approx(baselines[key]["mean"])
+        assert row["m2"] == pytest.approx(baselines[key]["m2"], abs=1e-12)
+    assert detect_anomalies(engine, "run-now", "team") == []
+    assert detect_anomalies(engine, "run-now", "season") == []
+
+
+def test_redetecting_an_older_run_leaves_baselines_alone():
+    engine = _setup_engine()
+    for run_id in ("run-0", "run-1", "run-2", "run-now"):
+        detect_all_anomalies(engine, run_id)
+    baselines = _baselines(engine)
+
+    with pytest.warns(DeprecationWarning):
+        detect_anomalies(engine, "run-1", "player", 8)
+
+    assert _baselines(engine) == baselines
+
+
+def test_older_run_stays_out_of_baselines_after_a_reset():
+    engine = _setup_engine()
+    for run_id in ("run-0", "run-1", "run-2", "run-now"):
+        detect_all_anomalies(engine, run_id)
+    baselines = _baselines(engine)
+    # reset() drops the newest folded run's metrics, but not the baselines.
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM pipeline_run_metrics WHERE run_id = 'run-now'"))
+
+    detect_all_anomalies(engine, "run-1")
+
+    assert _baselines(engine) == baselines
+
+
+def test_stage_telemetry_regressions_are_flagged():
+    engine = _setup_engine()
+    insert = text(
+        """
+        INSERT INTO pipeline_run_metrics
+        (run_id, entity_type, total_candidates, gray_zone_sent_count,
+         stage_wall_seconds, peak_rss_mb, candidate_pairs)
+        VALUES (:run_id, 'match', 100, 10, :wall, 120, 2500)
+        """
+    )
+    for run_id, wall in (("perf-0", 1.0), ("perf-1", 1.1), ("perf-2", 0.9)):
+        with engine.begin() as conn:
+            conn.execute(insert, {"run_id": run_id, "wall": wall})
+        detect_all_anomalies(engine, run_id)
+    with engine.begin() as conn:
+        conn.execute(insert, {"run_id": "perf-now", "wall": 4.0})
+
+    anomalies = detect_all_anomalies(engine, "perf-now")
+
+    assert [(a["metric_name"], a["severity"]) for a in anomalies] == [
+        ("stage_wall_seconds", "HIGH")
+    ]
+    baselines = _baselines(engine)
+    assert baselines[("match", "peak_rss_mb")]["sample_count"] == 4
+    # Metrics the rows never reported get no baseline at all.
+    assert ("match", "stage_cpu_seconds") not in baselines
+
+
+def test_faster_runs_are_not_anomalies_and_perf_never_fails_the_gate():
+    engine = _setup_engine()
+    insert = text(
+        """
+        INSERT INTO pipeline_run_metrics
+        (run_id, entity_type, total_candidates, gray_zone_sent_count,
+         stage_wall_seconds)
+        VALUES (:run_id, 'match', 100, 10, :wall)
+        """
+    )
+    for run_id, wall in (("perf-0", 10.0), ("perf-1", 10.1), ("perf-2", 9.9)):
+        with engine.begin() as conn:
+            conn.execute(insert, {"run_id": run_id, "wall": wall})
+        detect_all_anomalies(engine, run_id)
+    summary = {
+        "rates": {"gray_zone_rate": 0.1, "llm_review_rate": 0.0, "llm_error_rate": 0},
+        "totals": {"total_candidates": 100, "llm_call_count": 0},
+    }
+    config = get_quality_gate_config()
+
+    for run_id, wall in (("perf-fast", 5.0), ("perf-slow", 20.0)):
+        with engine.begin() as conn:
+            conn.execute(insert, {"run_id": run_id, "wall": wall})
+        anomalies = detect_all_anomalies(engine, run_id)
+        result = evaluate_quality_gates(engine, run_id, config, summary)
+        assert result["status"] == "PASS"
+        assert result["gate_values"]["high_severity_anomaly_count"] == 0
+
+    assert anomalies[0]["metric_name"] == "stage_wall_seconds"
+    assert anomalies[0]["severity"] == "HIGH"
+    with engine.connect() as conn:
+        flagged = conn.execute(text("SELECT DISTINCT run_id FROM anomaly_events"))
+        assert [row.run_id for row in flagged] == ["perf-slow"]
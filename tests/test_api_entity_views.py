@@ -0,0 +1,114 @@
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import entity_resolution_engine.api.main as main
+
+_COMMON = "merge_confidence NUMERIC, lineage TEXT, run_id TEXT, updated_at TIMESTAMP"
+
+
+def _setup_engine(db_path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        for ddl in (
+            f"CREATE TABLE ues_teams (ues_team_id TEXT, name TEXT, country TEXT, "
+            f"{_COMMON})",
+            f"CREATE TABLE ues_competitions (ues_competition_id TEXT, name TEXT, "
+            f"country TEXT, {_COMMON})",
+            f"CREATE TABLE ues_seasons (ues_season_id TEXT, start_year INTEGER, "
+            f"end_year INTEGER, competition_ues_id TEXT, {_COMMON})",
+            f"CREATE TABLE ues_matches (ues_match_id TEXT, home_team_ues_id TEXT, "
+            f"away_team_ues_id TEXT, season_ues_id TEXT, competition_ues_id TEXT, "
+            f"match_date DATE, {_COMMON})",
+            "CREATE TABLE quality_gate_results (run_id TEXT PRIMARY KEY, "
+            "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)",
+        ):
+            conn.execute(text(ddl))
+        lineage = json.dumps({"alpha_ids": ["1"]})
+        conn.execute(
+            text(
+                "INSERT INTO ues_teams VALUES "
+                "('T1', 'Home FC', 'US', 0.9, :lineage, 'run-1', NULL), "
+                "('T2', 'Away FC', 'US', 0.9, :lineage, 'run-1', NULL)"
+            ),
+            {"lineage": lineage},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO ues_competitions VALUES "
+                "('C1', 'League', 'US', 1.0, :lineage, 'run-1', NULL)"
+            ),
+            {"lineage": lineage},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO ues_seasons VALUES "
+                "('S1', 2023, 2024, 'C1', 1.0, :lineage, 'run-1', NULL)"
+            ),
+            {"lineage": lineage},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO ues_matches VALUES "
+                "('M1', 'T1', 'T2', 'S1', 'C1', '2024-01-01', 0.95, :lineage, "
+                "'run-1', NULL), "
+                "('M2', 'T1', 'T9', 'S1', 'C1', '2024-01-02', 0.95, :lineage, "
+                "'run-1', NULL)"
+            ),
+            {"lineage": lineage},
+        )
+    return engine
+
+
+def _client(monkeypatch, tmp_path):
+    engine = _setup_engine(tmp_path / "ues.db")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{engine.url.database}")
+    statements = []
+    event.listen(
+        async_engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    monkeypatch.setattr(main, "ues_engine", engine)
+    monkeypatch.setattr(main, "ues_async_engine", async_engine)
+    return TestClient(main.app), statements
+
+
+def test_match_expansion_is_served_by_one_joined_query(monkeypatch, tmp_path):
+    client, statements = _client(monkeypatch, tmp_path)
+
+    response = client.get("/ues/match/M1?expand=home_team,away_team,season,competition")
+    body = response.json()
+
+    assert response.status_code == 200
+    assert body["ues_match_id"] == "M1"
+    assert body["lineage"] == {"alpha_ids": ["1"]}
+    assert body["home_team"]["name"] == "Home FC"
+    assert body["away_team"]["name"] == "Away FC"
+    assert body["season"]["start_year"] == 2023
+    assert body["competition"]["name"] == "League"
+    entity_queries = [s for s in statements if "ues_matches" in s]
+    assert len(entity_queries) == 1
+    assert entity_queries[0].count("LEFT JOIN") == 4
+
+
+def test_lineage_is_optional_and_missing_relations_are_null(monkeypatch, tmp_path):
+    client, _ = _client(monkeypatch, tmp_path)
+
+    body = client.get("/ues/match/M2?expand=all&include_lineage=false").json()
+
+    assert "lineage" not in body
+    assert "lineage" not in body["home_team"]
+    assert body["away_team"] is None
+    season = client.get("/ues/season/S1?expand=competition").json()
+    assert season["competition"]["ues_competition_id"] == "C1"
+
+
+def test_entity_view_errors(monkeypatch, tmp_path):
+    client, _ = _client(monkeypatch, tmp_path)
+
+    assert client.get("/ues/team/T404").status_code == 404
+    assert client.get("/ues/venue/V1").status_code == 404
+    assert client.get("/ues/team/T1?expand=season").status_code == 400
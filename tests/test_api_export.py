@@ -0,0 +1,166 @@
+import csv
+import gzip
+import io
+import json
+
+import pyarrow.parquet as pq
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import entity_resolution_engine.api.main as main
+
+
+def _setup_engine(db_path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE ues_teams (
+                    ues_team_id TEXT PRIMARY KEY,
+                    name TEXT,
+                    country TEXT,
+                    merge_confidence NUMERIC,
+                    lineage TEXT,
+                    run_id TEXT,
+                    updated_at TIMESTAMP
+                )
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                CREATE TABLE quality_gate_results (
+                    run_id TEXT PRIMARY KEY,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+        )
+        for idx in range(5):
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO ues_teams VALUES
+                    (:id, :name, 'US', 0.9, :lineage, :run_id, :updated_at)
+                    """
+                ),
+                {
+                    "id": f"UES-TEAM-{idx}",
+                    "name": f"Team {idx}",
+                    "lineage": json.dumps({"sources": [{"id": idx}]}),
+                    "run_id": "run-2" if idx < 3 else "run-1",
+                    "updated_at": f"2024-01-0{idx + 1} 00:00:00",
+                },
+            )
+        conn.execute(text("INSERT INTO quality_gate_results (run_id) VALUES ('run-2')"))
+    return engine
+
+
+def _client(monkeypatch, tmp_path):
+    engine = _setup_engine(tmp_path / "ues.db")
+    monkeypatch.setattr(main, "ues_engine", engine)
+    monkeypatch.setattr(
+        main,
+        "ues_async_engine",
+        create_async_engine(f"sqlite+aiosqlite:///{engine.url.database}"),
+    )
+    monkeypatch.setattr(main, "EXPORT_DIR", tmp_path / "exports")
+    monkeypatch.setattr(main, "EXPORT_CHUNK_SIZE", 2)
+    monkeypatch.setenv("INTERNAL_API_KEY", "secret")
+    return TestClient(main.app), {"X-Internal-API-Key": "secret"}
+
+
+def test_ndjson_export_streams_all_rows_and_filters(monkeypatch, tmp_path):
+    client, headers = _client(monkeypatch, tmp_path)
+
+    response = client.get("/export/team", headers=headers)
+    rows = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [row["ues_team_id"] for row in rows] == [f"UES-TEAM-{i}" for i in range(5)]
+    assert rows[0]["lineage"] == {"sources": [{"id": 0}]}
+    by_run = client.get("/export/team?run_id=run-1", headers=headers)
+    assert len(by_run.text.splitlines()) == 2
+    since = client.get(
+        "/export/team?changed_since=2024-01-04T00:00:00", headers=headers
+    )
+    assert [json.loads(line)["ues_team_id"] for line in since.text.splitlines()] == [
+        "UES-TEAM-4"
+    ]
+
+
+def test_csv_export_is_gzipped_when_requested(monkeypatch, tmp_path):
+    client, headers = _client(monkeypatch, tmp_path)
+
+    with client.stream(
+        "GET",
+        "/export/team?format=csv",
+        headers={**headers, "Accept-Encoding": "gzip"},
+    ) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(raw).decode())))
+    assert len(rows) == 5
+    assert json.loads(rows[4]["lineage"]) == {"sources": [{"id": 4}]}
+
+
+def test_parquet_export_is_generated_once_per_run(monkeypatch, tmp_path):
+    client, headers = _client(monkeypatch, tmp_path)
+
+    response = client.get("/export/team?format=parquet", headers=headers)
+    table = pq.read_table(io.BytesIO(response.content))
+    path = tmp_path / "exports" / "run-2" / "team.parquet"
+
+    assert table.num_rows == 5
+    assert path.exists()
+    assert pq.ParquetFile(path).metadata.num_row_groups == 3
+    assert client.get("/export/venue", headers=headers).status_code == 404
+    rejected = client.get(
+        "/export/team?format=parquet&changed_since=2024-01-01T00:00:00",
+        headers=headers,
+    )
+    assert rejected.status_code == 400
+
+
+def test_parquet_export_rejects_unknown_and_escaping_run_ids(monkeypatch, tmp_path):
+    client, headers = _client(monkeypatch, tmp_path)
+    stale = tmp_path / "exports" / "run-0"
+    stale.mkdir(parents=True)
+    (stale / "team.parquet").write_bytes(b"old")
+
+    escaping = client.get("/export/team?format=parquet&run_id=../../x", headers=headers)
+    unknown = client.get("/export/team?format=parquet&run_id=run-1", headers=headers)
+    explicit = client.get("/export/team?format=parquet&run_id=run-2", headers=headers)
+
+    assert escaping.status_code == 400
+    assert unknown.status_code == 404
+    assert pq.read_table(io.BytesIO(explicit.content)).num_rows == 3
+    assert sorted(path.name for path in (tmp_path / "exports").iterdir()) == ["run-2"]
+    assert not (tmp_path / "x").exists()
+
+
+def test_parquet_exports_never_swap_or_share_files(monkeypatch, tmp_path):
+    client, headers = _client(monkeypatch, tmp_path)
+    path = tmp_path / "exports" / "run-2" / "team.parquet"
+    client.get("/export/team?format=parquet", headers=headers)
+    published = path.stat().st_ino
+
+    # A concurrent writer for the same run keeps the file already published.
+    main.write_parquet_export(main.ues_engine, "team", path, chunk_size=2)
+    assert path.stat().st_ino == published
+    assert [p.name for p in path.parent.iterdir()] == ["team.parquet"]
+
+    # Without a completed run every request writes, sends and removes its own.
+    with main.ues_engine.begin() as conn:
+        conn.execute(text("DELETE FROM quality_gate_results"))
+    main.response_cache.invalidate()
+    responses = [
+        client.get("/export/team?format=parquet", headers=headers) for _ in range(2)
+    ]
+
+    assert [pq.read_table(io.BytesIO(r.content)).num_rows for r in responses] == [5, 5]
+    assert list((tmp_path / "exports" / "current").iterdir()) == []
@@ -1,13 +1,97 @@
+import time
+from pathlib import Path
+
 from fastapi.testclient import TestClient
 
 import entity_resolution_engine.api.main as main
+from entity_resolution_engine.api.jobs import MappingJobManager
+
+
+def _fast_run(run_id, progress):
+    for stage in ("load", "team"):
+        progress(stage, "running")
+        progress(stage, "completed")
+    return run_id
+
+
+def _slow_run(run_id, progress):
+    progress("load", "running")
+    time.sleep(30)
+    return run_id
+
 
+def _failing_run(run_id, progress):
+    progress("load", "running")
+    raise RuntimeError("source database unavailable")
 
-def test_mapping_run_returns_run_id(monkeypatch):
-    monkeypatch.setattr(main, "run_mapping", lambda: "run-123")
-    client = TestClient(main.app)
+
+def _profiled_run(run_id, progress, profile, profile_dir):
+    run_dir = Path(profile_dir) / run_id
+    run_dir.mkdir(parents=True)
+    (run_dir / "mode").write_text(profile)
+    return run_id
+
+
+def _client(monkeypatch, runner):
+    manager = MappingJobManager(runner=runner, stages=["load", "team"])
+    monkeypatch.setattr(main, "mapping_jobs", manager)
+    return TestClient(main.app), manager
+
+
+def test_mapping_run_returns_job_and_reports_progress(monkeypatch):
+    client, manager = _client(monkeypatch, _fast_run)
 
     response = client.post("/mapping/run")
 
     assert response.status_code == 200
-    assert response.json() == {"status": "mapping_complete", "run_id": "run-123"}
+    payload = response.json()
+    assert payload["status"] == "running"
+    assert payload["deduplicated"] is False
+    manager.wait(payload["job_id"], timeout=30)
+    job = client.get(f"/mapping/jobs/{payload['job_id']}").json()
+    assert job["status"] == "succeeded"
+    assert job["run_id"] == payload["run_id"]
+    assert job["progress"] == {"completed_stages": 2, "total_stages": 2}
+    assert job["stages"]["team"]["finished_at"] is not None
+    assert client.get("/mapping/jobs/unknown").status_code == 404
+
+
+def test_concurrent_triggers_collapse_and_cancel(monkeypatch):
+    client, manager = _client(monkeypatch, _slow_run)
+
+    first = client.post("/mapping/run").json()
+    second = client.post("/mapping/run").json()
+
+    assert second["job_id"] == first["job_id"]
+    assert second["deduplicated"] is True
+    client.post(f"/mapping/jobs/{first['job_id']}/cancel")
+    job = manager.wait(first["job_id"], timeout=30)
+    assert job["status"] == "cancelled"
+    assert client.post("/mapping/run").json()["job_id"] != first["job_id"]
+    manager.shutdown()
+
+
+def test_failed_job_records_error(monkeypatch):
+    client, manager = _client(monkeypatch, _failing_run)
+
+    job_id = client.post("/mapping/run").json()["job_id"]
+
+    job = manager.wait(job_id, timeout=30)
+    assert job["status"] == "failed"
+    assert "source database unavailable" in job["error"]
+    assert job["stages"]["load"]["status"] == "failed"
+
+
+def test_profile_option_is_passed_to_the_run(monkeypatch, tmp_path):
+    monkeypatch.setenv("MAPPING_PROFILE_DIR", str(tmp_path))
+    client, manager = _client(monkeypatch, _profiled_run)
+
+    assert client.post("/mapping/run?profile=perf").status_code == 400
+    payload = client.post("/mapping/run?profile=sampling").json()
+
+    job = manager.wait(payload["job_id"], timeout=30)
+    assert job["status"] == "succeeded"
+    assert job["options"]["profile"] == "sampling"
+    profile_dir = Path(payload["profile_dir"])
+    assert profile_dir == tmp_path / payload["run_id"]
+    assert (profile_dir / "mode").read_text() == "sampling"
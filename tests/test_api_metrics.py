@@ -0,0 +1,108 @@
+import re
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import entity_resolution_engine.api.main as main
+from entity_resolution_engine.api.metrics import Histogram
+from tests.test_api_player_reads import _setup_engine
+
+_SAMPLE = re.compile(r"^([a-zA-Z_:][\w:]*)(\{(.*)\})? (\S+)$")
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def scrape(client):
+    """Minimal scraper stand-in: parse the exposition text into samples."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in response.text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = _SAMPLE.match(line)
+        assert match, f"malformed sample line: {line!r}"
+        name, _, labels, value = match.groups()
+        key = (name, frozenset(_LABEL.findall(labels or "")))
+        samples[key] = float(value)
+    return samples
+
+
+def _value(samples, name, **labels):
+    return samples.get((name, frozenset(labels.items())), 0.0)
+
+
+def test_metrics_endpoint_reports_requests_pool_and_cache(monkeypatch, tmp_path):
+    engine = _setup_engine(tmp_path / "ues.db")
+    monkeypatch.setattr(main, "ues_engine", engine)
+    monkeypatch.setattr(
+        main,
+        "ues_async_engine",
+        create_async_engine(f"sqlite+aiosqlite:///{engine.url.database}"),
+    )
+    client = TestClient(main.app)
+    route = {"method": "GET", "route": "/ues/player/{ues_id}", "status": "200"}
+    before = scrape(client)
+
+    client.get("/ues/player/UES-PLR-1")
+    client.get("/ues/player/UES-PLR-1")
+    client.get("/no/such/route")
+    after = scrape(client)
+
+    count = "http_request_duration_seconds_count"
+    assert _value(after, count, **route) - _value(before, count, **route) == 2
+    assert _value(after, count, method="GET", route="unmatched", status="404") >= 1
+    assert _value(
+        after, "http_request_duration_seconds_bucket", le="+Inf", **route
+    ) == _value(after, count, **route)
+    # The scrape itself is the only request in flight.
+    assert _value(after, "http_requests_in_flight") == 1
+    assert _value(after, "db_pool_acquire_seconds_count", engine="async") > 0
+    assert ("db_pool_checked_out", frozenset({("engine", "sync")})) in after
+    assert _value(after, "response_cache_hits_total") == 1
+    assert _value(after, "response_cache_misses_total") == 1
+    assert _value(after, "response_cache_hit_ratio") == 0.5
+
+
+def test_last_run_stage_durations_come_from_run_metrics(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ues.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE pipeline_run_metrics (run_id TEXT, entity_type TEXT, "
+                "finished_at TIMESTAMP, stage_wall_seconds NUMERIC)"
+            )
+        )
+        # A CLI run (run-8) finished after the last API job (run-7).
+        conn.execute(
+            text(
+                "INSERT INTO pipeline_run_metrics VALUES "
+                "('run-7', 'team', '2024-01-01', 9.0), "
+                "('run-8', 'team', '2024-01-02', 2.5), "
+                "('run-8', 'player', '2024-01-02', NULL)"
+            )
+        )
+    monkeypatch.setattr(main, "ues_engine", engine)
+    client = TestClient(main.app)
+
+    main._on_mapping_job_finish({"run_id": "run-7", "status": "succeeded"})
+    samples = scrape(client)
+
+    stage = "mapping_last_run_stage_duration_seconds"
+    assert _value(samples, stage, stage="team") == 2.5
+    assert (stage, frozenset({("stage", "player")})) not in samples
+    assert _value(samples, "mapping_last_run_info", run_id="run-7", status="succeeded")
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "/x")
+
+    lines = histogram.render()
+
+    assert 'demo_seconds_bucket{route="/x",le="0.1"} 2' in lines
+    assert 'demo_seconds_bucket{route="/x",le="1.0"} 3' in lines
+    assert 'demo_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 'demo_seconds_count{route="/x"} 4' in lines
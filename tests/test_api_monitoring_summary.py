@@ -1,17 +1,43 @@
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, text
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine
 
 import entity_resolution_engine.api.main as main
 
 
-def _setup_engine():
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
+def _setup_engine(db_path):
+    engine = create_engine(f"sqlite:///{db_path}")
     with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE run_summaries (
+                    run_id TEXT PRIMARY KEY,
+                    metrics_row_count INTEGER,
+                    totals TEXT,
+                    rates TEXT,
+                    llm_health TEXT,
+                    review_counts TEXT,
+                    review_counts_by_entity TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                CREATE TABLE quality_gate_results (
+                    run_id TEXT PRIMARY KEY,
+                    status TEXT,
+                    failed_gates TEXT,
+                    gate_values TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+        )
         conn.execute(
             text(
                 """
@@ -31,6 +57,14 @@ def _setup_engine():
                     llm_error_count INTEGER,
                     llm_invalid_json_retry_count INTEGER,
                     llm_avg_latency_ms REAL,
+                    llm_latency_p50_ms REAL,
+                    llm_latency_p95_ms REAL,
+                    llm_latency_p99_ms REAL,
+                    llm_latency_max_ms REAL,
+                    llm_retry_count INTEGER,
+                    llm_prompt_tokens INTEGER,
+                    llm_completion_tokens INTEGER,
+                    llm_bytes_sent INTEGER,
                     llm_fallback_mode TEXT,
                     llm_disabled_reason TEXT,
                     created_at TIMESTAMP
@@ -91,9 +125,18 @@ def _setup_engine():
     return engine
 
 
-def test_monitoring_summary_aggregates_metrics(monkeypatch):
-    engine = _setup_engine()
+def _patch_engines(monkeypatch, engine):
     monkeypatch.setattr(main, "ues_engine", engine)
+    monkeypatch.setattr(
+        main,
+        "ues_async_engine",
+        create_async_engine(f"sqlite+aiosqlite:///{engine.url.database}"),
+    )
+
+
+def test_monitoring_summary_aggregates_metrics(monkeypatch, tmp_path):
+    engine = _setup_engine(tmp_path / "ues.db")
+    _patch_engines(monkeypatch, engine)
     monkeypatch.setenv("INTERNAL_API_KEY", "secret")
 
     client = TestClient(main.app)
@@ -108,3 +151,58 @@ def test_monitoring_summary_aggregates_metrics(monkeypatch):
     assert payload["llm_health"]["llm_error_count"] == 1
     assert payload["review_counts"]["PENDING"] == 1
     assert payload["review_counts"]["APPROVED"] == 1
+
+
+def test_monitoring_summary_exposes_latency_percentiles_and_tokens(
+    monkeypatch, tmp_path
+):
+    engine = _setup_engine(tmp_path / "ues.db")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                UPDATE pipeline_run_metrics
+                SET llm_latency_p50_ms = 4.0, llm_latency_p95_ms = 9.0,
+                    llm_latency_p99_ms = 12.0, llm_latency_max_ms = 15.0,
+                    llm_retry_count = 1, llm_prompt_tokens = 100,
+                    llm_completion_tokens = 20, llm_bytes_sent = 400
+                WHERE entity_type = 'team'
+                """
+            )
+        )
+    _patch_engines(monkeypatch, engine)
+    monkeypatch.setenv("INTERNAL_API_KEY", "secret")
+
+    client = TestClient(main.app)
+    response = client.get(
+        "/monitoring/summary?run_id=run-1", headers={"X-Internal-API-Key": "secret"}
+    )
+
+    llm_health = response.json()["llm_health"]
+    assert llm_health["llm_latency_max_ms"] == 15.0
+    assert llm_health["llm_latency_by_entity_type"]["team"]["p95_ms"] == 9.0
+    assert llm_health["llm_latency_by_entity_type"]["player"]["p95_ms"] is None
+    assert llm_health["llm_prompt_tokens"] == 100
+    assert llm_health["llm_bytes_sent"] == 400
+
+
+def test_summary_is_backfilled_once_and_tracks_review_decisions(monkeypatch, tmp_path):
+    engine = _setup_engine(tmp_path / "ues.db")
+    _patch_engines(monkeypatch, engine)
+    monkeypatch.setenv("INTERNAL_API_KEY", "secret")
+    client = TestClient(main.app)
+    headers = {"X-Internal-API-Key": "secret"}
+
+    first = client.get("/monitoring/summary?run_id=run-1", headers=headers).json()
+    with engine.begin() as conn:
+        stored = conn.execute(text("SELECT COUNT(*) FROM run_summaries")).scalar()
+        # The stored row is served as-is; raw metrics are no longer re-read.
+        conn.execute(text("DELETE FROM pipeline_run_metrics"))
+    client.post("/validation/reviews/1/approve", headers=headers)
+    second = client.get("/monitoring/summary?run_id=run-1", headers=headers).json()
+
+    assert stored == 1
+    assert second["totals"] == first["totals"]
+    assert second["review_counts"] == {"APPROVED": 2}
+    unknown = client.get("/monitoring/summary?run_id=missing", headers=headers).json()
+    assert unknown["totals"]["total_candidates"] == 0
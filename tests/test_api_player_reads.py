@@ -0,0 +1,120 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import entity_resolution_engine.api.main as main
+from entity_resolution_engine.db.connections import get_async_engine
+
+
+def _setup_engine(db_path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE quality_gate_results (
+                    run_id TEXT PRIMARY KEY,
+                    status TEXT,
+                    failed_gates TEXT,
+                    gate_values TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                CREATE TABLE ues_players (
+                    ues_player_id TEXT,
+                    canonical_name TEXT,
+                    lineage TEXT
+                )
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                CREATE TABLE source_lineage (
+                    source_system TEXT,
+                    source_id TEXT,
+                    ues_entity_type TEXT,
+                    ues_entity_id TEXT
+                )
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO ues_players VALUES
+                ('UES-PLR-1', 'Jane Doe', '{"alpha_ids": ["10"]}')
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO source_lineage VALUES
+                ('ALPHA', '10', 'player', 'UES-PLR-1'),
+                ('BETA', '20', 'player', 'UES-PLR-1')
+                """
+            )
+        )
+    return engine
+
+
+def test_player_reads_use_async_engine(monkeypatch, tmp_path):
+    engine = _setup_engine(tmp_path / "ues.db")
+    # Only the async engine is patched: reads must not touch the sync one.
+    monkeypatch.setattr(main, "ues_engine", None)
+    monkeypatch.setattr(
+        main,
+        "ues_async_engine",
+        create_async_engine(f"sqlite+aiosqlite:///{engine.url.database}"),
+    )
+    client = TestClient(main.app)
+
+    player = client.get("/ues/player/UES-PLR-1")
+    assert player.status_code == 200
+    assert player.json()["canonical_name"] == "Jane Doe"
+
+    by_alpha = client.get("/lookup/player/by-alpha/10")
+    assert by_alpha.json()["ues_player_id"] == "UES-PLR-1"
+    assert client.get("/lookup/player/by-beta/99").status_code == 404
+    lineage = client.get("/ues/player/UES-PLR-1/lineage")
+    assert lineage.json() == {"lineage": {"alpha_ids": ["10"]}}
+
+
+def test_batch_lookup_resolves_ids_in_one_request(monkeypatch, tmp_path):
+    engine = _setup_engine(tmp_path / "ues.db")
+    monkeypatch.setattr(
+        main,
+        "ues_async_engine",
+        create_async_engine(f"sqlite+aiosqlite:///{engine.url.database}"),
+    )
+    monkeypatch.setattr(main, "BATCH_LOOKUP_MAX_IDS", 3)
+    client = TestClient(main.app)
+
+    response = client.post("/lookup/player/by-alpha", json={"ids": ["10", "11", "10"]})
+
+    assert response.json() == {
+        "entity_type": "player",
+        "source_system": "ALPHA",
+        "mappings": {"10": "UES-PLR-1"},
+        "missing": ["11"],
+    }
+    by_beta = client.post("/lookup/player/by-beta", json={"ids": ["20"]})
+    assert by_beta.json()["mappings"] == {"20": "UES-PLR-1"}
+    too_many = client.post("/lookup/team/by-alpha", json={"ids": ["1", "2", "3", "4"]})
+    assert too_many.status_code == 422
+    assert client.post("/lookup/venue/by-alpha", json={"ids": []}).status_code == 404
+
+
+def test_get_async_engine_swaps_in_async_driver(monkeypatch):
+    monkeypatch.setenv("TEST_UES_URL", "postgresql://u:p@localhost:5432/db")
+
+    engine = get_async_engine("TEST_UES_URL", "sqlite://")
+
+    assert engine.url.drivername == "postgresql+asyncpg"
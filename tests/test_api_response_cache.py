@@ -0,0 +1,145 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import entity_resolution_engine.api.main as main
+from entity_resolution_engine.api.cache import (
+    ResponseCache,
+    encode_response,
+    etag_matches,
+    run_key,
+)
+from tests.test_api_player_reads import _setup_engine
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put(("player", "v1", "a"), encode_response({"id": "a"}))
+    cache.put(("player", "v1", "b"), encode_response({"id": "b"}))
+    cache.get(("player", "v1", "a"))
+    cache.put(("player", "v1", "c"), encode_response({"id": "c"}))
+
+    assert cache.get(("player", "v1", "b")) is None
+    assert cache.get(("player", "v1", "a")) is not None
+    assert cache.evictions == 1
+
+
+def test_response_cache_version_change_and_run_invalidation():
+    now = [0.0]
+    cache = ResponseCache(version_ttl_s=5, clock=lambda: now[0])
+    cache.set_version("run-1")
+    cache.put(run_key("run-1", "summary"), encode_response({"run_id": "run-1"}))
+    cache.put(run_key("run-0", "summary"), encode_response({"run_id": "run-0"}))
+    # An entity entry whose version equals the reviewed run id.
+    cache.put(("player", "run-0", "UES-PLR-1"), encode_response({"id": 1}))
+
+    cache.invalidate(run_id="run-0")
+    assert cache.get(run_key("run-0", "summary")) is None
+    assert cache.get(("player", "run-0", "UES-PLR-1")) is not None
+    assert not cache.version_is_stale()
+    now[0] = 6.0
+    assert cache.version_is_stale()
+    cache.set_version("run-2")
+    assert len(cache) == 0
+
+
+def test_run_entries_expire_so_other_workers_reread_them():
+    now = [0.0]
+    cache = ResponseCache(clock=lambda: now[0], run_ttl_s=30)
+    cache.put(run_key("run-1", "gates"), encode_response({"status": "PASS"}))
+    cache.put(("team", "run-1", "UES-TEAM-1"), encode_response({"id": 1}))
+
+    now[0] = 29.0
+    assert cache.get(run_key("run-1", "gates")) is not None
+    now[0] = 30.0
+    assert cache.get(run_key("run-1", "gates")) is None
+    assert cache.get(("team", "run-1", "UES-TEAM-1")) is not None
+
+
+def test_etag_matching_handles_lists_and_weak_tags():
+    etag = encode_response({"a": 1}).etag
+
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+
+
+def test_player_endpoint_serves_cached_payload_with_etag(monkeypatch, tmp_path):
+    engine = _setup_engine(tmp_path / "ues.db")
+    monkeypatch.setattr(
+        main,
+        "ues_async_engine",
+        create_async_engine(f"sqlite+aiosqlite:///{engine.url.database}"),
+    )
+    client = TestClient(main.app)
+
+    first = client.get("/ues/player/UES-PLR-1")
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE ues_players SET canonical_name = 'Changed'"))
+    second = client.get("/ues/player/UES-PLR-1")
+    not_modified = client.get(
+        "/ues/player/UES-PLR-1", headers={"If-None-Match": first.headers["ETag"]}
+    )
+
+    assert second.json()["canonical_name"] == "Jane Doe"
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    main.response_cache.invalidate()
+    assert client.get("/ues/player/UES-PLR-1").json()["canonical_name"] == "Changed"
+
+
+def test_aborted_run_becomes_the_entity_version(monkeypatch, tmp_path):
+    engine = _setup_engine(tmp_path / "ues.db")
+    monkeypatch.setattr(
+        main,
+        "ues_async_engine",
+        create_async_engine(f"sqlite+aiosqlite:///{engine.url.database}"),
+    )
+    monkeypatch.setattr(main.response_cache, "version_ttl_s", 0.0)
+    client = TestClient(main.app)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO quality_gate_results (run_id) VALUES ('run-1')"))
+    assert client.get("/ues/player/UES-PLR-1").json()["canonical_name"] == "Jane Doe"
+
+    # run-2 resets the tables, rewrites the player and is aborted by a gate.
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM quality_gate_results"))
+        conn.execute(text("UPDATE ues_players SET canonical_name = 'Changed'"))
+        conn.execute(
+            text(
+                "INSERT INTO quality_gate_results (run_id, status) "
+                "VALUES ('run-2', 'ABORTED')"
+            )
+        )
+
+    assert client.get("/ues/player/UES-PLR-1").json()["canonical_name"] == "Changed"
+    assert main.response_cache.version == "run-2"
+
+
+def test_gates_are_cached_only_once_the_run_completed(monkeypatch, tmp_path):
+    engine = _setup_engine(tmp_path / "ues.db")
+    monkeypatch.setattr(
+        main,
+        "ues_async_engine",
+        create_async_engine(f"sqlite+aiosqlite:///{engine.url.database}"),
+    )
+    monkeypatch.setenv("INTERNAL_API_KEY", "secret")
+    client = TestClient(main.app)
+    headers = {"X-Internal-API-Key": "secret"}
+
+    assert (
+        client.get("/monitoring/gates?run_id=run-1", headers=headers).status_code == 404
+    )
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO quality_gate_results (run_id, status, failed_gates, "
+                "gate_values) VALUES ('run-1', 'PASS', '[]', '{}')"
+            )
+        )
+    gates = client.get("/monitoring/gates?run_id=run-1", headers=headers)
+
+    assert gates.json()["status"] == "PASS"
+    assert run_key("run-1", "gates") in main.response_cache._entries
@@ -1,17 +1,30 @@
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, text
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine
 
 import entity_resolution_engine.api.main as main
 
 
-def _setup_engine():
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
+def _setup_engine(db_path):
+    engine = create_engine(f"sqlite:///{db_path}")
     with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE run_summaries (
+                    run_id TEXT PRIMARY KEY,
+                    metrics_row_count INTEGER,
+                    totals TEXT,
+                    rates TEXT,
+                    llm_health TEXT,
+                    review_counts TEXT,
+                    review_counts_by_entity TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+        )
         conn.execute(
             text(
                 """
@@ -49,9 +62,18 @@ def _setup_engine():
     return engine
 
 
-def test_internal_auth_and_review_updates(monkeypatch):
-    engine = _setup_engine()
+def _patch_engines(monkeypatch, engine):
     monkeypatch.setattr(main, "ues_engine", engine)
+    monkeypatch.setattr(
+        main,
+        "ues_async_engine",
+        create_async_engine(f"sqlite+aiosqlite:///{engine.url.database}"),
+    )
+
+
+def test_internal_auth_and_review_updates(monkeypatch, tmp_path):
+    engine = _setup_engine(tmp_path / "ues.db")
+    _patch_engines(monkeypatch, engine)
     monkeypatch.setenv("INTERNAL_API_KEY", "secret")
 
     client = TestClient(main.app)
@@ -71,3 +93,57 @@ def test_internal_auth_and_review_updates(monkeypatch):
     reject = client.post("/validation/reviews/1/reject", headers=headers)
     assert reject.status_code == 200
     assert reject.json()["status"] == "REJECTED"
+
+
+def test_reviews_keyset_pagination(monkeypatch, tmp_path):
+    engine = _setup_engine(tmp_path / "ues.db")
+    with engine.begin() as conn:
+        for idx in range(4):
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO llm_match_reviews
+                    (run_id, entity_type, left_id, right_id, status, created_at)
+                    VALUES ('run-1', 'team', :left_id, 'x', 'PENDING', :created_at)
+                    """
+                ),
+                # Two rows share a timestamp so the id tiebreaker is exercised.
+                {
+                    "left_id": str(idx),
+                    "created_at": f"2024-01-0{idx // 2 + 1} 10:00:00",
+                },
+            )
+    _patch_engines(monkeypatch, engine)
+    monkeypatch.setenv("INTERNAL_API_KEY", "secret")
+    client = TestClient(main.app)
+    headers = {"X-Internal-API-Key": "secret"}
+
+    offset_ids = [
+        row["id"]
+        for row in client.get("/validation/reviews?limit=10", headers=headers).json()[
+            "reviews"
+        ]
+    ]
+    seen = []
+    cursor = None
+    while True:
+        url = "/validation/reviews?limit=2"
+        if cursor:
+            url += f"&cursor={cursor}"
+        page = client.get(url, headers=headers).json()
+        seen.extend(row["id"] for row in page["reviews"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == offset_ids
+    assert len(seen) == 5
+    bad = client.get("/validation/reviews?cursor=not-a-cursor", headers=headers)
+    assert bad.status_code == 400
+    first_cursor = client.get("/validation/reviews?limit=1", headers=headers).json()[
+        "next_cursor"
+    ]
+    mixed = client.get(
+        f"/validation/reviews?limit=2&offset=2&cursor={first_cursor}", headers=headers
+    )
+    assert mixed.status_code == 400
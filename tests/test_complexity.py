@@ -0,0 +1,43 @@
+import pytest
+
+from entity_resolution_engine.benchmarks.complexity import (
+    GROWTH_CASES,
+    build_sources,
+    fit_exponent,
+    measure_growth,
+)
+from entity_resolution_engine.validation.adapters import (
+    adapt_player_match,
+    index_rows,
+)
+
+
+def test_fit_exponent_recovers_power_laws():
+    sizes = [1, 2, 4, 8]
+
+    assert fit_exponent(sizes, [0.5 * size for size in sizes]) == pytest.approx(1)
+    assert fit_exponent(sizes, [0.1 * size**2 for size in sizes]) == pytest.approx(2)
+
+
+def test_adapters_accept_prebuilt_row_indexes():
+    sources = build_sources(0.01)
+    alpha, beta = sources.alpha["players"], sources.beta["players"]
+    match = sources.matches("player", "players")[0]
+
+    from_frames = adapt_player_match(match, alpha, beta)
+    from_index = adapt_player_match(
+        match, index_rows(alpha, "player_id"), index_rows(beta, "id")
+    )
+
+    assert from_index == from_frames
+    assert (
+        from_index.signals["birth_year_alpha"] == from_index.signals["birth_year_beta"]
+    )
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("case", GROWTH_CASES, ids=lambda case: case.name)
+def test_growth_exponent_within_budget(case):
+    result = measure_growth(case)
+
+    assert result["passed"], result
@@ -0,0 +1,132 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import entity_resolution_engine.api.main as main
+from entity_resolution_engine.lineage.snapshot import (
+    LineageSnapshot,
+    LineageSnapshotStore,
+    publish_lineage_snapshot,
+    write_lineage_snapshot,
+)
+
+
+def test_snapshot_round_trip_and_binary_search(tmp_path):
+    path = tmp_path / "lineage.snap"
+    entries = [
+        ("ALPHA", "player", str(idx), f"UES-PLR-{idx}") for idx in range(200, 0, -1)
+    ]
+    entries.append(("BETA", "team", "7", "UES-TEAM-7"))
+
+    count = write_lineage_snapshot(entries, path, run_id="run-9")
+    snapshot = LineageSnapshot(path)
+
+    assert count == len(snapshot) == 201
+    assert snapshot.run_id == "run-9"
+    assert snapshot.lookup("ALPHA", "player", "42") == "UES-PLR-42"
+    assert snapshot.lookup("BETA", "team", "7") == "UES-TEAM-7"
+    assert snapshot.lookup("BETA", "player", "42") is None
+    assert snapshot.lookup_many("ALPHA", "player", ["1", "999"]) == {"1": "UES-PLR-1"}
+    empty = tmp_path / "empty.snap"
+    write_lineage_snapshot([], empty, run_id="run-0")
+    assert LineageSnapshot(empty).lookup("ALPHA", "player", "1") is None
+
+
+def test_store_swaps_in_newly_published_snapshot(tmp_path):
+    path = tmp_path / "lineage.snap"
+    store = LineageSnapshotStore(path, check_interval_s=0)
+    assert store.current() is None
+
+    write_lineage_snapshot([("ALPHA", "team", "1", "UES-A")], path, run_id="run-1")
+    first = store.current()
+    write_lineage_snapshot([("ALPHA", "team", "1", "UES-B")], path, run_id="run-2")
+    second = store.current()
+
+    assert first is not None and second is not None
+    assert second.run_id == "run-2"
+    assert second.lookup("ALPHA", "team", "1") == "UES-B"
+    # The replaced mapping is closed rather than left to the GC.
+    with pytest.raises(ValueError):
+        first.lookup("ALPHA", "team", "1")
+
+
+@pytest.fixture
+def lineage_db(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ues.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE source_lineage (source_system TEXT, source_id TEXT, "
+                "ues_entity_type TEXT, ues_entity_id TEXT)"
+            )
+        )
+        conn.execute(
+            text("CREATE TABLE quality_gate_results (run_id TEXT, created_at TEXT)")
+        )
+        conn.execute(
+            text(
+                "INSERT INTO source_lineage VALUES "
+                "('ALPHA', '10', 'player', 'UES-PLR-1'), "
+                "('BETA', '20', 'player', 'UES-PLR-1')"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO quality_gate_results VALUES ('run-1', '2024-01-01')")
+        )
+    monkeypatch.setattr(
+        main,
+        "ues_async_engine",
+        create_async_engine(f"sqlite+aiosqlite:///{engine.url.database}"),
+    )
+    return engine
+
+
+def test_batch_lookup_served_from_snapshot_of_latest_run(
+    lineage_db, no_lineage_snapshot
+):
+    # The snapshot answers ids it holds; the rest are re-checked in SQL.
+    write_lineage_snapshot(
+        [("BETA", "player", "21", "UES-PLR-SNAP")],
+        no_lineage_snapshot.path,
+        run_id="run-1",
+    )
+    client = TestClient(main.app)
+
+    response = client.post("/lookup/player/by-beta", json={"ids": ["20", "21", "22"]})
+
+    assert response.json()["mappings"] == {"20": "UES-PLR-1", "21": "UES-PLR-SNAP"}
+    assert response.json()["missing"] == ["22"]
+
+
+def test_unreadable_snapshot_falls_back_to_sql(lineage_db, no_lineage_snapshot, caplog):
+    path = no_lineage_snapshot.path
+    write_lineage_snapshot([("ALPHA", "player", "10", "UES-X")], path, "run-1")
+    path.write_bytes(path.read_bytes()[:-4])
+    client = TestClient(main.app)
+
+    responses = [
+        client.post("/lookup/player/by-alpha", json={"ids": ["10"]}) for _ in range(2)
+    ]
+
+    assert [r.json()["mappings"] for r in responses] == [{"10": "UES-PLR-1"}] * 2
+    # The bad file is logged once and not re-read until it changes.
+    assert caplog.text.count("Ignoring unreadable lineage snapshot") == 1
+    write_lineage_snapshot([("ALPHA", "player", "10", "UES-X")], path, "run-1")
+    assert no_lineage_snapshot.current() is not None
+
+
+def test_lookups_ignore_snapshot_of_an_older_run(lineage_db, no_lineage_snapshot):
+    publish_lineage_snapshot(lineage_db, "run-1", path=no_lineage_snapshot.path)
+    # A later run remapped the player and finished (or aborted) without
+    # publishing a snapshot.
+    with lineage_db.begin() as conn:
+        conn.execute(text("UPDATE source_lineage SET ues_entity_id = 'UES-PLR-2'"))
+        conn.execute(
+            text("INSERT INTO quality_gate_results VALUES ('run-2', '2024-01-02')")
+        )
+    client = TestClient(main.app)
+
+    response = client.post("/lookup/player/by-alpha", json={"ids": ["10"]})
+
+    assert response.json()["mappings"] == {"10": "UES-PLR-2"}
@@ -0,0 +1,138 @@
+import httpx
+
+from entity_resolution_engine.validation import llm_client as llm_client_module
+from entity_resolution_engine.validation.config import RateLimitConfig
+from entity_resolution_engine.validation.llm_client import LLMClient
+from entity_resolution_engine.validation.rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_waits_for_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(60, capacity=2, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    waited = bucket.acquire()
+
+    assert abs(waited - 1.0) < 1e-9
+
+
+def test_token_bucket_pause_blocks_until_retry_after():
+    clock = FakeClock()
+    bucket = TokenBucket(600, clock=clock, sleep=clock.sleep)
+    bucket.pause(5.0)
+
+    assert bucket.acquire() == 5.0
+
+
+def test_adaptive_concurrency_additive_increase_multiplicative_decrease():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=8, initial_limit=4)
+
+    for _ in range(5):
+        limiter.on_success(latency_ms=10.0)
+    assert limiter.limit == 5
+
+    limiter.on_overload()
+    assert limiter.limit == 2
+
+    slow = AdaptiveConcurrencyLimiter(
+        max_limit=8, initial_limit=4, target_latency_ms=50
+    )
+    slow.on_success(latency_ms=200.0)
+    assert slow.limit == 2
+
+
+def _patch_transport(monkeypatch, handler):
+    real_client = httpx.Client
+
+    def factory(*args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(handler)
+        return real_client(*args, **kwargs)
+
+    monkeypatch.setattr(llm_client_module.httpx, "Client", factory)
+
+
+def test_llm_client_honours_retry_after(monkeypatch):
+    statuses = [429, 200]
+    sleeps = []
+
+    def handler(request):
+        status = statuses.pop(0)
+        if status == 429:
+            return httpx.Response(429, headers={"Retry-After": "2"})
+        return httpx.Response(200, json={"content": '{"decision":"MATCH"}'})
+
+    _patch_transport(monkeypatch, handler)
+    monkeypatch.setattr(llm_client_module.time, "sleep", sleeps.append)
+    client = LLMClient(
+        provider="internal",
+        model="test-model",
+        api_key="test-key",
+        api_url="http://example.com",
+        rate_limit=RateLimitConfig(max_retries=2, max_retry_after_s=10),
+    )
+
+    assert client.request_json("sys", "user") == {"decision": "MATCH"}
+    assert sleeps == [2.0]
+    assert client.last_retry_count == 1
+    assert client.total_throttle_ms == 2000.0
+
+
+def test_llm_client_gives_up_when_retry_after_exceeds_cap(monkeypatch):
+    def handler(request):
+        return httpx.Response(429, headers={"Retry-After": "120"})
+
+    _patch_transport(monkeypatch, handler)
+    monkeypatch.setattr(llm_client_module.time, "sleep", lambda _s: None)
+    client = LLMClient(
+        provider="internal",
+        model="test-model",
+        api_key="test-key",
+        api_url="http://example.com",
+        rate_limit=RateLimitConfig(max_retries=2, max_retry_after_s=10),
+    )
+
+    try:
+        client.request_json("sys", "user")
+    except ValueError as exc:
+        assert "throttled" in str(exc)
+    else:
+        raise AssertionError("expected throttled error")
+    assert client.total_throttle_ms == 0.0
+
+
+def test_llm_client_reports_server_errors_as_unavailable(monkeypatch):
+    def handler(request):
+        return httpx.Response(503)
+
+    _patch_transport(monkeypatch, handler)
+    monkeypatch.setattr(llm_client_module.time, "sleep", lambda _s: None)
+    client = LLMClient(
+        provider="internal",
+        model="test-model",
+        api_key="test-key",
+        api_url="http://example.com",
+        rate_limit=RateLimitConfig(max_retries=1, max_retry_after_s=10),
+    )
+
+    try:
+        client.request_json("sys", "user")
+    except ValueError as exc:
+        assert "unavailable" in str(exc) and "status=503" in str(exc)
+    else:
+        raise AssertionError("expected unavailable error")
+    assert client.last_retry_count == 1
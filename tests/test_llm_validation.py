@@ -3,6 +3,10 @@ from entity_resolution_engine.validation.config import (
     GrayZoneThreshold,
     LLMValidationConfig,
 )
+from entity_resolution_engine.validation.fake_provider import (
+    FakeLLMTransport,
+    FakeProviderConfig,
+)
 from entity_resolution_engine.validation.llm_client import LLMClient
 from entity_resolution_engine.validation.llm_validator import validate_pair
 
@@ -82,3 +86,37 @@ def test_llm_client_extracts_choices_text_format():
     payload = {"choices": [{"text": '{"decision":"REVIEW"}'}]}
 
     assert LLMClient._extract_content(payload) == '{"decision":"REVIEW"}'
+
+
+def test_llm_client_against_fake_provider_transport():
+    transport = FakeLLMTransport(FakeProviderConfig(latency_ms=0.0))
+    client = LLMClient(
+        provider="internal",
+        model="test-model",
+        api_key="test-key",
+        api_url="http://fake-llm.local",
+        transport=transport,
+    )
+
+    result = client.request_json("sys", '{"matcher_score": 0.95, "signals": {}}')
+
+    assert result["decision"] == "MATCH"
+    assert transport.call_count == 1
+
+
+def test_llm_client_records_usage_for_last_call():
+    client = LLMClient(
+        provider="internal",
+        model="test-model",
+        api_key="test-key",
+        api_url="http://fake-llm.local",
+        transport=FakeLLMTransport(FakeProviderConfig(latency_ms=0.0)),
+    )
+
+    client.request_json("sys", '{"matcher_score": 0.5, "signals": {}}')
+    stats = client.last_call_stats()
+
+    assert stats["retry_count"] == 0
+    assert stats["bytes_sent"] > 0
+    assert stats["prompt_tokens"] > 0
+    assert stats["completion_tokens"] > 0
@@ -0,0 +1,69 @@
+import pytest
+
+from entity_resolution_engine.matchers import reference
+from entity_resolution_engine.qa.equivalence import (
+    MATCHERS,
+    Engine,
+    case_inputs,
+    check_engine,
+    compare_matches,
+)
+
+PAIR = ("alpha_team_id", "beta_team_id")
+EXPECTED = [
+    {"alpha_team_id": 1, "beta_team_id": 101, "confidence": 0.9, "name": "A"},
+    {"alpha_team_id": 2, "beta_team_id": 102, "confidence": 0.8, "name": "B"},
+]
+
+
+@pytest.mark.parametrize(
+    "spec, engine",
+    [(spec, engine) for spec in MATCHERS.values() for engine in spec.engines],
+    ids=lambda value: value.name,
+)
+def test_engines_match_the_reference(spec, engine):
+    assert check_engine(spec, engine, cases=100) == []
+
+
+def test_compare_matches_reports_pairs_order_and_fields():
+    swapped = [dict(EXPECTED[1]), dict(EXPECTED[0], confidence=0.9 + 1e-12)]
+    changed = [dict(EXPECTED[0], confidence=0.7), EXPECTED[1]]
+
+    assert compare_matches(EXPECTED, EXPECTED[:1], PAIR)[0].startswith("pairs:")
+    assert compare_matches(EXPECTED, swapped, PAIR) == [
+        "order: pairs are returned in a different order"
+    ]
+    assert compare_matches(EXPECTED, changed, PAIR) == [
+        "(1, 101) confidence: expected 0.9, got 0.7"
+    ]
+
+
+def test_documented_differences_never_cover_pairs():
+    documented = {"order": "blocked candidates", "confidence": "approximate score"}
+    changed = [dict(EXPECTED[1], confidence=0.1), EXPECTED[0]]
+
+    assert compare_matches(EXPECTED, changed, PAIR, documented=documented) == []
+    assert compare_matches(EXPECTED, changed[:1], PAIR, documented=documented)
+
+
+def test_check_engine_reports_reproducible_divergence():
+    spec = MATCHERS["match_teams"]
+    lossy = Engine(
+        "skips-last-beta",
+        lambda alpha, beta: reference.match_teams(alpha, beta.iloc[:-1]),
+    )
+
+    mismatches = check_engine(spec, lossy, cases=50)
+
+    assert mismatches
+    alpha, beta = case_inputs(spec, mismatches[0].case_seed)
+    assert reference.match_teams(alpha, beta) != lossy.run(alpha, beta)
+
+
+def test_check_engine_requires_the_same_exception():
+    def broken(alpha, beta):
+        raise KeyError("display_name")
+
+    mismatches = check_engine(MATCHERS["match_teams"], Engine("broken", broken), 5)
+
+    assert [m.differences[0].split(":")[0] for m in mismatches] == ["outcome"] * 5
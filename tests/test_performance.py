@@ -3,7 +3,17 @@ import time
 import pandas as pd
 import pytest
 
+from entity_resolution_engine.benchmarks.pipeline_scale import (
+    baseline_from_results,
+    compare_to_baseline,
+    run_scale,
+)
+from entity_resolution_engine.benchmarks.routing_throughput import (
+    run_routing_benchmark,
+)
+from entity_resolution_engine.cli.run_mapping import MAPPING_STAGES
 from entity_resolution_engine.matchers.players_matcher import match_players
+from entity_resolution_engine.validation.fake_provider import FakeProviderConfig
 
 
 @pytest.mark.performance
@@ -47,3 +57,63 @@ def test_player_matcher_perf_smoke():
     duration = time.perf_counter() - start
 
     assert duration < 3.0
+
+
+@pytest.mark.performance
+def test_player_routing_throughput_smoke():
+    results = run_routing_benchmark(
+        entity_types=["player"],
+        sizes=[20],
+        concurrency_levels=[1, 4],
+        provider_config=FakeProviderConfig(latency_ms=10.0),
+    )
+
+    assert [row["llm_call_count"] for row in results] == [20, 20]
+    assert all(row["circuit_breaker_trips"] == 0 for row in results)
+    assert results[1]["calls_per_s"] > results[0]["calls_per_s"]
+
+
+@pytest.mark.performance
+def test_pipeline_scale_benchmark_smoke(tmp_path, monkeypatch):
+    # run_scale points these at tmp_path, monkeypatch restores them afterwards.
+    for env in (
+        "SOURCE_ALPHA_DB_URL",
+        "SOURCE_BETA_DB_URL",
+        "UES_DB_URL",
+        "LINEAGE_SNAPSHOT_PATH",
+    ):
+        monkeypatch.setenv(env, "")
+
+    result = run_scale(1, str(tmp_path))
+
+    assert list(result["stages"]) == MAPPING_STAGES
+    assert result["phases"]["player"]["match"] > 0
+    assert result["peak_rss_mb"] > 0
+    baseline = baseline_from_results([result])
+    assert compare_to_baseline([result], baseline) == []
+
+
+def test_compare_to_baseline_flags_slower_stages_and_memory():
+    baseline = {
+        "scales": {
+            "10": {
+                "stages": {
+                    "team": {"wall_seconds": 1.0},
+                    "player": {"wall_seconds": 2.0},
+                },
+                "peak_rss_mb": 100.0,
+            }
+        }
+    }
+    result = {
+        "scale": 10,
+        "stages": {"team": {"wall_seconds": 1.2}, "player": {"wall_seconds": 3.0}},
+        "peak_rss_mb": 200.0,
+    }
+
+    regressions = compare_to_baseline([result], baseline, tolerance=0.25)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("10x player")
+    assert regressions[1].startswith("10x peak RSS")
+    assert compare_to_baseline([{**result, "scale": 1}], baseline) == []
@@ -0,0 +1,58 @@
+import json
+import logging
+import pstats
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+import pytest
+
+from entity_resolution_engine.cli import run_mapping
+from entity_resolution_engine.monitoring.profiler import StageProfiler
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    values = []
+    while time.perf_counter() < deadline:
+        values.append(sum(range(200)))
+    return values
+
+
+def test_cprofile_stage_writes_pstats_snapshot_and_logs_hotspots(tmp_path, caplog):
+    profiler = StageProfiler("run-1", tmp_path, mode="cprofile", top_n=5)
+
+    with caplog.at_level(logging.INFO):
+        with profiler.stage("team"):
+            _busy(0.05)
+
+    run_dir = tmp_path / "run-1"
+    stats = pstats.Stats(str(run_dir / "team.pstats"))
+    assert any(func[2] == "_busy" for func in stats.stats)
+    assert tracemalloc.Snapshot.load(str(run_dir / "team.tracemalloc"))
+    summary = json.loads((run_dir / "summary.json").read_text())
+    stage = summary["stages"]["team"]
+    assert len(stage["hotspots"]) == 5
+    assert stage["traced_peak_bytes"] > 0
+    assert not tracemalloc.is_tracing()
+    assert "Profile team" in caplog.text
+
+
+def test_sampling_stage_writes_folded_stacks(tmp_path):
+    profiler = StageProfiler("run-1", tmp_path, mode="sampling", sample_interval=0.001)
+
+    with profiler.stage("match"):
+        _busy(0.1)
+
+    lines = (tmp_path / "run-1" / "match.folded").read_text().splitlines()
+    stack, samples = lines[0].rsplit(" ", 1)
+    assert int(samples) > 0
+    assert any("tests.test_profiler:_busy" in line for line in lines)
+    hotspots = profiler.stages["match"]["hotspots"]
+    assert hotspots[0]["self_seconds"] <= hotspots[0]["cumulative_seconds"]
+
+
+def test_profiling_is_opt_in():
+    assert isinstance(run_mapping._profiled(None, "team"), nullcontext)
+    with pytest.raises(ValueError):
+        StageProfiler("run-1", mode="perf")
@@ -0,0 +1,118 @@
+from dataclasses import replace
+
+import pytest
+
+from entity_resolution_engine.cli import run_mapping
+from entity_resolution_engine.qa.quality_gates import (
+    QualityGateAbort,
+    StageQualityGates,
+    get_quality_gate_config,
+)
+from entity_resolution_engine.validation.config import get_llm_validation_config
+from entity_resolution_engine.validation.router import RoutingOutcome
+
+HEALTHY = {"total_candidates": 100, "gray_zone_sent_count": 10}
+NOISY = {"total_candidates": 100, "gray_zone_sent_count": 90}
+
+
+class RecordingWriter:
+    engine = None
+    run_id = "run-1"
+
+    def __init__(self):
+        self.metrics = []
+        self.gate_results = []
+
+    def write_llm_reviews(self, reviews):
+        pass
+
+    def write_run_metrics(self, metrics):
+        self.metrics.append(dict(metrics))
+
+    def write_quality_gate_result(self, result):
+        self.gate_results.append(result)
+
+
+def _gates(on_stage_failure):
+    config = replace(get_quality_gate_config(), on_stage_failure=on_stage_failure)
+    return StageQualityGates("run-1", config)
+
+
+def test_hard_gates_checked_per_stage():
+    gates = _gates("continue")
+
+    assert gates.record("team", HEALTHY) == []
+    assert gates.record("competition", NOISY) == ["max_gray_zone_rate"]
+    gates.record("season", {"total_candidates": 1000, "gray_zone_sent_count": 0})
+
+    # The first failure is kept even after the running rate recovers.
+    assert gates.failed_stage == "competition"
+    assert gates.totals["total_candidates"] == 1200
+    assert not gates.skip_llm and not gates.should_abort
+
+
+def test_a_breaching_stage_is_not_diluted_by_earlier_volume():
+    gates = _gates("abort")
+
+    assert gates.record("team", {"total_candidates": 1000}) == []
+    failed = gates.record("competition", {"total_candidates": 100, **NOISY})
+
+    assert failed == ["max_gray_zone_rate"]
+    assert gates.should_abort and gates.failed_stage == "competition"
+    # The partial result still reports the run's running totals.
+    assert gates.partial_result()["gate_values"]["gray_zone_rate"] == 90 / 1100
+
+
+def test_skip_llm_disables_routing_for_later_stages():
+    gates = _gates("skip_llm")
+    writer = RecordingWriter()
+    validation_config = replace(get_llm_validation_config(), enabled=True)
+
+    team = RoutingOutcome([], [], [], dict(NOISY))
+    player = RoutingOutcome([], [], [], dict(HEALTHY))
+    run_mapping._finish_routing(writer, gates, "team", team, None)
+    routed = run_mapping._routing_config(validation_config, gates)
+    run_mapping._finish_routing(writer, gates, "player", player, None)
+
+    assert routed.enabled is False
+    assert "llm_disabled_reason" not in team.metrics
+    assert player.metrics["llm_disabled_reason"] == "quality_gate_failed"
+    # Metrics rows are written by the caller once the stage has finished.
+    assert writer.metrics == []
+    assert writer.gate_results == []
+
+
+def test_abort_records_partial_gate_result(monkeypatch):
+    gates = _gates("abort")
+    writer = RecordingWriter()
+    progress = []
+    monkeypatch.setattr(run_mapping, "materialize_run_summary", lambda *args: None)
+
+    run_mapping._finish_routing(
+        writer, gates, "team", RoutingOutcome([], [], [], dict(HEALTHY)), None
+    )
+    with pytest.raises(QualityGateAbort, match="after stage competition"):
+        run_mapping._finish_routing(
+            writer,
+            gates,
+            "competition",
+            RoutingOutcome([], [], [], dict(NOISY)),
+            lambda stage, status: progress.append((stage, status)),
+        )
+
+    [result] = writer.gate_results
+    assert [row["gray_zone_sent_count"] for row in writer.metrics] == [90]
+    assert result["status"] == "ABORTED"
+    assert result["failed_gates"] == ["max_gray_zone_rate"]
+    assert result["gate_values"]["gray_zone_rate"] == 0.5
+    assert result["gate_values"]["completed_stages"] == ["team", "competition"]
+    assert progress == [("competition", "aborted")]
+
+
+def test_invalid_stage_failure_action_is_rejected():
+    from entity_resolution_engine.qa.quality_gates import _normalize_config
+
+    with pytest.raises(ValueError):
+        _normalize_config({"on_stage_failure": "explode"})
+    with pytest.raises(ValueError):
+        _normalize_config({"hard_gates": ["high_severity_anomalies"]})
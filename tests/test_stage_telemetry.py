@@ -0,0 +1,70 @@
+import pandas as pd
+from sqlalchemy import create_engine
+
+from entity_resolution_engine.matchers.seasons_matcher import match_seasons
+from entity_resolution_engine.monitoring.stage_telemetry import (
+    TELEMETRY_COLUMNS,
+    RunTelemetry,
+    count,
+    phase,
+)
+from entity_resolution_engine.normalizers.name_normalizer import normalize_name
+from entity_resolution_engine.ues_writer.writer import UESWriter
+
+
+def test_stage_collects_timings_and_work_counters(tmp_path):
+    alpha = pd.DataFrame(
+        [
+            {"season_id": 1, "name": "2020/21", "competition_id": 10},
+            {"season_id": 2, "name": "2021/22", "competition_id": 11},
+        ]
+    )
+    beta = pd.DataFrame(
+        [
+            {"id": 7, "label": "2020-2021", "competition_id": 70},
+            {"id": 8, "label": "2021-2022", "competition_id": 71},
+            {"id": 9, "label": "2021-2022", "competition_id": 70},
+        ]
+    )
+    writer = UESWriter(engine=create_engine(f"sqlite:///{tmp_path / 'ues.db'}"))
+    telemetry = RunTelemetry()
+
+    with telemetry.activate():
+        with phase("load", "season"):
+            pass
+        with telemetry.stage("season"):
+            with phase("match"):
+                matches = match_seasons(alpha, beta, {10: 70})
+            with phase("write"):
+                writer.write_llm_reviews([{"left_id": "1", "right_id": "7"}])
+
+    metrics = telemetry.metrics("season")
+    assert set(metrics) == set(TELEMETRY_COLUMNS)
+    assert [m["beta_season_id"] for m in matches] == [7, 9]
+    # Alpha season 2 has no mapped competition, so none of its pairs are
+    # scored; alpha season 1 only skips beta competition 71.
+    assert metrics["candidate_pairs"] == 2
+    assert metrics["pruned_pairs"] == 4
+    assert metrics["normalizer_calls"] == 4
+    assert metrics["rows_written"] == 1
+    assert metrics["match_seconds"] > 0
+    assert metrics["normalize_seconds"] > 0
+    # Normalizer time is carved out of the match phase, not counted twice.
+    assert metrics["stage_wall_seconds"] >= (
+        metrics["match_seconds"] + metrics["normalize_seconds"]
+    )
+    assert metrics["load_seconds"] > 0
+    assert metrics["peak_rss_mb"] > 0
+
+
+def test_reporting_without_an_active_run_is_a_no_op():
+    telemetry = RunTelemetry()
+    with telemetry.stage("team"):
+        count("candidate_pairs", 5)
+        with phase("match"):
+            normalize_name("Arsenal FC")
+
+    metrics = telemetry.metrics("team")
+    assert metrics["candidate_pairs"] == 0
+    assert metrics["normalizer_calls"] == 0
+    assert metrics["match_seconds"] == 0.0
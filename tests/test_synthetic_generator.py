@@ -0,0 +1,101 @@
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from entity_resolution_engine.synthetic import generate_scaled_data
+from entity_resolution_engine.synthetic.generate_beta_data import mutate_player_name
+from entity_resolution_engine.synthetic.generate_scaled_data import (
+    ScaleProfile,
+    build_tables,
+    generate,
+)
+
+PROFILE = ScaleProfile.from_scale(0.1)
+
+
+def test_scale_one_matches_the_seed_counts():
+    profile = ScaleProfile.from_scale(1)
+
+    assert (profile.alpha_players, profile.beta_players) == (2000, 2300)
+    assert ScaleProfile.from_scale(1000).alpha_players == 2_000_000
+
+
+def test_shared_entities_line_up_across_sources():
+    alpha = build_tables("alpha", PROFILE, chunk_rows=64)
+    beta = build_tables("beta", PROFILE, chunk_rows=64)
+
+    shared = PROFILE.shared_players
+    alpha_players = alpha["players"].head(shared)
+    beta_players = beta["players"].head(shared)
+    assert beta_players["full_name"].tolist() == [
+        mutate_player_name(name, idx)
+        for idx, name in enumerate(alpha_players["name"], start=1)
+    ]
+    assert (
+        alpha_players["dob"].map(lambda dob: dob.year) == beta_players["birth_year"]
+    ).all()
+    assert alpha["players"]["name"].is_unique
+
+    team_names = dict(zip(alpha["teams"]["team_id"], alpha["teams"]["name"]))
+    alpha_matches = alpha["matches"].head(PROFILE.shared_matches)
+    beta_matches = beta["matches"].head(PROFILE.shared_matches)
+    assert (alpha_matches["match_date"] == beta_matches["match_date"]).all()
+    assert (alpha_matches["season_id"] == beta_matches["season_id"]).all()
+    for home_id, beta_home in zip(
+        alpha_matches["home_team_id"], beta_matches["home_team"]
+    ):
+        assert beta_home.startswith(team_names[home_id])
+
+    lineups = alpha["lineups"].merge(
+        alpha["players"], on="player_id", suffixes=("", "_player")
+    )
+    assert (lineups["team_id"] == lineups["team_id_player"]).all()
+
+
+def test_parquet_output_does_not_depend_on_worker_count(tmp_path):
+    written = generate(
+        "beta", PROFILE, parquet_dir=str(tmp_path), workers=2, chunk_rows=64
+    )
+
+    expected = build_tables("beta", PROFILE, chunk_rows=64)
+    for table, frame in expected.items():
+        parts = sorted((tmp_path / "beta" / table).glob("part-*.parquet"))
+        loaded = pd.concat(map(pd.read_parquet, parts), ignore_index=True)
+        pd.testing.assert_frame_equal(loaded, frame, check_dtype=False)
+        assert written[table] == len(frame)
+
+
+def test_generate_replaces_source_rows(tmp_path):
+    url = f"sqlite:///{tmp_path / 'alpha.db'}"
+
+    generate("alpha", ScaleProfile.from_scale(0.05), url=url, chunk_rows=32)
+    written = generate("alpha", PROFILE, url=url, chunk_rows=32)
+
+    with create_engine(url).connect() as conn:
+        for table, rows in written.items():
+            count = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            assert count == rows
+
+
+def test_parallel_workers_load_a_database(monkeypatch, tmp_path):
+    # SQLite is normally loaded by one worker; allow two to exercise the
+    # forked pool against a real database.
+    monkeypatch.setattr(generate_scaled_data, "SQLITE_WORKERS", 2)
+    url = f"sqlite:///{tmp_path / 'beta.db'}"
+
+    written = generate("beta", PROFILE, url=url, workers=2, chunk_rows=64)
+
+    expected = build_tables("beta", PROFILE, chunk_rows=64)
+    with create_engine(url).connect() as conn:
+        for table, frame in expected.items():
+            count = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            assert count == written[table] == len(frame)
+
+
+def test_worker_initializer_drops_inherited_connections(tmp_path):
+    engine = generate_scaled_data._engine(f"sqlite:///{tmp_path / 'inherited.db'}")
+    engine.connect().close()
+    assert engine.pool.checkedin() == 1
+
+    generate_scaled_data._init_worker()
+
+    assert engine.pool.checkedin() == 0
@@ -0,0 +1,131 @@
+import json
+import threading
+from dataclasses import replace
+
+from sqlalchemy import create_engine, text
+
+from entity_resolution_engine.monitoring.llm_triage import generate_triage_report
+from entity_resolution_engine.monitoring.triage_worker import TriageWorker
+from entity_resolution_engine.validation.config import get_llm_validation_config
+
+REPORT = {
+    "summary": "Gray zone spike",
+    "likely_causes": ["threshold change"],
+    "impact": "More reviews",
+    "suggested_actions": [],
+    "queries_to_run": ["SELECT * FROM anomaly_events WHERE run_id = 'run-1'"],
+}
+
+
+class RecordingClient:
+    def __init__(self):
+        self.calls = 0
+
+    def request_json(self, system_prompt, user_prompt):
+        self.calls += 1
+        return REPORT
+
+
+def _setup_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ues.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE anomaly_events (id INTEGER PRIMARY KEY, run_id TEXT, "
+                "entity_type TEXT, metric_name TEXT, current_value NUMERIC, "
+                "baseline_value NUMERIC, z_score NUMERIC, severity TEXT, "
+                "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE llm_match_reviews (run_id TEXT, entity_type TEXT, "
+                "left_id TEXT, right_id TEXT, matcher_score NUMERIC, signals TEXT, "
+                "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE anomaly_triage_reports (id INTEGER PRIMARY KEY, "
+                "run_id TEXT, entity_type TEXT, report TEXT)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE triage_report_cache (signature TEXT PRIMARY KEY, "
+                "entity_type TEXT, report TEXT, created_at TIMESTAMP)"
+            )
+        )
+        for run_id, z_score in (("run-1", 4.2), ("run-2", 3.5)):
+            conn.execute(
+                text(
+                    "INSERT INTO anomaly_events "
+                    "(run_id, entity_type, metric_name, z_score, severity) "
+                    "VALUES (:run_id, 'player', 'gray_zone_rate', :z, 'HIGH')"
+                ),
+                {"run_id": run_id, "z": z_score},
+            )
+    return engine
+
+
+def _llm_config(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("LLM_MODEL", "test-model")
+    monkeypatch.setenv("LLM_API_KEY", "key")
+    return replace(get_llm_validation_config(), enabled=True)
+
+
+def test_llm_skipped_without_anomalies_and_reused_by_signature(monkeypatch, tmp_path):
+    engine = _setup_engine(tmp_path)
+    config = _llm_config(monkeypatch)
+    client = RecordingClient()
+
+    quiet = generate_triage_report(engine, "run-1", "team", config, client)
+    first = generate_triage_report(engine, "run-1", "player", config, client)
+    repeat = generate_triage_report(engine, "run-2", "player", config, client)
+
+    assert quiet["summary"] == "No anomalies detected."
+    assert client.calls == 1
+    # The reused text is re-stamped with the second run's id and values.
+    for report, run_id, z_score in ((first, "run-1", 4.2), (repeat, "run-2", 3.5)):
+        assert report["summary"] == REPORT["summary"]
+        assert report["run_id"] == run_id
+        assert report["anomalies"][0]["z_score"] == z_score
+    assert repeat["queries_to_run"] == [
+        "SELECT * FROM anomaly_events WHERE run_id = 'run-2'"
+    ]
+    with engine.connect() as conn:
+        cached = conn.execute(text("SELECT report FROM triage_report_cache")).all()
+        written = conn.execute(text("SELECT COUNT(*) FROM anomaly_triage_reports"))
+        assert [json.loads(row.report) for row in cached] == [
+            {**REPORT, "run_id": "run-1"}
+        ]
+        assert written.scalar() == 3
+
+
+def test_worker_runs_jobs_in_background_and_records_failures(tmp_path):
+    release = threading.Event()
+    seen = []
+
+    def triage(engine, run_id, entity_type):
+        release.wait(5)
+        if entity_type == "match":
+            raise RuntimeError("boom")
+        seen.append(entity_type)
+        return {}
+
+    worker = TriageWorker(engine=None, triage=triage)
+    for entity_type in ("team", "player", "match"):
+        worker.submit("run-1", entity_type)
+    # submit() returned while the first job is still blocked.
+    assert seen == []
+
+    release.set()
+    worker.drain()
+
+    assert seen == ["team", "player"]
+    assert worker.completed == [("run-1", "team"), ("run-1", "player")]
+    assert worker.failed == [("run-1", "match", "boom")]
+    worker.submit("run-2", "team")
+    worker.drain()
+    assert worker.completed[-1] == ("run-2", "team")
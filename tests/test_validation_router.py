@@ -1,11 +1,16 @@
 import pandas as pd
+from sqlalchemy import create_engine, text
 
 from entity_resolution_engine.validation.config import (
     CircuitBreakerConfig,
     GrayZoneThreshold,
     LLMValidationConfig,
+    RateLimitConfig,
 )
+from entity_resolution_engine.validation.llm_client import LLMClient
 from entity_resolution_engine.validation.router import route_team_matches
+from entity_resolution_engine.validation.review_cache import ReviewDecisionCache
+from entity_resolution_engine.validation.scheduler import RunCallBudget
 from entity_resolution_engine.validation.schemas import ValidationResult
 from entity_resolution_engine.validation import router as router_module
 
@@ -178,3 +183,250 @@ def test_router_fallback_mode_review_when_unavailable():
     assert len(outcome.review_items) == 1
     assert outcome.metrics["llm_fallback_mode"] == "review"
     assert outcome.metrics["llm_disabled_reason"] == "llm_unavailable"
+
+
+def test_router_concurrent_mode_routes_all_gray_zone(monkeypatch):
+    alpha, beta = _sample_team_frames()
+    matches = [
+        {"alpha_team_id": 1, "beta_team_id": 10, "confidence": 0.8},
+        {"alpha_team_id": 2, "beta_team_id": 20, "confidence": 0.8},
+        {"alpha_team_id": 3, "beta_team_id": 30, "confidence": 0.8},
+    ]
+    config = LLMValidationConfig(
+        enabled=True,
+        gray_zone={"team": GrayZoneThreshold(low=0.7, high=0.9)},
+        internal_api_key_env="INTERNAL_API_KEY",
+        provider_env="LLM_PROVIDER",
+        model_env="LLM_MODEL",
+        api_key_env="LLM_API_KEY",
+        max_calls_per_entity_type_per_run=10,
+        circuit_breaker=CircuitBreakerConfig(
+            window=5, max_fail_rate=0.5, max_invalid_json_rate=0.5
+        ),
+        fallback_mode_when_llm_unhealthy="review",
+        rate_limit=RateLimitConfig(max_concurrency=4, min_concurrency=2),
+    )
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("LLM_MODEL", "gpt-test")
+    monkeypatch.setenv("LLM_API_KEY", "key")
+
+    def fake_validate(*_args, **kwargs):
+        llm_client = kwargs.get("llm_client")
+        if llm_client:
+            llm_client.last_latency_ms = 4.0
+        return ValidationResult(
+            decision="MATCH", confidence=0.9, reasons=[], risk_flags=[]
+        )
+
+    monkeypatch.setattr(router_module, "validate_pair", fake_validate)
+    outcome = route_team_matches(matches, alpha, beta, run_id="run-5", config=config)
+
+    assert outcome.metrics["llm_call_count"] == 3
+    assert outcome.metrics["llm_avg_latency_ms"] == 4.0
+    assert outcome.metrics["llm_latency_p99_ms"] == 4.0
+    assert outcome.metrics["llm_latency_max_ms"] == 4.0
+    assert outcome.metrics["llm_throttle_ms"] == 0.0
+    assert len(outcome.approved_matches) == 3
+
+
+def test_reused_client_reports_per_stage_throttle_and_concurrency(monkeypatch):
+    alpha, beta = _sample_team_frames()
+    matches = [
+        {"alpha_team_id": 1, "beta_team_id": 10, "confidence": 0.8},
+        {"alpha_team_id": 2, "beta_team_id": 20, "confidence": 0.8},
+    ]
+    config = LLMValidationConfig(
+        enabled=True,
+        gray_zone={"team": GrayZoneThreshold(low=0.7, high=0.9)},
+        internal_api_key_env="INTERNAL_API_KEY",
+        provider_env="LLM_PROVIDER",
+        model_env="LLM_MODEL",
+        api_key_env="LLM_API_KEY",
+        max_calls_per_entity_type_per_run=10,
+        circuit_breaker=CircuitBreakerConfig(
+            window=5, max_fail_rate=0.5, max_invalid_json_rate=0.5
+        ),
+        fallback_mode_when_llm_unhealthy="review",
+    )
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("LLM_MODEL", "gpt-test")
+    monkeypatch.setenv("LLM_API_KEY", "key")
+    client = LLMClient(
+        provider="openai",
+        model="gpt-test",
+        api_key="key",
+        rate_limit=RateLimitConfig(max_concurrency=2, min_concurrency=2),
+    )
+    # An earlier stage on the same client: 500 ms throttled, two overlapping
+    # slots (mean concurrency 1.5).
+    client.total_throttle_ms = 500.0
+    with client.concurrency.slot(), client.concurrency.slot():
+        pass
+
+    def fake_validate(*_args, **kwargs):
+        llm_client = kwargs["llm_client"]
+        with llm_client.concurrency.slot():
+            llm_client._add_throttle(0.25)
+        return ValidationResult(
+            decision="MATCH", confidence=0.9, reasons=[], risk_flags=[]
+        )
+
+    monkeypatch.setattr(router_module, "validate_pair", fake_validate)
+    outcome = route_team_matches(
+        matches, alpha, beta, run_id="run-6", config=config, llm_client=client
+    )
+
+    assert outcome.metrics["llm_throttle_ms"] == 500.0
+    assert outcome.metrics["llm_effective_concurrency"] == 1.0
+    assert client.total_throttle_ms == 1000.0
+
+
+def test_router_spends_budget_on_highest_value_pairs(monkeypatch):
+    alpha, beta = _sample_team_frames()
+    matches = [
+        {"alpha_team_id": 1, "beta_team_id": 10, "confidence": 0.88},
+        {"alpha_team_id": 2, "beta_team_id": 20, "confidence": 0.8},
+        {
+            "alpha_team_id": 3,
+            "beta_team_id": 30,
+            "confidence": 0.86,
+            "runner_up_confidence": 0.85,
+        },
+    ]
+    config = LLMValidationConfig(
+        enabled=True,
+        gray_zone={"team": GrayZoneThreshold(low=0.7, high=0.9)},
+        internal_api_key_env="INTERNAL_API_KEY",
+        provider_env="LLM_PROVIDER",
+        model_env="LLM_MODEL",
+        api_key_env="LLM_API_KEY",
+        max_calls_per_entity_type_per_run=2,
+        circuit_breaker=CircuitBreakerConfig(
+            window=5, max_fail_rate=0.5, max_invalid_json_rate=0.5
+        ),
+        fallback_mode_when_llm_unhealthy="review",
+    )
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("LLM_MODEL", "gpt-test")
+    monkeypatch.setenv("LLM_API_KEY", "key")
+    validated = []
+
+    def fake_validate(_entity_type, left, *_args, **_kwargs):
+        validated.append(left["id"])
+        return ValidationResult(
+            decision="MATCH", confidence=0.9, reasons=[], risk_flags=[]
+        )
+
+    monkeypatch.setattr(router_module, "validate_pair", fake_validate)
+    outcome = route_team_matches(matches, alpha, beta, run_id="run-6", config=config)
+
+    assert validated == ["2", "3"]
+    assert [item["left_id"] for item in outcome.review_items] == ["1"]
+
+
+def test_run_call_budget_carries_unused_calls_forward():
+    budget = RunCallBudget(per_stage_calls=10, max_calls_per_run=25)
+
+    first = budget.allocate()
+    budget.record(first, used=4)
+    second = budget.allocate()
+    budget.record(second, used=16)
+    third = budget.allocate()
+
+    assert (first, second, third) == (10, 16, 5)
+
+
+def test_router_applies_prior_review_decisions():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE llm_match_reviews (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    entity_type TEXT,
+                    left_id TEXT,
+                    right_id TEXT,
+                    status TEXT,
+                    updated_at TIMESTAMP
+                )
+                """
+            )
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO llm_match_reviews (entity_type, left_id, right_id, status, updated_at)
+                VALUES
+                ('team', '1', '10', 'APPROVED', '2024-01-01'),
+                ('team', '2', '20', 'APPROVED', '2024-01-01'),
+                ('team', '2', '20', 'REJECTED', '2024-02-01'),
+                ('team', '3', '30', 'PENDING', '2024-02-01'),
+                ('player', '3', '30', 'APPROVED', '2024-02-01')
+                """
+            )
+        )
+    alpha, beta = _sample_team_frames()
+    matches = [
+        {"alpha_team_id": 1, "beta_team_id": 10, "confidence": 0.8},
+        {"alpha_team_id": 2, "beta_team_id": 20, "confidence": 0.95},
+        {"alpha_team_id": 3, "beta_team_id": 30, "confidence": 0.8},
+    ]
+    config = LLMValidationConfig(
+        enabled=False,
+        gray_zone={"team": GrayZoneThreshold(low=0.7, high=0.9)},
+        internal_api_key_env="INTERNAL_API_KEY",
+        provider_env="LLM_PROVIDER",
+        model_env="LLM_MODEL",
+        api_key_env="LLM_API_KEY",
+        max_calls_per_entity_type_per_run=200,
+        circuit_breaker=CircuitBreakerConfig(
+            window=5, max_fail_rate=0.5, max_invalid_json_rate=0.5
+        ),
+        fallback_mode_when_llm_unhealthy="review",
+    )
+
+    outcome = route_team_matches(
+        matches,
+        alpha,
+        beta,
+        run_id="run-7",
+        config=config,
+        review_cache=ReviewDecisionCache(engine),
+    )
+
+    assert [m["alpha_team_id"] for m in outcome.approved_matches] == [1]
+    assert [m["alpha_team_id"] for m in outcome.rejected_matches] == [2]
+    assert [item["left_id"] for item in outcome.review_items] == ["3"]
+    assert outcome.metrics["review_cache_resolved_count"] == 2
+    assert outcome.metrics["auto_match_count"] == 0
+    assert outcome.metrics["auto_reject_count"] == 0
+
+
+def test_review_cache_lookup_chunks_large_pair_sets(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reviews.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE llm_match_reviews (id INTEGER PRIMARY KEY, "
+                "entity_type TEXT, left_id TEXT, right_id TEXT, status TEXT, "
+                "updated_at TIMESTAMP)"
+            )
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO llm_match_reviews (entity_type, left_id, right_id, status, updated_at)
+                VALUES
+                ('team', '7', '70', 'APPROVED', '2024-01-01'),
+                ('team', '7', '71', 'REJECTED', '2024-01-01'),
+                ('team', '1499', '14990', 'REJECTED', '2024-01-01')
+                """
+            )
+        )
+    # Well past one chunk and SQLite's 999 bind limit.
+    pairs = [(str(idx), str(idx * 10)) for idx in range(1500)]
+
+    decisions = ReviewDecisionCache(engine).lookup("team", pairs)
+
+    assert decisions == {("7", "70"): "APPROVED", ("1499", "14990"): "REJECTED"}
@@ -1,8 +1,8 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 
-from entity_resolution_engine.ues_writer.writer import UESWriter
+from entity_resolution_engine.ues_writer.writer import MAPPING_RUN_LOCK_KEY, UESWriter
 
 
 def _setup_engine():
@@ -119,3 +119,22 @@ def test_writer_persists_reviews_and_metrics():
 
     assert review_count == 1
     assert metrics_count == 1
+
+
+def test_run_lock_holds_an_advisory_lock_for_the_run(monkeypatch):
+    engine = create_engine("sqlite://")
+    calls = []
+
+    @event.listens_for(engine, "connect")
+    def _register(dbapi_connection, _record):
+        for name in ("pg_advisory_lock", "pg_advisory_unlock"):
+            dbapi_connection.create_function(
+                name, 1, lambda key, name=name: calls.append((name, key))
+            )
+
+    writer = UESWriter(engine=engine)
+    monkeypatch.setattr(engine.dialect, "name", "postgresql")
+
+    with writer.run_lock():
+        assert calls == [("pg_advisory_lock", MAPPING_RUN_LOCK_KEY)]
+    assert calls[-1] == ("pg_advisory_unlock", MAPPING_RUN_LOCK_KEY)